@@ -0,0 +1,54 @@
+"""add_events
+
+Revision ID: 0c7d5a3e8f14
+Revises: e61b4d2f9a07
+Create Date: 2026-10-19 15:31:12.504837
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7d5a3e8f14'
+down_revision: Union[str, None] = 'e61b4d2f9a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('slug', sa.String(), nullable=False),
+    sa.Column('starts_at', sa.DateTime(), nullable=True),
+    sa.Column('ends_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_events_id'), 'events', ['id'], unique=False)
+    op.create_index(op.f('ix_events_slug'), 'events', ['slug'], unique=True)
+    op.add_column('problems', sa.Column('event_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_problems_event_id'), 'problems', ['event_id'], unique=False)
+    op.create_foreign_key('fk_problems_event_id', 'problems', 'events', ['event_id'], ['id'])
+    op.add_column('teams', sa.Column('event_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_teams_event_id'), 'teams', ['event_id'], unique=False)
+    op.create_foreign_key('fk_teams_event_id', 'teams', 'events', ['event_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_teams_event_id', 'teams', type_='foreignkey')
+    op.drop_index(op.f('ix_teams_event_id'), table_name='teams')
+    op.drop_column('teams', 'event_id')
+    op.drop_constraint('fk_problems_event_id', 'problems', type_='foreignkey')
+    op.drop_index(op.f('ix_problems_event_id'), table_name='problems')
+    op.drop_column('problems', 'event_id')
+    op.drop_index(op.f('ix_events_slug'), table_name='events')
+    op.drop_index(op.f('ix_events_id'), table_name='events')
+    op.drop_table('events')
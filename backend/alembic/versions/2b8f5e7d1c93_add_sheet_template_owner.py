@@ -0,0 +1,32 @@
+"""add_sheet_template_owner
+
+Revision ID: 2b8f5e7d1c93
+Revises: 6e2d8c4a9f31
+Create Date: 2026-10-19 21:04:37.520913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8f5e7d1c93'
+down_revision: Union[str, None] = '6e2d8c4a9f31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sheet_templates', sa.Column('owner_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'sheet_templates_owner_id_fkey', 'sheet_templates', 'users', ['owner_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('sheet_templates_owner_id_fkey', 'sheet_templates', type_='foreignkey')
+    op.drop_column('sheet_templates', 'owner_id')
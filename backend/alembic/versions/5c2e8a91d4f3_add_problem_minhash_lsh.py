@@ -0,0 +1,47 @@
+"""add_problem_minhash_lsh
+
+Revision ID: 5c2e8a91d4f3
+Revises: b7ce99ae3a06
+Create Date: 2026-10-19 09:12:44.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8a91d4f3'
+down_revision: Union[str, None] = 'b7ce99ae3a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('problem_minhashes',
+    sa.Column('problem_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('problem_id')
+    )
+    op.create_table('problem_lsh_buckets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bucket_key', sa.BigInteger(), nullable=False),
+    sa.Column('problem_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_problem_lsh_buckets_id'), 'problem_lsh_buckets', ['id'], unique=False)
+    op.create_index(op.f('ix_problem_lsh_buckets_bucket_key'), 'problem_lsh_buckets', ['bucket_key'], unique=False)
+    op.create_index(op.f('ix_problem_lsh_buckets_problem_id'), 'problem_lsh_buckets', ['problem_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_problem_lsh_buckets_problem_id'), table_name='problem_lsh_buckets')
+    op.drop_index(op.f('ix_problem_lsh_buckets_bucket_key'), table_name='problem_lsh_buckets')
+    op.drop_index(op.f('ix_problem_lsh_buckets_id'), table_name='problem_lsh_buckets')
+    op.drop_table('problem_lsh_buckets')
+    op.drop_table('problem_minhashes')
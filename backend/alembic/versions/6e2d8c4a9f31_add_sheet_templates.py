@@ -0,0 +1,45 @@
+"""add_sheet_templates
+
+Revision ID: 6e2d8c4a9f31
+Revises: 9b3e1f6c2d48
+Create Date: 2026-10-19 19:12:06.481127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2d8c4a9f31'
+down_revision: Union[str, None] = '9b3e1f6c2d48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sheet_templates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('columns', sa.JSON(), nullable=False),
+    sa.Column('problem_column', sa.String(), nullable=False),
+    sa.Column('tech_stack_column', sa.String(), nullable=True),
+    sa.Column('title_column', sa.String(), nullable=True),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('uses', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sheet_templates_id'), 'sheet_templates', ['id'], unique=False)
+    op.create_index(op.f('ix_sheet_templates_fingerprint'), 'sheet_templates', ['fingerprint'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sheet_templates_fingerprint'), table_name='sheet_templates')
+    op.drop_index(op.f('ix_sheet_templates_id'), table_name='sheet_templates')
+    op.drop_table('sheet_templates')
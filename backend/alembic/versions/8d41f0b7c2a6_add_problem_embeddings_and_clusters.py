@@ -0,0 +1,51 @@
+"""add_problem_embeddings_and_clusters
+
+Revision ID: 8d41f0b7c2a6
+Revises: 5c2e8a91d4f3
+Create Date: 2026-10-19 11:03:27.541902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f0b7c2a6'
+down_revision: Union[str, None] = '5c2e8a91d4f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('problem_embeddings',
+    sa.Column('problem_id', sa.Integer(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('vector', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('problem_id')
+    )
+    op.create_table('problem_clusters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('centroid', sa.LargeBinary(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('representatives', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_problem_clusters_id'), 'problem_clusters', ['id'], unique=False)
+    op.add_column('problems', sa.Column('cluster_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_problems_cluster_id'), 'problems', ['cluster_id'], unique=False)
+    op.create_foreign_key('fk_problems_cluster_id', 'problems', 'problem_clusters', ['cluster_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_problems_cluster_id', 'problems', type_='foreignkey')
+    op.drop_index(op.f('ix_problems_cluster_id'), table_name='problems')
+    op.drop_column('problems', 'cluster_id')
+    op.drop_index(op.f('ix_problem_clusters_id'), table_name='problem_clusters')
+    op.drop_table('problem_clusters')
+    op.drop_table('problem_embeddings')
@@ -0,0 +1,48 @@
+"""add_upload_and_problem_content_hashes
+
+Revision ID: 9b3e1f6c2d48
+Revises: 0c7d5a3e8f14
+Create Date: 2026-10-19 17:04:38.219563
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e1f6c2d48'
+down_revision: Union[str, None] = '0c7d5a3e8f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('uploads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('filename', sa.String(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=True),
+    sa.Column('problem_ids', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_uploads_id'), 'uploads', ['id'], unique=False)
+    op.create_index(op.f('ix_uploads_content_hash'), 'uploads', ['content_hash'], unique=True)
+    op.create_index(op.f('ix_uploads_event_id'), 'uploads', ['event_id'], unique=False)
+    # Existing rows stay NULL until `python -m app.cli hash-problems`
+    op.add_column('problems', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_problems_content_hash'), 'problems', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_problems_content_hash'), table_name='problems')
+    op.drop_column('problems', 'content_hash')
+    op.drop_index(op.f('ix_uploads_event_id'), table_name='uploads')
+    op.drop_index(op.f('ix_uploads_content_hash'), table_name='uploads')
+    op.drop_index(op.f('ix_uploads_id'), table_name='uploads')
+    op.drop_table('uploads')
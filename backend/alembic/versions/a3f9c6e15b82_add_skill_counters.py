@@ -0,0 +1,50 @@
+"""add_skill_counters
+
+Revision ID: a3f9c6e15b82
+Revises: 8d41f0b7c2a6
+Create Date: 2026-10-19 13:47:09.672318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c6e15b82'
+down_revision: Union[str, None] = '8d41f0b7c2a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('skill_counts',
+    sa.Column('skill', sa.String(), nullable=False),
+    sa.Column('problem_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('skill')
+    )
+    op.create_index(op.f('ix_skill_counts_problem_count'), 'skill_counts', ['problem_count'], unique=False)
+    op.create_table('skill_pairs',
+    sa.Column('skill_a', sa.String(), nullable=False),
+    sa.Column('skill_b', sa.String(), nullable=False),
+    sa.Column('problem_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('skill_a', 'skill_b')
+    )
+    op.create_index(op.f('ix_skill_pairs_problem_count'), 'skill_pairs', ['problem_count'], unique=False)
+    op.create_table('catalog_stats',
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    # Counters for problems that already exist are filled by SkillAnalytics.rebuild()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalog_stats')
+    op.drop_index(op.f('ix_skill_pairs_problem_count'), table_name='skill_pairs')
+    op.drop_table('skill_pairs')
+    op.drop_index(op.f('ix_skill_counts_problem_count'), table_name='skill_counts')
+    op.drop_table('skill_counts')
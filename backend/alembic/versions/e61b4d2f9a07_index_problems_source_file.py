@@ -0,0 +1,28 @@
+"""index_problems_source_file
+
+Revision ID: e61b4d2f9a07
+Revises: a3f9c6e15b82
+Create Date: 2026-10-19 15:02:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e61b4d2f9a07'
+down_revision: Union[str, None] = 'a3f9c6e15b82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_problems_source_file'), 'problems', ['source_file'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_problems_source_file'), table_name='problems')
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from ...core.exceptions import DatabaseError
+from ...db.session import get_db
+from ...schemas.analytics import SkillDemand
+from ...services.skill_analytics import skill_analytics
+from ..deps import get_current_user
+from ...core.metrics import track_request_metrics, track_db_operation
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/skills", response_model=SkillDemand)
+@track_request_metrics
+async def get_skill_demand(
+    limit: int = 20,
+    pair_limit: int = 20,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Most demanded skills in the problem catalog and the skills most often
+    required together
+    """
+    try:
+        return await get_skill_demand_with_metrics(db, limit, pair_limit)
+    except DatabaseError as e:
+        logger.error(f"Database error fetching skill demand: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error fetching skill demand"
+        )
+
+@track_db_operation("select", "skill_counts")
+async def get_skill_demand_with_metrics(db: Session, limit: int, pair_limit: int):
+    return skill_analytics.skill_demand(db, limit=limit, pair_limit=pair_limit)
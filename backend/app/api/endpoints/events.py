@@ -0,0 +1,229 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+from ...core.exceptions import DatabaseError
+from ...db.session import get_db
+from ...schemas.event import Event, EventCreate, EventPartition
+from ...schemas.problem import Problem
+from ...schemas.matching import MatchResponse
+from ...services.event_service import event_service
+from ...services.problem_service import problem_service
+from ...services.team_service import team_service
+from ...services.catalog_partitions import partition_registry
+from ...services.cohere_service import get_team_embeddings
+from ...services.problem_matcher import match_problems_to_team, team_to_profile, problem_to_details
+from ..deps import get_current_user
+from ...core.metrics import track_request_metrics, track_db_operation
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.post("/", response_model=Event, status_code=status.HTTP_201_CREATED)
+@track_request_metrics
+async def create_event(
+    event_in: EventCreate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Create an event with its own problem catalog
+    """
+    if event_service.get_by_slug(db, slug=event_in.slug):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Event slug '{event_in.slug}' is already taken"
+        )
+    try:
+        return await create_event_with_metrics(db, event_in, current_user.id)
+    except DatabaseError as e:
+        logger.error(f"Database error creating event: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error creating event"
+        )
+
+@router.get("/", response_model=List[Event])
+@track_request_metrics
+async def get_events(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    List events
+    """
+    return event_service.get_multi(db, skip=skip, limit=limit)
+
+@router.get("/partitions", response_model=List[EventPartition])
+@track_request_metrics
+async def get_loaded_partitions(
+    current_user = Depends(get_current_user)
+):
+    """
+    Event catalogs currently held in memory, least recently used first
+    """
+    return partition_registry.stats()
+
+@router.get("/{event_id}", response_model=Event)
+@track_request_metrics
+async def get_event(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Get a specific event by ID
+    """
+    return await get_event_with_metrics(event_id, db)
+
+@router.get("/{event_id}/problems", response_model=List[Problem])
+@track_request_metrics
+async def get_event_problems(
+    event_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    List the problems in an event's catalog
+    """
+    await get_event_with_metrics(event_id, db)
+    return event_service.get_problems(db, event_id=event_id, skip=skip, limit=limit)
+
+@router.get("/{event_id}/search", response_model=List[Problem])
+@track_request_metrics
+async def search_event_problems(
+    event_id: int,
+    q: str,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Keyword search over an event's problems using its lexical index
+    """
+    await get_event_with_metrics(event_id, db)
+    partition = await partition_registry.get(db, event_id)
+    hits = partition.lexical_search(q, limit)
+    problems = {p.id: p for p in problem_service.get_multi_by_ids(db, ids=[pid for pid, _ in hits])}
+    return [problems[pid] for pid, _ in hits if pid in problems]
+
+@router.post("/{event_id}/match", response_model=MatchResponse)
+@track_request_metrics
+async def match_event_problems(
+    event_id: int,
+    team_id: int,
+    top_k: int = 10,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Match a team against the event's catalog. Only this event's partition
+    is scored; recommendations are generated for the top_k problems.
+    """
+    if top_k <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="top_k must be greater than 0"
+        )
+    await get_event_with_metrics(event_id, db)
+    team = team_service.get(db=db, id=team_id)
+    if not team or team.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Team not found"
+        )
+    if team.event_id is not None and team.event_id != event_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Team belongs to a different event"
+        )
+
+    try:
+        partition = await partition_registry.get(db, event_id)
+        if not partition.problem_ids:
+            return {"status": "success", "matches": []}
+
+        profile = team_to_profile(team)
+        team_embedding = (await get_team_embeddings([profile]))[0]
+        top_ids = [pid for pid, _ in partition.semantic_top(team_embedding, top_k)]
+        problems = {p.id: p for p in problem_service.get_multi_by_ids(db, ids=top_ids)}
+        top_ids = [pid for pid in top_ids if pid in problems]
+
+        matches = await match_problems_to_team(
+            profile,
+            [problem_to_details(problems[pid]) for pid in top_ids],
+            problem_embeddings=partition.embeddings_for(top_ids)
+        )
+        return {"status": "success", "matches": matches}
+    except Exception as e:
+        logger.error(f"Error matching event {event_id} problems: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error matching problems: {str(e)}"
+        )
+
+@router.put("/{event_id}/partition", response_model=EventPartition)
+@track_request_metrics
+async def load_event_partition(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Load (or reload) an event's catalog into memory ahead of matching.
+    Only the event's owner may do so.
+    """
+    ensure_event_owner(await get_event_with_metrics(event_id, db), current_user.id)
+    partition_registry.invalidate(event_id)
+    partition = await partition_registry.get(db, event_id)
+    return {
+        "event_id": event_id,
+        "problems": len(partition.problem_ids),
+        "loaded": partition_registry.is_loaded(event_id),
+        "memory_bytes": partition.memory_bytes
+    }
+
+@router.delete("/{event_id}/partition", status_code=status.HTTP_204_NO_CONTENT)
+@track_request_metrics
+async def evict_event_partition(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Drop an event's catalog from memory; it is reloaded on next use.
+    Only the event's owner may do so.
+    """
+    ensure_event_owner(await get_event_with_metrics(event_id, db), current_user.id)
+    partition_registry.evict(event_id)
+    return
+
+def ensure_event_owner(event, user_id: int) -> None:
+    if event.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to manage this event's catalog"
+        )
+
+# Helper functions with metrics
+@track_db_operation("insert", "events")
+async def create_event_with_metrics(db: Session, event_in: EventCreate, owner_id: int):
+    return event_service.create_with_owner(
+        db=db,
+        obj_in=event_in,
+        owner_id=owner_id
+    )
+
+@track_db_operation("select", "events")
+async def get_event_with_metrics(event_id: int, db: Session):
+    event = event_service.get(db=db, id=event_id)
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    return event
@@ -6,6 +6,9 @@ from ...core.metrics import track_request_metrics
 # import psutil
 # import redis
 from ...core.config import settings
+from ...core.admission import admission_controller
+from ...services.cohere_service import embed_hedger, embedding_batcher, llm_scheduler
+from ...services.parse_pool import parse_pool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +23,7 @@ async def health_check(db: Session = Depends(get_db)):
     - Redis cache connectivity
     - System resources (CPU, Memory)
     - Disk space
+    - Work queues (LLM scheduler, embedding batcher and hedger, parse pool, admission control)
     """
     health_status = {
         "status": "healthy",
@@ -27,7 +31,8 @@ async def health_check(db: Session = Depends(get_db)):
             "database": {"status": "healthy"},
             "cache": {"status": "healthy"},
             "system": {"status": "healthy"}
-        }
+        },
+        "workload": workload_stats()
     }
 
     # Check database health
@@ -91,6 +96,31 @@ async def health_check(db: Session = Depends(get_db)):
 
     return health_status
 
+def workload_stats() -> dict:
+    """
+    Snapshot of the in-process queues, whose metrics are no-ops while
+    prometheus_client is not wired in
+    """
+    return {
+        "llm_scheduler": llm_scheduler.stats(),
+        "embedding_batcher": dict(embedding_batcher.stats),
+        "embed_hedging": {
+            **embed_hedger.stats,
+            "enabled": settings.EMBED_HEDGING_ENABLED,
+            "hedge_delay_seconds": embed_hedger.hedge_delay()
+        },
+        "parse_pool": {"max_workers": parse_pool.max_workers, "pending": parse_pool.pending},
+        "admission": admission_controller.stats()
+    }
+
+@router.get("/health/workload")
+async def workload_check():
+    """
+    Queue depths and counters of the scheduler, batcher, hedger, parse pool
+    and admission control
+    """
+    return workload_stats()
+
 @router.get("/health/live")
 async def liveness_check():
     """
@@ -1,26 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from ...schemas.matching import TeamProfile, ProblemDetails, MatchResponse
-from ...services.problem_matcher import match_problems_to_team
+from fastapi import APIRouter, Depends, HTTPException, Body, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import json
+from ...db.session import get_db
+from ...models.team import Team
+from ...schemas.matching import TeamProfile, ProblemDetails, MatchResponse, BatchMatchResponse
+from ...models.problem import Problem
+from ...services.problem_matcher import (
+    match_problems_to_team,
+    iter_team_matches,
+    team_to_profile,
+    problem_to_details
+)
+from ...services.problem_service import problem_service
+from ...services.event_service import event_service
+from ...services.embedding_store import ensure_embeddings
+from ...services.llm_scheduler import Priority
+from ..deps import get_current_user
 # from ...services.problem_matcher import ProblemMatcherService
 
 router = APIRouter()
 
 @router.post("/match", response_model=MatchResponse)
 async def match_problems(
-    team_profile: TeamProfile,
-    problems: List[ProblemDetails]
+    team_profile: TeamProfile = Body(...),
+    problems: Optional[List[ProblemDetails]] = Body(None),
+    problem_ids: Optional[List[int]] = Body(None),
+    source_file: Optional[str] = Body(None),
+    event_id: Optional[int] = Body(None),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
 ):
     """
-    Match problems to team profile and return recommendations
+    Match problems to team profile and return recommendations.
+    Problems are either sent inline, or referenced as stored problem IDs
+    and/or the source file they were uploaded from into event_id's
+    catalog (or, without event_id, into no event); stored problems reuse
+    their cached embeddings.
     """
+    if problems is not None and (problem_ids or source_file):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Send either problems or problem_ids/source_file, not both"
+        )
+    if problems is None and not problem_ids and not source_file:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide problems, problem_ids or source_file"
+        )
+
+    problem_embeddings = None
+    if problems is None:
+        stored = get_stored_problems(problem_ids or [], source_file, event_id, db)
+        problems_dict = [problem_to_details(p) for p in stored]
+    else:
+        problems_dict = [p.dict() for p in problems]
+
     try:
+        if problems is None:
+            problem_embeddings = await ensure_embeddings(db, stored)
+
         # Convert Pydantic models to dictionaries
         team_dict = team_profile.dict()
-        problems_dict = [p.dict() for p in problems]
         
         # Get matches using the new matching function
-        matches = match_problems_to_team(team_dict, problems_dict)
+        matches = await match_problems_to_team(
+            team_dict, problems_dict, problem_embeddings=problem_embeddings
+        )
         
         return {
             "status": "success",
@@ -31,3 +78,130 @@ async def match_problems(
             status_code=500,
             detail=f"Error matching problems: {str(e)}"
         )
+
+@router.post("/match/batch", response_model=BatchMatchResponse)
+async def match_problems_batch(
+    problems: List[ProblemDetails] = Body(...),
+    team_profiles: Optional[List[TeamProfile]] = Body(None),
+    team_ids: Optional[List[int]] = Body(None),
+    top_k: Optional[int] = None,
+    stream: bool = False,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Match one problem set against several teams at once.
+    Teams can be given as stored team IDs, inline profiles, or both.
+    With stream=true, results are sent as NDJSON, one line per team;
+    a team that could not be matched gets a line with an error instead.
+    """
+    if top_k is not None and top_k <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="top_k must be greater than 0"
+        )
+
+    teams = [(None, profile.dict()) for profile in team_profiles or []]
+    for team_id in team_ids or []:
+        team = get_owned_team(team_id, current_user.id, db)
+        teams.append((team.id, team_to_profile(team)))
+
+    if not teams:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide at least one of team_profiles or team_ids"
+        )
+
+    problems_dict = [p.dict() for p in problems]
+    profiles = [profile for _, profile in teams]
+
+    try:
+        if stream:
+            results = iter_team_matches(
+                profiles, problems_dict, top_k, Priority.BATCH, return_exceptions=True
+            )
+
+            def record(index, matches):
+                line = {"team_index": index, "team_id": teams[index][0]}
+                if isinstance(matches, Exception):
+                    line["error"] = f"Error matching problems: {str(matches)}"
+                else:
+                    line["matches"] = matches
+                return json.dumps(line) + "\n"
+
+            async def ndjson():
+                # The status line is already sent, so failures become error records
+                index = 0
+                try:
+                    async for matches in results:
+                        yield record(index, matches)
+                        index += 1
+                except Exception as e:
+                    # Failed before ranking (e.g. embedding): no remaining team can be matched
+                    for remaining in range(index, len(teams)):
+                        yield record(remaining, e)
+
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+        results = iter_team_matches(profiles, problems_dict, top_k, Priority.BATCH)
+        all_matches = [matches async for matches in results]
+        return {
+            "status": "success",
+            "results": [
+                {"team_index": index, "team_id": teams[index][0], "matches": matches}
+                for index, matches in enumerate(all_matches)
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error matching problems: {str(e)}"
+        )
+
+def get_owned_team(team_id: int, user_id: int, db: Session) -> Team:
+    team = db.query(Team).filter(Team.id == team_id).first()
+    if not team:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Team {team_id} not found"
+        )
+    if team.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this team"
+        )
+    return team
+
+def get_stored_problems(
+    problem_ids: List[int],
+    source_file: Optional[str],
+    event_id: Optional[int],
+    db: Session
+) -> List[Problem]:
+    """
+    Stored problems by ID (in the order given) followed by any other
+    problems uploaded from `source_file` into event_id's catalog
+    """
+    found = {p.id: p for p in problem_service.get_multi_by_ids(db, ids=problem_ids)}
+    missing = [problem_id for problem_id in problem_ids if problem_id not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Problems not found: {missing[:20]}"
+        )
+
+    problems = [found[problem_id] for problem_id in dict.fromkeys(problem_ids)]
+    if source_file:
+        if event_id is not None and not event_service.get(db=db, id=event_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        from_file = problem_service.get_by_source_file(db, source_file=source_file, event_id=event_id)
+        if not from_file:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No problems stored from {source_file}"
+            )
+        problems.extend(p for p in from_file if p.id not in found)
+    return problems
@@ -1,18 +1,33 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Request, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ...core.exceptions import (
     FileProcessingError,
+    FileTooLargeError,
     InvalidFileFormatError,
     MalformedDataError,
     DatabaseError
 )
 from ...db.session import get_db
-from ...schemas.problem import ProblemMatch, Problem
+from ...schemas.problem import ProblemMatch, Problem, ProblemCluster
+from ...models.problem import Problem as ProblemModel
 from ...models.team import Team
 from ...services.file_processor import FileProcessorService
-from ...services.problem_matcher import match_problems_to_team
+from ...services.problem_matcher import match_problems_to_team, team_to_profile, problem_to_details
+from ...services.llm_scheduler import Priority
+from ...services.catalog_indexer import index_stream
+from ...services.ingest_progress import ingest_tracker
+from ...services.problem_clusters import problem_clusters
+from ...services.problem_service import problem_service
+from ...services.event_service import event_service
+from ...services.catalog_partitions import partition_registry
 from ...schemas.matching import MatchResponse
+from ...schemas.upload import UploadSessionCreate, UploadSession, UploadPart
+from ...schemas.ingest import IngestStatus
+from ...services.upload_sessions import upload_sessions
+from ...services.catalog_export import ARROW_AVAILABLE, COLUMNAR_FORMATS, EXPORT_FORMATS, stream_catalog
+from ...core.config import settings
 from ..deps import get_current_user
 from ...core.metrics import track_request_metrics, track_db_operation
 import logging
@@ -26,79 +41,48 @@ router = APIRouter()
 async def upload_and_process(
     file: UploadFile = File(...),
     team_id: int = None,
+    on_duplicate: str = "report",
+    event_id: int = None,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
     Upload and process an Excel file containing problem statements.
     Optionally match with a specific team's skills.
+    Near-duplicates of existing problems are reported, and with
+    on_duplicate=skip or on_duplicate=merge they are not stored again.
+    With event_id, the problems are added to that event's catalog.
+    Uploading the same file again returns the problems already stored.
+    Progress is listed under /ingests while the file is processed; the
+    response comes once every row is stored, and embedding goes on after.
     """
+    ensure_event_owned(db, event_id, current_user.id)
     try:
         # services
         file_processor = FileProcessorService()
 
         # processing file
         try:
-            problems = await file_processor.process_file(file, db)
-            logger.info(f"Successfully processed {len(problems)} problems")
-        except InvalidFileFormatError as e:
-            logger.error(f"Invalid file format: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(e)
-            )
-        except MalformedDataError as e:
-            logger.error(f"Malformed data: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=str(e)
+            problems = await file_processor.process_file(
+                file,
+                db,
+                on_duplicate=on_duplicate,
+                event_id=event_id,
+                progress=ingest_tracker.start(file.filename, owner_id=current_user.id),
+                index_with=index_stream
             )
+            logger.info(f"Successfully processed {len(problems)} problems")
         except FileProcessingError as e:
-            logger.error(f"File processing error: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error processing file"
-            )
+            raise processing_error_to_http(e)
         except Exception as e:
             logger.error(f"Unexpected error in file processing: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Unexpected error in file processing: {str(e)}"
             )
-
-        # If team_id provided, get team and match problems
-        if team_id:
-            try:
-                team = await get_team_with_metrics(team_id, current_user.id, db)
-                
-                team_profile = {
-                    "size": team.team_size,
-                    "experience": team.experience_level,
-                    "skills": team.tech_skills,
-                    "deadline": team.deadline or 30
-                }
-                problems_list = [
-                    {
-                        "id": str(p.id),
-                        "description": p.description,
-                        "required_skills": p.tech_stack,
-                        "complexity": getattr(p, "complexity", "medium"),
-                        "deadline": getattr(p, "deadline", 30)
-                    }
-                    for p in problems
-                ]
-                matches = match_problems_to_team(team_profile, problems_list)
-                return {"status": "success", "matches": matches}
-                
-            except Exception as e:
-                logger.error(f"Error matching problems with team: {str(e)}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Error matching problems with team: {str(e)}"
-                )
-        
-        # If no team_id, return problems without matching
-        return [{"problem": p, "score": 0, "tech_match": 0} for p in problems[:10]]
+        return await upload_response(
+            file_processor, problems, event_id, team_id, db, current_user
+        )
 
     except HTTPException:
         raise
@@ -110,6 +94,197 @@ async def upload_and_process(
             detail=f"An unexpected error occurred: {str(e)}"
         )
 
+@router.post("/uploads", response_model=UploadSession, status_code=status.HTTP_201_CREATED)
+@track_request_metrics
+async def start_chunked_upload(
+    session_in: UploadSessionCreate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Start a chunked upload for a large sheet. Send each part with
+    PUT /uploads/{id}/parts/{n} and an X-Content-SHA256 header, then
+    POST /uploads/{id}/complete. Parts may be sent in any order; after an
+    interruption, GET /uploads/{id} lists the parts still missing.
+    """
+    ensure_event_owned(db, session_in.event_id, current_user.id)
+    try:
+        session = upload_sessions.create(
+            filename=session_in.filename,
+            size=session_in.size,
+            owner_id=current_user.id,
+            event_id=session_in.event_id,
+            on_duplicate=session_in.on_duplicate
+        )
+    except FileProcessingError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return session_to_dict(session)
+
+@router.get("/uploads/{session_id}", response_model=UploadSession)
+@track_request_metrics
+async def get_chunked_upload(
+    session_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Status of a chunked upload: which parts are confirmed and which are missing
+    """
+    return session_to_dict(get_upload_session(session_id, current_user.id))
+
+@router.put("/uploads/{session_id}/parts/{part_number}", response_model=UploadPart)
+@track_request_metrics
+async def upload_part(
+    session_id: str,
+    part_number: int,
+    request: Request,
+    x_content_sha256: str = Header(...),
+    current_user = Depends(get_current_user)
+):
+    """
+    Upload one part as the raw request body. It is confirmed only if its
+    SHA-256 matches X-Content-SHA256; otherwise send it again.
+    """
+    session = get_upload_session(session_id, current_user.id)
+    try:
+        return await upload_sessions.write_part(session, part_number, request.stream(), x_content_sha256)
+    except FileProcessingError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.post("/uploads/{session_id}/complete", response_model=MatchResponse)
+@track_request_metrics
+async def complete_chunked_upload(
+    session_id: str,
+    team_id: int = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Ingest a chunked upload once every part is confirmed. The response is
+    the same as for /upload; progress is at /ingests/{session_id}.
+    """
+    session = get_upload_session(session_id, current_user.id)
+    missing = upload_sessions.missing_parts(session)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Parts not uploaded yet: {', '.join(map(str, missing[:20]))}"
+        )
+
+    file_processor = FileProcessorService()
+    try:
+        problems = await file_processor.process_local_file(
+            str(upload_sessions.data_path(session_id)),
+            session["filename"],
+            db,
+            on_duplicate=session["on_duplicate"],
+            event_id=session["event_id"],
+            progress=ingest_tracker.start(session["filename"], owner_id=current_user.id, ingest_id=session_id),
+            index_with=index_stream
+        )
+        logger.info(f"Successfully processed {len(problems)} problems from upload session {session_id}")
+    except FileProcessingError as e:
+        raise processing_error_to_http(e)
+    upload_sessions.discard(session_id)
+    return await upload_response(
+        file_processor, problems, session["event_id"], team_id, db, current_user
+    )
+
+@router.delete("/uploads/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+@track_request_metrics
+async def abort_chunked_upload(
+    session_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Abandon a chunked upload and delete its parts
+    """
+    get_upload_session(session_id, current_user.id)
+    upload_sessions.discard(session_id)
+    return
+
+@router.get("/ingests", response_model=List[IngestStatus])
+@track_request_metrics
+async def get_ingests(
+    current_user = Depends(get_current_user)
+):
+    """
+    Your recent uploads with per-stage progress, most recent first
+    """
+    return [progress.to_dict() for progress in ingest_tracker.list(owner_id=current_user.id)]
+
+@router.get("/ingests/{ingest_id}", response_model=IngestStatus)
+@track_request_metrics
+async def get_ingest(
+    ingest_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Row counts and timings of each stage (receive, parse, validate, store,
+    embed, index) of one upload
+    """
+    progress = ingest_tracker.get(ingest_id)
+    if progress is None or progress.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ingest not found"
+        )
+    return progress.to_dict()
+
+@router.get("/export")
+@track_request_metrics
+async def export_catalog(
+    format: str = "parquet",
+    event_id: int = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Download the problem catalog (or one event's) as Parquet, an Arrow IPC
+    file, CSV, NDJSON or .xlsx, streamed as it is written. The file can be
+    uploaded as is.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of {', '.join(EXPORT_FORMATS)}"
+        )
+    if format in COLUMNAR_FORMATS and not ARROW_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet and Arrow exports are not enabled on this server (pyarrow is not installed)"
+        )
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"problems-event-{event_id}{extension}" if event_id is not None else f"problems{extension}"
+    return StreamingResponse(
+        stream_catalog(
+            db,
+            format,
+            event_id,
+            batch_size=settings.EXPORT_BATCH_ROWS,
+            row_batch_size=settings.EXPORT_STREAM_ROWS
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/clusters", response_model=List[ProblemCluster])
+@track_request_metrics
+async def get_problem_clusters(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    List topic clusters of the problem catalog with sizes and representative titles
+    """
+    try:
+        return await get_clusters_with_metrics(db)
+    except DatabaseError as e:
+        logger.error(f"Database error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred"
+        )
+
 @router.get("/problems/{problem_id}", response_model=Problem)
 @track_request_metrics
 async def get_problem(
@@ -136,6 +311,31 @@ async def get_problem(
             detail="Database error occurred"
         )
 
+@router.delete("/problems/{problem_id}", status_code=status.HTTP_204_NO_CONTENT)
+@track_request_metrics
+async def delete_problem(
+    problem_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Delete a problem from the catalog. Only the owner of the problem's
+    event or an admin may do so.
+    """
+    problem = await get_problem_with_metrics(problem_id, db)
+    if not problem:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Problem not found"
+        )
+    if not problem_service.can_delete(db, problem, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to delete this problem"
+        )
+    await delete_problem_with_metrics(problem_id, db)
+    return
+
 @track_db_operation("select", "teams")
 async def get_team_with_metrics(team_id: int, user_id: int, db: Session):
     team = db.query(Team).filter(Team.id == team_id).first()
@@ -153,4 +353,125 @@ async def get_team_with_metrics(team_id: int, user_id: int, db: Session):
 
 @track_db_operation("select", "problems")
 async def get_problem_with_metrics(problem_id: int, db: Session):
-    return db.query(Problem).filter(Problem.id == problem_id).first()
\ No newline at end of file
+    return db.query(ProblemModel).filter(ProblemModel.id == problem_id).first()
+
+@track_db_operation("delete", "problems")
+async def delete_problem_with_metrics(problem_id: int, db: Session):
+    problem_service.remove(db=db, id=problem_id)
+
+@track_db_operation("select", "problem_clusters")
+async def get_clusters_with_metrics(db: Session):
+    return problem_clusters.list_clusters(db)
+
+def processing_error_to_http(e: FileProcessingError) -> HTTPException:
+    if isinstance(e, FileTooLargeError):
+        logger.error(f"Upload too large: {str(e)}")
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=e.detail
+        )
+    if isinstance(e, InvalidFileFormatError):
+        logger.error(f"Invalid file format: {str(e)}")
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if isinstance(e, MalformedDataError):
+        logger.error(f"Malformed data: {str(e)}")
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    logger.error(f"File processing error: {str(e)}")
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="Error processing file"
+    )
+
+def ensure_event_owned(db: Session, event_id: Optional[int], user_id: int) -> None:
+    """
+    Only an event's owner may add problems to its catalog
+    """
+    if event_id is None:
+        return
+    event = event_service.get(db=db, id=event_id)
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    if event.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to add problems to this event"
+        )
+
+async def upload_response(
+    file_processor: FileProcessorService,
+    problems: List[ProblemModel],
+    event_id: Optional[int],
+    team_id: Optional[int],
+    db: Session,
+    current_user
+) -> dict:
+    # New problems are already being embedded and clustered by the pipeline
+    if not file_processor.reused_upload and event_id is not None:
+        partition_registry.invalidate(event_id)
+
+    # If team_id provided, get team and match problems
+    if team_id:
+        try:
+            team = await get_team_with_metrics(team_id, current_user.id, db)
+            
+            team_profile = team_to_profile(team)
+            problems_list = [problem_to_details(p) for p in problems]
+            matches = await match_problems_to_team(team_profile, problems_list, Priority.BATCH)
+            return {
+                "status": "success",
+                "matches": matches,
+                "duplicates": file_processor.duplicates,
+                "ingest_id": file_processor.progress.id
+            }
+            
+        except Exception as e:
+            logger.error(f"Error matching problems with team: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error matching problems with team: {str(e)}"
+            )
+    
+    # If no team_id, return problems without matching
+    return {
+        "status": "success",
+        "matches": [],
+        "problems": [problem_to_dict(p) for p in problems[:10]],
+        "duplicates": file_processor.duplicates,
+        "ingest_id": file_processor.progress.id
+    }
+
+def get_upload_session(session_id: str, user_id: int) -> dict:
+    session = upload_sessions.get(session_id)
+    if session is None or session["owner_id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    return session
+
+def session_to_dict(session: dict) -> dict:
+    return {
+        **session,
+        "received_parts": upload_sessions.received_parts(session["id"]),
+        "missing_parts": upload_sessions.missing_parts(session)
+    }
+
+def problem_to_dict(problem) -> dict:
+    return {
+        "id": problem.id,
+        "title": problem.title,
+        "description": problem.description,
+        "tech_stack": problem.tech_stack,
+        "created_at": problem.created_at,
+        "source_file": problem.source_file,
+        "event_id": problem.event_id
+    }
\ No newline at end of file
@@ -1,10 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 from ...core.exceptions import DatabaseError
 from ...db.session import get_db
-from ...schemas.team import TeamCreate, Team, TeamUpdate
+from ...schemas.team import TeamCreate, Team, TeamUpdate, SimilarTeam
 from ...services.team_service import team_service
+from ...services.team_index import team_index
+from ...services.event_service import event_service
+from ...services.skill_analytics import skill_analytics
+from ...services.match_export import embed_team, rank_problems, stream_team_matches
+from ...services.row_writers import ROW_FORMATS
+from ...core.config import settings
+from ...schemas.analytics import TeamCoverage
 from ..deps import get_current_user
 from ...core.metrics import track_request_metrics, track_db_operation
 import logging
@@ -22,6 +30,7 @@ async def create_team(
     """
     Create a new team
     """
+    ensure_event_exists(db, team_in.event_id)
     try:
         # Validating team data
         if team_in.team_size <= 0:
@@ -75,6 +84,7 @@ async def update_team(
     """
     Update a team
     """
+    ensure_event_exists(db, team_in.event_id)
     try:
         # Get existing team
         team = await get_team_with_metrics(team_id, current_user.id, db)
@@ -101,6 +111,111 @@ async def get_team(
     """
     return await get_team_with_metrics(team_id, current_user.id, db)
 
+@router.get("/{team_id}/similar", response_model=List[SimilarTeam])
+@track_request_metrics
+async def get_similar_teams(
+    team_id: int,
+    k: int = 5,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Get the k teams with the most similar stack, experience and size,
+    among the current user's teams
+    """
+    if k <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="k must be greater than 0"
+        )
+    team = await get_team_with_metrics(team_id, current_user.id, db)
+    neighbours = team_index.similar(db, team, k)
+    teams = {
+        t.id: t for t in team_service.get_multi_by_ids(db, ids=[neighbour_id for neighbour_id, _ in neighbours])
+    }
+    return [
+        {"team": teams[neighbour_id], "similarity": similarity}
+        for neighbour_id, similarity in neighbours
+        if neighbour_id in teams
+    ]
+
+@router.get("/{team_id}/coverage", response_model=TeamCoverage)
+@track_request_metrics
+async def get_team_coverage(
+    team_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    How much of the problem catalog's skill demand the team's skills cover
+    """
+    team = await get_team_with_metrics(team_id, current_user.id, db)
+    return skill_analytics.team_coverage(db, team.tech_skills)
+
+@router.get("/{team_id}/matches/export")
+@track_request_metrics
+async def export_team_matches(
+    team_id: int,
+    format: str = "csv",
+    event_id: int = None,
+    limit: int = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Download the problems ranked for a team, best first, with the skills
+    each covers and misses, as CSV, NDJSON or .xlsx. Ranks the team's
+    event catalog (or event_id's), otherwise every embedded problem.
+    Ranking finishes before the response starts; rows are then streamed.
+    limit keeps only the top ones.
+    """
+    if format not in ROW_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of {', '.join(ROW_FORMATS)}"
+        )
+    if limit is not None and limit <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be greater than 0"
+        )
+    team = await get_team_with_metrics(team_id, current_user.id, db)
+    ensure_event_exists(db, event_id)
+    if event_id is None:
+        event_id = team.event_id
+    # Ranked up front: once streaming starts, errors can't be reported
+    try:
+        query = await embed_team(team)
+    except Exception as e:
+        logger.error(f"Error embedding team {team_id} for export: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Team embedding is unavailable, try again later"
+        )
+    try:
+        problem_ids, scores = await rank_problems(
+            db, query, event_id, limit, batch_size=settings.EXPORT_STREAM_ROWS
+        )
+    except Exception as e:
+        logger.error(f"Error ranking problems for team {team_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error ranking problems for the team"
+        )
+    media_type, extension = ROW_FORMATS[format]
+    return StreamingResponse(
+        stream_team_matches(
+            db,
+            team,
+            problem_ids,
+            scores,
+            format,
+            batch_size=settings.EXPORT_STREAM_ROWS
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="team-{team_id}-matches{extension}"'}
+    )
+
 @router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
 @track_request_metrics
 async def delete_team(
@@ -115,6 +230,13 @@ async def delete_team(
     await delete_team_with_metrics(db, team_id)
     return
 
+def ensure_event_exists(db: Session, event_id: int = None):
+    if event_id is not None and not event_service.get(db=db, id=event_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
 # Helper functions with metrics
 @track_db_operation("insert", "teams")
 async def create_team_with_metrics(db: Session, team_in: TeamCreate, owner_id: int):
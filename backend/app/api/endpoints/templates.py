@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+from ...db.session import get_db
+from ...schemas.sheet_template import SheetTemplate, SheetTemplateCreate, SheetTemplateUpdate
+from ...services.sheet_templates import header_fingerprint, sheet_template_service
+from ..deps import get_current_user
+from ...core.metrics import track_request_metrics
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+def get_template_or_404(db: Session, template_id: int):
+    template = sheet_template_service.get(db, id=template_id)
+    if not template:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Template not found"
+        )
+    return template
+
+def get_editable_template(db: Session, template_id: int, user):
+    template = get_template_or_404(db, template_id)
+    if not sheet_template_service.can_edit(template, user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the template's creator or an admin can change it"
+        )
+    return template
+
+@router.get("/", response_model=List[SheetTemplate])
+@track_request_metrics
+async def get_templates(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    List known sheet layouts, learned and manual
+    """
+    return sheet_template_service.get_multi(db, skip=skip, limit=limit)
+
+@router.post("/", response_model=SheetTemplate, status_code=status.HTTP_201_CREATED)
+@track_request_metrics
+async def create_template(
+    template_in: SheetTemplateCreate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Register a sheet layout by its header and the columns to read from it.
+    Uploads with this header skip column detection.
+    """
+    existing = sheet_template_service.get_by_fingerprint(db, fingerprint=header_fingerprint(template_in.columns))
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"This layout is already template {existing.id}"
+        )
+    return sheet_template_service.create(db, obj_in=template_in, owner_id=current_user.id)
+
+@router.get("/{template_id}", response_model=SheetTemplate)
+@track_request_metrics
+async def get_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Get a specific sheet layout by ID
+    """
+    return get_template_or_404(db, template_id)
+
+@router.put("/{template_id}", response_model=SheetTemplate)
+@track_request_metrics
+async def update_template(
+    template_id: int,
+    template_in: SheetTemplateUpdate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Change which columns are read for a layout. Edited templates are no
+    longer changed by learning. Only the creator or an admin may edit;
+    learned templates only an admin.
+    """
+    template = get_editable_template(db, template_id, current_user)
+    return sheet_template_service.update(db, db_obj=template, obj_in=template_in)
+
+@router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+@track_request_metrics
+async def delete_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Forget a sheet layout; it is detected (and learned) again on next upload.
+    Only the creator or an admin may delete it.
+    """
+    get_editable_template(db, template_id, current_user)
+    sheet_template_service.remove(db, id=template_id)
@@ -0,0 +1,367 @@
+"""
+Offline maintenance commands, run from the backend directory:
+
+    python -m app.cli index [--batch-size 96] [--concurrency 4] [--restart]
+    python -m app.cli snapshot
+    python -m app.cli recluster
+    python -m app.cli rebuild-stats
+    python -m app.cli hash-problems
+    python -m app.cli export problems.parquet [--event-id 3]   (or .arrow, .csv, .ndjson, .xlsx)
+    python -m app.cli ingest problems.parquet [--event-id 3] [--on-duplicate skip]
+
+Set EMBED_PROVIDER=local to embed with a local model instead of Cohere.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+from .core.config import settings
+from .core.exceptions import FileProcessingError
+from .db.session import SessionLocal
+from .models.problem import Problem
+from .services.catalog_export import ARROW_AVAILABLE, COLUMNAR_FORMATS, EXPORT_FORMATS, stream_catalog
+from .services.cohere_service import embed_texts
+from .services.content_hashing import problem_content_hash
+from .services.embedding_store import get_embeddings, save_embeddings
+from .services.embedding_snapshots import embedding_snapshots
+from .services.file_processor import DUPLICATE_ACTIONS, FileProcessorService
+from .services.llm_scheduler import Priority
+from .services.parse_pool import parse_pool
+from .services.problem_clusters import problem_clusters
+from .services.skill_analytics import skill_analytics
+
+DEFAULT_CHECKPOINT = "data/index_checkpoint.json"
+
+
+def _load_checkpoint(path: Path, event_id: Optional[int]) -> dict:
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if checkpoint.get("model") != settings.EMBEDDING_MODEL_ID or checkpoint.get("event_id") != event_id:
+        print("Ignoring checkpoint from a run with a different model or event")
+        return {}
+    return checkpoint
+
+
+def _save_checkpoint(path: Path, checkpoint: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+async def _embed_window(write_db, window: List[List]) -> int:
+    """
+    Embed one window of batches concurrently and store the results.
+    Returns how many problems were embedded.
+    """
+    ids = [row.id for batch in window for row in batch]
+    stored = get_embeddings(write_db, ids)
+    pending = [[row for row in batch if row.id not in stored] for batch in window]
+    pending = [batch for batch in pending if batch]
+    if not pending:
+        return 0
+
+    results = await asyncio.gather(*(
+        embed_texts([row.description for row in batch], Priority.BATCH) for batch in pending
+    ))
+    for batch, vectors in zip(pending, results):
+        save_embeddings(write_db, [row.id for row in batch], vectors)
+    write_db.commit()
+    return sum(len(batch) for batch in pending)
+
+
+class IndexProgress:
+    """
+    Counters for an index run, saved as the checkpoint after every window
+    """
+
+    def __init__(self, checkpoint: dict, total: int, event_id: Optional[int] = None):
+        self.event_id = event_id
+        self.last_id = checkpoint.get("last_id", 0)
+        self.embedded = checkpoint.get("embedded", 0)
+        self.skipped = checkpoint.get("skipped", 0)
+        self.total = total
+        self.seen = 0
+        self.started = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.seen / elapsed if elapsed else 0.0
+
+    def record(self, window: List[List], embedded: int) -> None:
+        size = sum(len(batch) for batch in window)
+        self.embedded += embedded
+        self.skipped += size - embedded
+        self.seen += size
+        self.last_id = window[-1][-1].id
+        print(
+            f"{self.seen}/{self.total} checked, {self.embedded} embedded, "
+            f"{self.skipped} already stored, {self.rate:.0f} problems/s"
+        )
+
+    def to_checkpoint(self) -> dict:
+        return {
+            "model": settings.EMBEDDING_MODEL_ID,
+            "event_id": self.event_id,
+            "last_id": self.last_id,
+            "embedded": self.embedded,
+            "skipped": self.skipped
+        }
+
+
+async def index(
+    batch_size: int,
+    concurrency: int,
+    checkpoint_path: Path,
+    restart: bool = False,
+    event_id: Optional[int] = None
+) -> None:
+    """
+    Embed every problem that has no stored embedding for the current model,
+    `concurrency` batches at a time. Progress is checkpointed after each
+    window, so an interrupted run resumes after the last stored problem.
+    """
+    checkpoint = {} if restart else _load_checkpoint(checkpoint_path, event_id)
+    if checkpoint.get("last_id"):
+        print(
+            f"Resuming after problem {checkpoint['last_id']} "
+            f"({checkpoint.get('embedded', 0)} embedded, {checkpoint.get('skipped', 0)} already stored)"
+        )
+
+    read_db = SessionLocal()
+    write_db = SessionLocal()
+    try:
+        query = (
+            read_db.query(Problem.id, Problem.description)
+            .filter(Problem.id > checkpoint.get("last_id", 0))
+            .order_by(Problem.id)
+        )
+        if event_id is not None:
+            query = query.filter(Problem.event_id == event_id)
+        progress = IndexProgress(checkpoint, query.count(), event_id)
+        print(f"{progress.total} problems to check with {settings.EMBEDDING_MODEL_ID}")
+
+        async def flush(window: List[List]) -> None:
+            embedded = await _embed_window(write_db, window)
+            progress.record(window, embedded)
+            _save_checkpoint(checkpoint_path, progress.to_checkpoint())
+
+        # Server-side cursor: rows arrive a window at a time instead of all at once
+        window: List[List] = []
+        batch: List = []
+        for row in query.yield_per(batch_size * concurrency):
+            batch.append(row)
+            if len(batch) == batch_size:
+                window.append(batch)
+                batch = []
+                if len(window) == concurrency:
+                    await flush(window)
+                    window = []
+        if batch:
+            window.append(batch)
+        if window:
+            await flush(window)
+    finally:
+        read_db.close()
+        write_db.close()
+
+    print(
+        f"Done: {progress.seen} problems checked at {progress.rate:.0f}/s, "
+        f"{progress.embedded} embedded, {progress.skipped} already stored"
+    )
+
+
+def snapshot() -> None:
+    db = SessionLocal()
+    try:
+        version = embedding_snapshots.write(db)
+    finally:
+        db.close()
+    print(f"Wrote embedding snapshot {version}" if version else "No embeddings to snapshot")
+
+
+def recluster() -> None:
+    db = SessionLocal()
+    try:
+        count = problem_clusters.recluster(db)
+    finally:
+        db.close()
+    print(f"Built {count} clusters")
+
+
+def rebuild_stats() -> None:
+    db = SessionLocal()
+    try:
+        count = skill_analytics.rebuild(db)
+    finally:
+        db.close()
+    print(f"Rebuilt skill counters from {count} problems")
+
+
+def hash_problems(batch_size: int = 5000) -> None:
+    """
+    Fill content_hash for problems stored before it existed. Exact copies of
+    an already hashed problem keep a NULL hash, as the index is unique.
+    """
+    db = SessionLocal()
+    hashed = duplicates = 0
+    last_id = 0
+    try:
+        while True:
+            batch = (
+                db.query(Problem.id, Problem.description, Problem.event_id)
+                .filter(Problem.content_hash.is_(None), Problem.id > last_id)
+                .order_by(Problem.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+            hashes = {}
+            for row in batch:
+                hashes.setdefault(problem_content_hash(row.description, row.event_id), row.id)
+            taken = {
+                content_hash for (content_hash,) in
+                db.query(Problem.content_hash).filter(Problem.content_hash.in_(list(hashes)))
+            }
+            updates = [
+                {"id": problem_id, "content_hash": content_hash}
+                for content_hash, problem_id in hashes.items() if content_hash not in taken
+            ]
+            db.bulk_update_mappings(Problem, updates)
+            db.commit()
+            hashed += len(updates)
+            duplicates += len(batch) - len(updates)
+    finally:
+        db.close()
+    print(f"Hashed {hashed} problems; {duplicates} exact duplicates left unhashed")
+
+
+def export_format(output: Path) -> str:
+    if output.suffix == ".feather":
+        return "arrow"
+    for fmt, (_, extension) in EXPORT_FORMATS.items():
+        if output.suffix == extension:
+            return fmt
+    return "parquet"
+
+
+def export(output: Path, event_id: Optional[int] = None) -> None:
+    fmt = export_format(output)
+    db = SessionLocal()
+    started = time.monotonic()
+    try:
+        with open(output, "wb") as f:
+            for chunk in stream_catalog(
+                db,
+                fmt,
+                event_id,
+                batch_size=settings.EXPORT_BATCH_ROWS,
+                row_batch_size=settings.EXPORT_STREAM_ROWS
+            ):
+                f.write(chunk)
+    finally:
+        db.close()
+    print(f"Wrote {output} ({output.stat().st_size / 1024 / 1024:.1f} MB) in {time.monotonic() - started:.1f}s")
+
+
+async def ingest(path: Path, event_id: Optional[int] = None, on_duplicate: str = "report") -> None:
+    """
+    Load a sheet or a Parquet/Arrow export into the catalog without going
+    through HTTP; embedding is left to the index command
+    """
+    db = SessionLocal()
+    processor = FileProcessorService()
+    started = time.monotonic()
+    try:
+        problems = await processor.process_local_file(
+            str(path), path.name, db, on_duplicate=on_duplicate, event_id=event_id
+        )
+    finally:
+        db.close()
+        parse_pool.shutdown()
+    if processor.reused_upload:
+        print(f"{path} was already ingested: {len(problems)} problems")
+    else:
+        print(
+            f"Ingested {len(problems)} problems in {time.monotonic() - started:.1f}s, "
+            f"{len(processor.duplicates)} near-duplicate rows"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Offline catalog maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = commands.add_parser("index", help="Embed every problem without a stored embedding")
+    index_parser.add_argument("--batch-size", type=int, default=settings.EMBED_BATCH_MAX_SIZE)
+    index_parser.add_argument("--concurrency", type=int, default=settings.LLM_MAX_CONCURRENCY)
+    index_parser.add_argument("--checkpoint", type=Path, default=Path(DEFAULT_CHECKPOINT))
+    index_parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    index_parser.add_argument("--event-id", type=int, default=None, help="Only index one event's problems")
+    index_parser.add_argument("--snapshot", action="store_true", help="Write an embedding snapshot afterwards")
+    index_parser.add_argument("--recluster", action="store_true", help="Rebuild topic clusters afterwards")
+
+    commands.add_parser("snapshot", help="Write an embedding snapshot for the workers to map")
+    commands.add_parser("recluster", help="Rebuild topic clusters from stored embeddings")
+    commands.add_parser("rebuild-stats", help="Recompute skill demand counters")
+    commands.add_parser("hash-problems", help="Fill content hashes for problems stored before them")
+
+    export_parser = commands.add_parser(
+        "export", help="Write the catalog to a .parquet, .arrow, .csv, .ndjson or .xlsx file"
+    )
+    export_parser.add_argument("output", type=Path)
+    export_parser.add_argument("--event-id", type=int, default=None, help="Only export one event's problems")
+
+    ingest_parser = commands.add_parser("ingest", help="Load a sheet, Parquet or Arrow file into the catalog")
+    ingest_parser.add_argument("path", type=Path)
+    ingest_parser.add_argument("--event-id", type=int, default=None)
+    ingest_parser.add_argument("--on-duplicate", choices=DUPLICATE_ACTIONS, default="report")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "index":
+        if args.batch_size <= 0 or args.concurrency <= 0:
+            parser.error("--batch-size and --concurrency must be greater than 0")
+        try:
+            asyncio.run(index(args.batch_size, args.concurrency, args.checkpoint, args.restart, args.event_id))
+        except KeyboardInterrupt:
+            print(f"Interrupted; progress is saved in {args.checkpoint}, run again to resume")
+            return 130
+        if args.snapshot:
+            snapshot()
+        if args.recluster:
+            recluster()
+    elif args.command == "snapshot":
+        snapshot()
+    elif args.command == "recluster":
+        recluster()
+    elif args.command == "rebuild-stats":
+        rebuild_stats()
+    elif args.command == "hash-problems":
+        hash_problems()
+    elif args.command == "export":
+        if export_format(args.output) in COLUMNAR_FORMATS and not ARROW_AVAILABLE:
+            parser.error("Parquet and Arrow exports need the pyarrow package (pip install pyarrow)")
+        export(args.output, args.event_id)
+    elif args.command == "ingest":
+        try:
+            asyncio.run(ingest(args.path, args.event_id, args.on_duplicate))
+        except FileProcessingError as e:
+            print(e.detail, file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from fnmatch import fnmatchcase
+from typing import Deque, Iterable, Optional
+from .config import settings
+from .exceptions import ServiceOverloadedError
+from .logging import logger
+from .metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_WAIT, ADMISSION_REJECTED
+
+class AdmissionController:
+    """
+    Admission control for expensive endpoints.
+
+    At most `max_in_flight` requests are served at once; up to `max_queue`
+    more wait for a slot. Queueing delay is watched CoDel-style: once every
+    admission within `interval_ms` has waited longer than `target_delay_ms`,
+    the queue is standing rather than absorbing a burst, and requests that
+    would have to wait are shed immediately until the delay drops again.
+    Shed requests get a Retry-After based on recent service times.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        max_queue: int = 32,
+        target_delay_ms: float = 500.0,
+        interval_ms: float = 5000.0,
+        max_wait_ms: float = 10000.0,
+        paths: Iterable[str] = ()
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.target_delay = target_delay_ms / 1000
+        self.interval = interval_ms / 1000
+        self.max_wait = max_wait_ms / 1000
+        self.paths = set(paths)
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._first_above_time = 0.0
+        self.dropping = False
+        self._avg_service_time = 1.0
+
+    def route_for(self, path: str) -> Optional[str]:
+        """
+        The configured path (or pattern, e.g. /uploads/*/complete) that a
+        request path falls under; metrics are labelled with it
+        """
+        path = path.rstrip("/")
+        if path in self.paths:
+            return path
+        return next((pattern for pattern in self.paths if "*" in pattern and fnmatchcase(path, pattern)), None)
+
+    def applies_to(self, path: str) -> bool:
+        return self.route_for(path) is not None
+
+    def retry_after(self) -> int:
+        """
+        Seconds until a slot is likely to be free: the work ahead of a new
+        request spread over the available slots
+        """
+        ahead = self.in_flight + len(self._waiters)
+        estimate = ahead / max(self.max_in_flight, 1) * self._avg_service_time
+        return max(1, math.ceil(estimate))
+
+    def _reject(self, path: str, reason: str) -> ServiceOverloadedError:
+        ADMISSION_REJECTED.labels(path=path, reason=reason).inc()
+        retry_after = self.retry_after()
+        logger.warning(f"Shedding request to {path} ({reason}), retry after {retry_after}s")
+        return ServiceOverloadedError(reason, retry_after)
+
+    def _record_delay(self, delay: float, now: float) -> None:
+        if delay < self.target_delay:
+            self._first_above_time = 0.0
+            self.dropping = False
+        elif not self._first_above_time:
+            self._first_above_time = now + self.interval
+        elif now >= self._first_above_time:
+            self.dropping = True
+
+    def _release(self) -> None:
+        # Hand the slot straight to the oldest waiter
+        if self._waiters:
+            self._waiters.popleft().set_result(None)
+        else:
+            self.in_flight -= 1
+
+    async def _acquire(self, path: str) -> None:
+        arrived = time.monotonic()
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self._record_delay(0.0, arrived)
+            return
+
+        if self.dropping:
+            raise self._reject(path, "queue delay above target")
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject(path, "queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                # The slot was handed over just as we gave up
+                if isinstance(e, asyncio.CancelledError):
+                    self._release()
+                    raise
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                now = time.monotonic()
+                self._record_delay(now - arrived, now)
+                raise self._reject(path, "timed out waiting for capacity")
+
+        now = time.monotonic()
+        ADMISSION_QUEUE_WAIT.labels(path=path).observe(now - arrived)
+        self._record_delay(now - arrived, now)
+
+    @asynccontextmanager
+    async def admit(self, path: str):
+        """
+        Hold a slot for the duration of the block, or raise
+        ServiceOverloadedError if the request should be shed
+        """
+        await self._acquire(path)
+        ADMISSION_IN_FLIGHT.labels(path=path).inc()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * elapsed
+            ADMISSION_IN_FLIGHT.labels(path=path).dec()
+            self._release()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "dropping": self.dropping,
+            "avg_service_seconds": round(self._avg_service_time, 3)
+        }
+
+
+admission_controller = AdmissionController(
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    target_delay_ms=settings.ADMISSION_TARGET_DELAY_MS,
+    interval_ms=settings.ADMISSION_INTERVAL_MS,
+    max_wait_ms=settings.ADMISSION_MAX_WAIT_MS,
+    paths=settings.ADMISSION_PATHS
+)
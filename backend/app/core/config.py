@@ -25,11 +25,91 @@ class Settings(BaseSettings):
     
     # API Keys
     COHERE_API_KEY: str
+    COHERE_EMBED_MODEL: str = "embed-english-v2.0"
+    
+    # Embedding provider: "cohere", or "local" for offline runs (needs sentence-transformers)
+    EMBED_PROVIDER: str = "cohere"
+    LOCAL_EMBED_MODEL: str = "all-MiniLM-L6-v2"
+    
+    # Recommendation / skill gap text: "template", "llm" or "auto" (LLM with template fallback)
+    SKILL_ANALYSIS_MODE: str = "template"
+    LLM_TIMEOUT_SECONDS: float = 5.0
+    
+    # Embedding micro-batching across concurrent requests
+    EMBED_BATCH_WINDOW_MS: float = 10.0
+    EMBED_BATCH_MAX_SIZE: int = 96
+    
+    # Hedged embedding calls: duplicate slow calls after the observed tail latency
+    EMBED_HEDGING_ENABLED: bool = False
+    EMBED_HEDGE_QUANTILE: float = 0.95
+    EMBED_HEDGE_MIN_DELAY_MS: float = 50.0
+    EMBED_HEDGE_MAX_DELAY_MS: float = 2000.0
+    EMBED_HEDGE_BUDGET: float = 0.05  # extra calls as a fraction of all calls
+    
+    # Upload ingestion
+    MAX_UPLOAD_SIZE_MB: int = 200
+    INGEST_CHUNK_ROWS: int = 5000  # CSV rows parsed and stored per chunk
+    INGEST_COMMIT_ROWS: int = 5000  # rows stored per transaction
+    INGEST_INSERT_BATCH_ROWS: int = 1000  # rows per multi-row INSERT statement
+    PARSE_POOL_SIZE: int = 2  # worker processes parsing uploads; 0 parses in a thread
+    INGEST_QUEUE_CHUNKS: int = 4  # chunks waiting between ingest stages before the earlier stage pauses
+    
+    # Chunked, resumable uploads: parts are written straight into place on local disk
+    UPLOAD_SESSION_DIR: str = "data/upload_sessions"
+    UPLOAD_PART_SIZE_MB: int = 8
+    UPLOAD_SESSION_TTL_HOURS: float = 24.0  # unfinished sessions are removed after this
+    EXPORT_BATCH_ROWS: int = 50000  # catalog rows per record batch in Parquet/Arrow exports
+    EXPORT_STREAM_ROWS: int = 2000  # rows fetched and serialized per chunk in CSV/NDJSON/XLSX exports
+    
+    # Near-duplicate detection at ingest (MinHash + LSH)
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8
+    MINHASH_NUM_PERM: int = 128
+    LSH_BANDS: int = 16
+    
+    # Topic clustering of the problem catalog
+    PROBLEM_CLUSTER_COUNT: int = 20
+    RECLUSTER_AFTER_FRACTION: float = 0.2  # re-cluster once this share of the catalog is new
+    
+    # Team similarity index
+    TEAM_INDEX_REFRESH_SECONDS: float = 300.0
+    
+    # Memory-mapped embedding snapshots shared by all workers on a host
+    EMBEDDING_SNAPSHOT_DIR: str = "data/embedding_snapshots"
+    EMBEDDING_SNAPSHOT_KEEP: int = 3
+    EMBEDDING_SNAPSHOT_REFRESH_ROWS: int = 1000  # new embeddings before a fresh snapshot
+    
+    # Per-event catalog partitions kept in memory (embeddings + lexical index)
+    PARTITION_MEMORY_BUDGET_MB: float = 512.0
+    # Reload a partition this long after loading it, for edits made by other workers
+    PARTITION_TTL_SECONDS: float = 300.0
+    
+    # Admission control on expensive endpoints (matching, uploads)
+    ADMISSION_MAX_IN_FLIGHT: int = 16
+    ADMISSION_MAX_QUEUE: int = 32
+    ADMISSION_TARGET_DELAY_MS: float = 500.0  # CoDel target queueing delay
+    ADMISSION_INTERVAL_MS: float = 5000.0  # how long the delay may stay above target
+    ADMISSION_MAX_WAIT_MS: float = 10000.0
+    ADMISSION_PATHS: list = [
+        "/api/v1/matching/match",
+        "/api/v1/matching/match/batch",
+        "/api/v1/problems/upload",
+        "/api/v1/problems/uploads/*/complete"
+    ]
+    
+    # Outbound LLM scheduling: concurrent provider calls and per-class weights
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_PRIORITY_WEIGHTS: dict = {
+        "interactive": 8,
+        "batch": 2,
+        "background": 1
+    }
     
     # Security
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Users who may edit shared resources, such as sheet templates, they did not create
+    ADMIN_EMAILS: List[str] = []
     
     # CORS
     CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -74,6 +154,16 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = True
+    
+    @property
+    def EMBEDDING_MODEL_ID(self) -> str:
+        """
+        Model name stored with every embedding, so vectors from different
+        providers are never compared with each other
+        """
+        if self.EMBED_PROVIDER == "local":
+            return f"local:{self.LOCAL_EMBED_MODEL}"
+        return self.COHERE_EMBED_MODEL
         
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -24,9 +24,33 @@ class MalformedDataError(FileProcessingError):
     def __init__(self, detail: str):
         super().__init__(f"Malformed data in file: {detail}")
 
+class FileTooLargeError(FileProcessingError):
+    def __init__(self, max_size_mb: int):
+        super().__init__(f"File is larger than the {max_size_mb} MB upload limit")
+        self.status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+class ChecksumMismatchError(FileProcessingError):
+    def __init__(self, part_number: int):
+        super().__init__(f"Part {part_number} does not match its checksum; upload it again")
+        self.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+
 class TeamError(HTTPException):
     def __init__(self, detail: str):
         super().__init__(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Team error: {detail}"
-        )
\ No newline at end of file
+        )
+
+class TemplateError(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Template error: {detail}"
+        )
+class ServiceOverloadedError(HTTPException):
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Service overloaded: {detail}",
+            headers={"Retry-After": str(retry_after)}
+        )
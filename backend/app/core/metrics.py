@@ -14,7 +14,11 @@ def track_db_operation(operation_type, table):
 class DummyMetric:
     def labels(self, **kwargs):
         return self
-    def inc(self):
+    def inc(self, amount=1):
+        pass
+    def dec(self, amount=1):
+        pass
+    def set(self, value):
         pass
     def observe(self, value):
         pass
@@ -26,6 +30,16 @@ REQUEST_LATENCY = DummyMetric()
 DB_OPERATION_COUNT = DummyMetric()
 DB_OPERATION_LATENCY = DummyMetric()
 ACTIVE_USERS = DummyMetric()
+EMBED_BATCH_SIZE = DummyMetric()
+LLM_QUEUE_DEPTH = DummyMetric()
+LLM_QUEUE_WAIT = DummyMetric()
+HEDGE_LATENCY = DummyMetric()
+HEDGES_SENT = DummyMetric()
+HEDGES_WON = DummyMetric()
+ADMISSION_IN_FLIGHT = DummyMetric()
+ADMISSION_QUEUE_WAIT = DummyMetric()
+ADMISSION_REJECTED = DummyMetric()
+PARSE_QUEUE_DEPTH = DummyMetric()
 
 
 # from prometheus_client import Counter, Histogram, Gauge
@@ -71,6 +85,70 @@ ACTIVE_USERS = DummyMetric()
 #     ['cache_name']
 # )
 
+# # Embedding metrics
+# EMBED_BATCH_SIZE = Histogram(
+#     'embed_batch_size',
+#     'Number of texts per outbound embedding call',
+#     buckets=(1, 2, 4, 8, 16, 32, 64, 96)
+# )
+
+# # LLM scheduler metrics
+# LLM_QUEUE_DEPTH = Gauge(
+#     'llm_queue_depth',
+#     'Outbound LLM calls waiting for a slot',
+#     ['priority']
+# )
+
+# LLM_QUEUE_WAIT = Histogram(
+#     'llm_queue_wait_seconds',
+#     'Time outbound LLM calls spend waiting for a slot',
+#     ['priority']
+# )
+
+# # Hedged request metrics
+# HEDGE_LATENCY = Histogram(
+#     'hedged_call_duration_seconds',
+#     'Latency of hedged provider calls, by which request answered',
+#     ['call', 'outcome']
+# )
+
+# HEDGES_SENT = Counter(
+#     'hedges_sent_total',
+#     'Duplicate requests sent after the hedge delay',
+#     ['call']
+# )
+
+# HEDGES_WON = Counter(
+#     'hedges_won_total',
+#     'Duplicate requests that answered before the original',
+#     ['call']
+# )
+
+# # Admission control on expensive endpoints
+# ADMISSION_IN_FLIGHT = Gauge(
+#     'admission_in_flight',
+#     'Expensive requests currently being served',
+#     ['path']
+# )
+
+# ADMISSION_QUEUE_WAIT = Histogram(
+#     'admission_queue_wait_seconds',
+#     'Time expensive requests waited for a slot',
+#     ['path']
+# )
+
+# ADMISSION_REJECTED = Counter(
+#     'admission_rejected_total',
+#     'Expensive requests shed with 503',
+#     ['path', 'reason']
+# )
+
+# # Upload parsing in worker processes
+# PARSE_QUEUE_DEPTH = Gauge(
+#     'parse_queue_depth',
+#     'Upload parse jobs queued or running in the parse pool'
+# )
+
 # # System metrics
 # ACTIVE_USERS = Gauge(
 #     'active_users',
@@ -2,4 +2,11 @@
 from app.db.base import Base  
 from app.models.user import User  
 from app.models.team import Team  
-from app.models.problem import Problem  
\ No newline at end of file
+from app.models.problem import Problem  
+from app.models.problem_signature import ProblemMinHash, ProblemLSHBucket
+from app.models.problem_embedding import ProblemEmbedding
+from app.models.problem_cluster import ProblemCluster
+from app.models.skill_stats import SkillCount, SkillPair, CatalogStat
+from app.models.event import Event
+from app.models.upload import Upload
+from app.models.sheet_template import SheetTemplate
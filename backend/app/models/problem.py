@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, JSON, DateTime
+from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey
 from ..db.base_class import Base
 from datetime import datetime
 
@@ -10,4 +10,9 @@ class Problem(Base):
     description = Column(String, nullable=False)
     tech_stack = Column(JSON, nullable=False) 
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    source_file = Column(String, nullable=False)  
\ No newline at end of file
+    source_file = Column(String, nullable=False, index=True)
+    cluster_id = Column(Integer, ForeignKey("problem_clusters.id", ondelete="SET NULL"), nullable=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=True, index=True)
+    # Normalized description + event. Older rows are NULL until backfilled, and
+    # so are exact duplicates already in the catalog then
+    content_hash = Column(String(64), nullable=True, unique=True, index=True)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, LargeBinary, DateTime, JSON
+from ..db.base_class import Base
+from datetime import datetime
+
+class ProblemCluster(Base):
+    __tablename__ = "problem_clusters"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    centroid = Column(LargeBinary, nullable=False)  # float32 values
+    size = Column(Integer, nullable=False, default=0)
+    representatives = Column(JSON, nullable=False, default=list)  # [[problem_id, similarity], ...]
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
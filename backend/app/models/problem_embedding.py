@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey
+from ..db.base_class import Base
+
+class ProblemEmbedding(Base):
+    __tablename__ = "problem_embeddings"
+    
+    problem_id = Column(Integer, ForeignKey("problems.id", ondelete="CASCADE"), primary_key=True)
+    model = Column(String, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32 values
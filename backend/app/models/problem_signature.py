@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, BigInteger, LargeBinary, ForeignKey
+from ..db.base_class import Base
+
+class ProblemMinHash(Base):
+    __tablename__ = "problem_minhashes"
+    
+    problem_id = Column(Integer, ForeignKey("problems.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # uint32 MinHash values
+
+class ProblemLSHBucket(Base):
+    __tablename__ = "problem_lsh_buckets"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    bucket_key = Column(BigInteger, nullable=False, index=True)  # hash of (band, band values)
+    problem_id = Column(Integer, ForeignKey("problems.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey
+from ..db.base_class import Base
+from datetime import datetime
+
+class SheetTemplate(Base):
+    __tablename__ = "sheet_templates"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    fingerprint = Column(String(64), nullable=False, unique=True, index=True)  # normalized header
+    name = Column(String, nullable=True)
+    columns = Column(JSON, nullable=False)  # normalized header, in sheet order
+    problem_column = Column(String, nullable=False)
+    tech_stack_column = Column(String, nullable=True)
+    title_column = Column(String, nullable=True)
+    source = Column(String, nullable=False, default="learned")  # learned | manual
+    uses = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=True)
+    # Creator of a manual template; learned templates have none
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String
+from ..db.base_class import Base
+
+class SkillCount(Base):
+    __tablename__ = "skill_counts"
+    
+    skill = Column(String, primary_key=True)
+    problem_count = Column(Integer, nullable=False, default=0, index=True)
+
+class SkillPair(Base):
+    __tablename__ = "skill_pairs"
+    
+    skill_a = Column(String, primary_key=True)  # skill_a < skill_b
+    skill_b = Column(String, primary_key=True)
+    problem_count = Column(Integer, nullable=False, default=0, index=True)
+
+class CatalogStat(Base):
+    __tablename__ = "catalog_stats"
+    
+    key = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
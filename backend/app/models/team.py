@@ -14,5 +14,6 @@ class Team(Base):
     deadline = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     owner_id = Column(Integer, ForeignKey("users.id"))
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="SET NULL"), nullable=True, index=True)
     
     owner = relationship("User", back_populates="teams")
\ No newline at end of file
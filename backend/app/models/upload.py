@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey
+from ..db.base_class import Base
+from datetime import datetime
+
+class Upload(Base):
+    __tablename__ = "uploads"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False, unique=True, index=True)  # file bytes + event
+    filename = Column(String, nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=True, index=True)
+    problem_ids = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List
+
+class SkillDemandEntry(BaseModel):
+    skill: str
+    problem_count: int
+    share: float
+
+class SkillPairEntry(BaseModel):
+    skill_a: str
+    skill_b: str
+    problem_count: int
+
+class SkillDemand(BaseModel):
+    total_problems: int
+    skills: List[SkillDemandEntry]
+    co_occurrence: List[SkillPairEntry]
+
+class SkillCountEntry(BaseModel):
+    skill: str
+    problem_count: int
+
+class TeamCoverage(BaseModel):
+    total_problems: int
+    coverage: float
+    skills: List[SkillCountEntry]
+    top_missing_skills: List[SkillCountEntry]
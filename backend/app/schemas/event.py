@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class EventBase(BaseModel):
+    name: str
+    slug: str
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
+
+class EventCreate(EventBase):
+    pass
+
+class EventUpdate(EventBase):
+    name: Optional[str] = None
+    slug: Optional[str] = None
+
+class EventInDBBase(EventBase):
+    id: int
+    owner_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class Event(EventInDBBase):
+    pass
+
+class EventPartition(BaseModel):
+    event_id: int
+    problems: int
+    loaded: bool
+    memory_bytes: int
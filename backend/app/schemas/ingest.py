@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class IngestStage(BaseModel):
+    name: str
+    status: str
+    rows: int
+    rejected: int
+    bytes: int
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    seconds: Optional[float] = None
+    blocked_seconds: float  # waiting for the next stage to catch up
+
+class IngestStatus(BaseModel):
+    id: str
+    filename: str
+    status: str
+    error: Optional[str] = None
+    created_at: datetime
+    stages: List[IngestStage]
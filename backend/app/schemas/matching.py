@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Dict, Optional
+from .problem import Problem
 
 class TeamProfile(BaseModel):
     size: int
@@ -21,6 +22,26 @@ class MatchResult(BaseModel):
     skill_gap_analysis: str
     problem_details: ProblemDetails
 
+class DuplicateRow(BaseModel):
+    row: int
+    title: str
+    duplicate_of: Optional[int] = None
+    duplicate_of_row: Optional[int] = None
+    similarity: float
+    action: str
+
 class MatchResponse(BaseModel):
     status: str
-    matches: List[MatchResult]
\ No newline at end of file
+    matches: List[MatchResult]
+    problems: Optional[List[Problem]] = None
+    duplicates: List[DuplicateRow] = []
+    ingest_id: Optional[str] = None
+
+class TeamMatchResult(BaseModel):
+    team_index: int
+    team_id: Optional[int] = None
+    matches: List[MatchResult]
+
+class BatchMatchResponse(BaseModel):
+    status: str
+    results: List[TeamMatchResult]
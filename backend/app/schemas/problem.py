@@ -19,6 +19,7 @@ class ProblemInDBBase(ProblemBase):
     id: int
     created_at: datetime
     source_file: str
+    event_id: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -29,4 +30,10 @@ class Problem(ProblemInDBBase):
 class ProblemMatch(BaseModel):
     problem: Problem
     score: float
-    tech_match: float
\ No newline at end of file
+    tech_match: float
+
+class ProblemCluster(BaseModel):
+    id: int
+    size: int
+    representative_titles: List[str]
+    updated_at: datetime
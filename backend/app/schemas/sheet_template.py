@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class SheetTemplateBase(BaseModel):
+    name: Optional[str] = None
+    problem_column: str
+    tech_stack_column: Optional[str] = None
+    title_column: Optional[str] = None
+
+class SheetTemplateCreate(SheetTemplateBase):
+    columns: List[str]  # the header as it appears in the file
+
+class SheetTemplateUpdate(SheetTemplateBase):
+    problem_column: Optional[str] = None
+
+class SheetTemplateInDBBase(SheetTemplateBase):
+    id: int
+    fingerprint: str
+    columns: List[str]
+    source: str
+    uses: int
+    created_at: datetime
+    last_used_at: Optional[datetime] = None
+    owner_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+class SheetTemplate(SheetTemplateInDBBase):
+    pass
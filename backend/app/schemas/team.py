@@ -8,6 +8,7 @@ class TeamBase(BaseModel):
     team_size: int
     experience_level: str
     deadline: Optional[datetime] = None
+    event_id: Optional[int] = None
 
 class TeamCreate(TeamBase):
     pass
@@ -27,4 +28,8 @@ class TeamInDBBase(TeamBase):
         from_attributes = True
 
 class Team(TeamInDBBase):
-    pass
\ No newline at end of file
+    pass
+
+class SimilarTeam(BaseModel):
+    team: Team
+    similarity: float
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int  # bytes
+    event_id: Optional[int] = None
+    on_duplicate: str = "report"
+
+class UploadSession(BaseModel):
+    id: str
+    filename: str
+    size: int
+    part_size: int
+    part_count: int
+    event_id: Optional[int] = None
+    on_duplicate: str
+    received_parts: List[int]
+    missing_parts: List[int]
+
+class UploadPart(BaseModel):
+    part_number: int
+    size: int
+    sha256: str
@@ -0,0 +1,154 @@
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models.problem import Problem
+from .row_writers import ROW_FORMATS, ChunkSink, encode_rows
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Optional; only needed for Parquet and Arrow exports
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+ARROW_AVAILABLE = pa is not None
+
+# format -> (media type, file extension)
+COLUMNAR_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", ".arrow")
+}
+EXPORT_FORMATS = {**COLUMNAR_FORMATS, **ROW_FORMATS}
+
+EXPORT_COLUMNS = (
+    Problem.id,
+    Problem.title,
+    Problem.description,
+    Problem.tech_stack,
+    Problem.source_file,
+    Problem.event_id,
+    Problem.cluster_id,
+    Problem.created_at
+)
+
+
+def iter_catalog_rows(
+    db: Session,
+    event_id: Optional[int] = None,
+    batch_size: int = 50000
+) -> Iterator[List[Tuple]]:
+    """
+    The catalog in id order, batch_size rows at a time, as plain tuples of
+    EXPORT_COLUMNS. Keyset pagination keeps every page an index range scan.
+    """
+    last_id = 0
+    while True:
+        query = db.query(*EXPORT_COLUMNS).filter(Problem.id > last_id)
+        if event_id is not None:
+            query = query.filter(Problem.event_id == event_id)
+        rows = query.order_by(Problem.id).limit(batch_size).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def iter_catalog_cursor(
+    db: Session,
+    event_id: Optional[int] = None,
+    batch_size: int = 2000
+) -> Iterator[List[Tuple]]:
+    """
+    The catalog in id order from one server-side cursor, batch_size rows
+    at a time, as plain tuples of EXPORT_COLUMNS. Rows are fetched as they
+    are consumed, so the first batch is ready without scanning the rest.
+    """
+    query = db.query(*EXPORT_COLUMNS).order_by(Problem.id)
+    if event_id is not None:
+        query = query.filter(Problem.event_id == event_id)
+    rows = iter(query.yield_per(batch_size))
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _export_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        ("tech_stack", pa.list_(pa.string())),
+        ("source_file", pa.string()),
+        ("event_id", pa.int64()),
+        ("cluster_id", pa.int64()),
+        ("created_at", pa.timestamp("us"))
+    ])
+
+
+def _record_batch(rows: List[Tuple], schema):
+    columns = list(zip(*rows))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema
+    )
+
+
+def stream_catalog(
+    db: Session,
+    fmt: str,
+    event_id: Optional[int] = None,
+    batch_size: int = 50000,
+    row_batch_size: int = 2000
+) -> Iterator[bytes]:
+    """
+    Serialize the catalog as Parquet, an Arrow IPC file, CSV, NDJSON or
+    .xlsx, yielding bytes as each batch is written so the whole file is
+    never held in memory. Columns match what the uploader reads back, so
+    an export can be imported into another deployment as is.
+    Row formats read row_batch_size rows at a time from a server-side
+    cursor; columnar ones write record batches of batch_size rows.
+    """
+    if fmt in ROW_FORMATS:
+        yield from _stream_rows(db, fmt, event_id, row_batch_size)
+        return
+    if pa is None:
+        raise RuntimeError("Parquet and Arrow exports need the pyarrow package (pip install pyarrow)")
+    schema = _export_schema()
+    sink = ChunkSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(pa.PythonFile(sink, mode="w"), schema)
+
+    rows_written = 0
+    try:
+        for rows in iter_catalog_rows(db, event_id, batch_size):
+            writer.write_table(pa.Table.from_batches([_record_batch(rows, schema)]))
+            rows_written += len(rows)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+    logger.info(f"Exported {rows_written} problems as {fmt}")
+
+
+def _stream_rows(db: Session, fmt: str, event_id: Optional[int], batch_size: int) -> Iterator[bytes]:
+    rows_written = 0
+
+    def counted(batches: Iterator[List[Tuple]]) -> Iterator[List[Tuple]]:
+        nonlocal rows_written
+        for rows in batches:
+            rows_written += len(rows)
+            yield rows
+
+    yield from encode_rows(
+        fmt,
+        [column.key for column in EXPORT_COLUMNS],
+        counted(iter_catalog_cursor(db, event_id, batch_size)),
+        sheet_name="Problems"
+    )
+    logger.info(f"Exported {rows_written} problems as {fmt}")
@@ -0,0 +1,184 @@
+import asyncio
+from typing import Dict, List, Tuple
+import numpy as np
+from ..db.session import SessionLocal
+from ..core.config import settings
+from ..models.problem import Problem
+from .cohere_service import embed_texts
+from .embedding_store import get_embeddings, save_embeddings
+from .llm_scheduler import Priority
+from .problem_clusters import problem_clusters
+from .embedding_snapshots import embedding_snapshots
+from .ingest_progress import IngestProgress, StageProgress
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _recluster() -> None:
+    db = SessionLocal()
+    try:
+        problem_clusters.recluster(db)
+    finally:
+        db.close()
+
+
+def _write_snapshot() -> None:
+    db = SessionLocal()
+    try:
+        embedding_snapshots.write(db)
+    finally:
+        db.close()
+
+
+def _assign_clusters(problem_ids: List[int], vectors) -> None:
+    db = SessionLocal()
+    try:
+        problem_clusters.assign(db, problem_ids, vectors)
+    finally:
+        db.close()
+
+
+def _load_stored(problem_ids: List[int]) -> Tuple[List[Tuple[int, str]], Dict[int, np.ndarray]]:
+    """
+    (id, description) of the problems still in the catalog, and the
+    embeddings already stored for them
+    """
+    db = SessionLocal()
+    try:
+        problems = (
+            db.query(Problem.id, Problem.description)
+            .filter(Problem.id.in_(problem_ids))
+            .order_by(Problem.id)
+            .all()
+        )
+        return [tuple(p) for p in problems], get_embeddings(db, [p.id for p in problems])
+    finally:
+        db.close()
+
+
+def _save_embeddings(problem_ids: List[int], vectors) -> None:
+    db = SessionLocal()
+    try:
+        save_embeddings(db, problem_ids, vectors)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _embed_batch(problem_ids: List[int]) -> Tuple[List[int], np.ndarray]:
+    """
+    Embed a stored batch, reusing stored vectors. Database work runs in
+    the default executor with its own session, off the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    problems, stored = await loop.run_in_executor(None, _load_stored, problem_ids)
+    missing = [(problem_id, description) for problem_id, description in problems if problem_id not in stored]
+    if missing:
+        vectors = await embed_texts([description for _, description in missing], Priority.BACKGROUND)
+        await loop.run_in_executor(None, _save_embeddings, [problem_id for problem_id, _ in missing], vectors)
+        for (problem_id, _), vector in zip(missing, vectors):
+            stored[problem_id] = np.asarray(vector, dtype=np.float32)
+        logger.info(f"Embedded {len(missing)} problems, reused {len(problems) - len(missing)}")
+    ids = [problem_id for problem_id, _ in problems]
+    if not ids:
+        return ids, np.zeros((0, 0), dtype=np.float32)
+    return ids, np.vstack([stored[problem_id] for problem_id in ids])
+
+
+async def _refresh_catalog() -> None:
+    """
+    Re-cluster the catalog and refresh the embedding snapshot when enough
+    has changed since they were last built
+    """
+    db = SessionLocal()
+    try:
+        needs_recluster = problem_clusters.needs_recluster(db)
+        needs_snapshot = embedding_snapshots.needs_refresh(db, settings.EMBEDDING_SNAPSHOT_REFRESH_ROWS)
+    finally:
+        db.close()
+
+    loop = asyncio.get_running_loop()
+    if needs_recluster:
+        try:
+            await loop.run_in_executor(None, _recluster)
+        except Exception as e:
+            logger.error(f"Error re-clustering problems: {str(e)}")
+    if needs_snapshot:
+        try:
+            await loop.run_in_executor(None, _write_snapshot)
+        except Exception as e:
+            logger.error(f"Error writing embedding snapshot: {str(e)}")
+
+
+async def _embed_stage(stored: asyncio.Queue, embedded: asyncio.Queue, stage: StageProgress) -> None:
+    stage.start()
+    failed = False
+    while True:
+        problem_ids = await stored.get()
+        if problem_ids is None:
+            break
+        if failed:
+            # Keep taking batches so the store stage is never held up
+            continue
+        try:
+            problem_ids, vectors = await _embed_batch(problem_ids)
+        except Exception as e:
+            logger.error(f"Error embedding uploaded problems: {str(e)}")
+            failed = True
+            continue
+        if not problem_ids:
+            # Deleted before they were embedded
+            continue
+        stage.rows += len(problem_ids)
+        await stage.put(embedded, (problem_ids, vectors))
+    await embedded.put(None)
+    stage.finish("failed" if failed else "done")
+
+
+async def _index_stage(embedded: asyncio.Queue, stage: StageProgress) -> None:
+    stage.start()
+    failed = False
+    while True:
+        batch = await embedded.get()
+        if batch is None:
+            break
+        if failed:
+            continue
+        problem_ids, vectors = batch
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, _assign_clusters, problem_ids, vectors)
+        except Exception as e:
+            logger.error(f"Error clustering uploaded problems: {str(e)}")
+            failed = True
+            continue
+        stage.rows += len(problem_ids)
+    if not failed:
+        try:
+            await _refresh_catalog()
+        except Exception as e:
+            logger.error(f"Error checking catalog indexes: {str(e)}")
+            failed = True
+    stage.finish("failed" if failed else "done")
+
+
+async def index_stream(stored: asyncio.Queue, progress: IngestProgress) -> None:
+    """
+    The embed and index stages of an ingest. Each batch of stored problem
+    ids (None ends the stream) is embedded as soon as it is committed,
+    while later rows are still being parsed and stored, then assigned to
+    topic clusters. Re-clustering and the snapshot are checked once, at
+    the end.
+    """
+    embedded: asyncio.Queue = asyncio.Queue(settings.INGEST_QUEUE_CHUNKS)
+    await asyncio.gather(
+        _embed_stage(stored, embedded, progress.stage("embed")),
+        _index_stage(embedded, progress.stage("index"))
+    )
+    if progress.status == "failed":
+        return
+    failed = [name for name in ("embed", "index") if progress.stage(name).status == "failed"]
+    if failed:
+        progress.fail(f"Indexing failed in the {' and '.join(failed)} stage")
+    else:
+        progress.status = "done"
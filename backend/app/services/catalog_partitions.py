@@ -0,0 +1,234 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.problem import Problem
+from .embedding_store import ensure_embeddings
+from .llm_scheduler import Priority
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogPartition:
+    """
+    One event's problems held in memory: a normalized embedding matrix for
+    semantic ranking and a TF-IDF matrix for keyword search. Row i of both
+    belongs to problem_ids[i].
+    """
+
+    def __init__(
+        self,
+        event_id: int,
+        problem_ids: List[int],
+        embeddings: np.ndarray,
+        vectorizer: Optional[TfidfVectorizer],
+        lexical_matrix,
+        version: Tuple[int, int] = (0, 0)
+    ):
+        self.event_id = event_id
+        # (problem count, max problem id) when loaded, see PartitionRegistry.version
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.problem_ids = problem_ids
+        self.embeddings = embeddings
+        self.vectorizer = vectorizer
+        self.lexical_matrix = lexical_matrix
+        self._rows = {problem_id: row for row, problem_id in enumerate(problem_ids)}
+
+    @property
+    def memory_bytes(self) -> int:
+        size = self.embeddings.nbytes + len(self.problem_ids) * 8
+        if self.lexical_matrix is not None:
+            matrix = self.lexical_matrix
+            size += matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        if self.vectorizer is not None:
+            # Rough size of the vocabulary dict and idf weights
+            size += len(self.vectorizer.vocabulary_) * 100 + self.vectorizer.idf_.nbytes
+        return size
+
+    def embeddings_for(self, problem_ids: Sequence[int]) -> np.ndarray:
+        return self.embeddings[[self._rows[problem_id] for problem_id in problem_ids]]
+
+    def _top(self, scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.problem_ids[i], float(scores[i])) for i in top]
+
+    def semantic_top(self, query_embedding: Sequence[float], k: int = 10) -> List[Tuple[int, float]]:
+        """
+        The k problems whose embeddings are closest (cosine) to the query
+        """
+        if not self.problem_ids:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        return self._top(self.embeddings @ (query / norm if norm else query), k)
+
+    def lexical_search(self, text: str, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        The k problems matching the query terms best, by TF-IDF cosine
+        """
+        if self.vectorizer is None:
+            return []
+        query = self.vectorizer.transform([text])
+        scores = (self.lexical_matrix @ query.T).toarray().ravel()
+        return [(pid, score) for pid, score in self._top(scores, k) if score > 0]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (matrix / norms).astype(np.float32)
+
+
+class PartitionRegistry:
+    """
+    Loads event partitions on demand and keeps the most recently used ones
+    in memory, evicting the least recently used once the total exceeds the
+    memory budget. The partition being returned is never evicted.
+
+    invalidate() only reaches this process, so every get() also compares
+    the event's problem count and highest id with the loaded partition's,
+    reloading when problems were added or deleted elsewhere. Edits that
+    change neither (merged tech stacks) are picked up within ttl_seconds.
+    """
+
+    def __init__(self, memory_budget_mb: float = 512.0, ttl_seconds: float = 300.0):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.ttl = ttl_seconds
+        self._partitions: "OrderedDict[int, CatalogPartition]" = OrderedDict()
+        # One lock per event being loaded, dropped once nobody holds or waits on it
+        self._loading: Dict[int, asyncio.Lock] = {}
+        self._waiters: Dict[int, int] = {}
+
+    async def get(
+        self,
+        db: Session,
+        event_id: int,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> CatalogPartition:
+        version = self.version(db, event_id)
+        partition = self._partitions.get(event_id)
+        if self._is_current(partition, version):
+            self._partitions.move_to_end(event_id)
+            return partition
+
+        lock = self._loading.setdefault(event_id, asyncio.Lock())
+        self._waiters[event_id] = self._waiters.get(event_id, 0) + 1
+        try:
+            async with lock:
+                partition = self._partitions.get(event_id)
+                if not self._is_current(partition, version):
+                    partition = await self._load(db, event_id, priority, version)
+                    self._partitions[event_id] = partition
+                    self._evict_to_budget(keep=event_id)
+        finally:
+            self._waiters[event_id] -= 1
+            if not self._waiters[event_id]:
+                del self._waiters[event_id]
+                del self._loading[event_id]
+        return partition
+
+    def version(self, db: Session, event_id: int) -> Tuple[int, int]:
+        count, max_id = (
+            db.query(func.count(Problem.id), func.max(Problem.id))
+            .filter(Problem.event_id == event_id)
+            .one()
+        )
+        return count, max_id or 0
+
+    def _is_current(self, partition: Optional[CatalogPartition], version: Tuple[int, int]) -> bool:
+        return (
+            partition is not None
+            and partition.version == version
+            and time.monotonic() - partition.loaded_at < self.ttl
+        )
+
+    async def _load(
+        self,
+        db: Session,
+        event_id: int,
+        priority: Priority,
+        version: Tuple[int, int] = (0, 0)
+    ) -> CatalogPartition:
+        problems = (
+            db.query(Problem.id, Problem.title, Problem.description, Problem.tech_stack)
+            .filter(Problem.event_id == event_id)
+            .order_by(Problem.id)
+            .all()
+        )
+        problem_ids = [p.id for p in problems]
+        if not problems:
+            return CatalogPartition(event_id, [], np.zeros((0, 0), dtype=np.float32), None, None, version)
+
+        # Stored vectors are reused; only problems not yet indexed are embedded
+        embeddings = _normalize(await ensure_embeddings(db, problems, priority))
+
+        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_features=50000)
+        documents = [
+            f"{p.title} {p.description} {' '.join(p.tech_stack or [])}"
+            for p in problems
+        ]
+        try:
+            lexical_matrix = vectorizer.fit_transform(documents).tocsr()
+        except ValueError:
+            # Nothing but stop words
+            vectorizer, lexical_matrix = None, None
+
+        partition = CatalogPartition(event_id, problem_ids, embeddings, vectorizer, lexical_matrix, version)
+        logger.info(
+            f"Loaded partition for event {event_id}: {len(problem_ids)} problems, "
+            f"{partition.memory_bytes / 1024 / 1024:.1f} MB"
+        )
+        return partition
+
+    def _evict_to_budget(self, keep: int) -> None:
+        while self.memory_bytes > self.memory_budget and len(self._partitions) > 1:
+            event_id = next(iter(self._partitions))
+            if event_id == keep:
+                self._partitions.move_to_end(event_id)
+                continue
+            self.evict(event_id)
+
+    def evict(self, event_id: int) -> bool:
+        partition = self._partitions.pop(event_id, None)
+        if partition is not None:
+            logger.info(f"Evicted partition for event {event_id}")
+        return partition is not None
+
+    # Stale once the event's problems change; reloaded on next use. Other
+    # processes notice through the version check in get()
+    invalidate = evict
+
+    def is_loaded(self, event_id: int) -> bool:
+        return event_id in self._partitions
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(partition.memory_bytes for partition in self._partitions.values())
+
+    def stats(self) -> List[Dict]:
+        return [
+            {
+                "event_id": event_id,
+                "problems": len(partition.problem_ids),
+                "loaded": True,
+                "memory_bytes": partition.memory_bytes
+            }
+            for event_id, partition in self._partitions.items()
+        ]
+
+
+partition_registry = PartitionRegistry(
+    memory_budget_mb=settings.PARTITION_MEMORY_BUDGET_MB,
+    ttl_seconds=settings.PARTITION_TTL_SECONDS
+)
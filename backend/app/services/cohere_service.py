@@ -1,34 +1,163 @@
+import asyncio
 import cohere
-from typing import Dict, List
+from typing import Dict, List, Callable
+from functools import lru_cache
 from ..core.config import settings
+from .skill_taxonomy import skill_taxonomy
+from .template_explainer import template_recommendation, template_skill_gap
+from .embedding_batcher import EmbeddingBatcher
+from .llm_scheduler import LLMScheduler, Priority
+from .hedging import HedgedCaller
+from .local_embeddings import embed_texts_locally
 import logging
 
 logger = logging.getLogger(__name__)
 
-def get_team_embedding(team_profile: Dict) -> List[float]:
+# Every outbound Cohere call goes through this scheduler
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    weights=settings.LLM_PRIORITY_WEIGHTS
+)
+
+
+@lru_cache(maxsize=1)
+def get_client() -> cohere.Client:
     """
-    Convert team profile into an embedding vector using Cohere
+    Shared Cohere client, so connections are reused across calls
     """
-    co = cohere.Client(settings.COHERE_API_KEY)
-    
-    # Create a natural language description of the team
-    team_description = f"""
+    return cohere.Client(settings.COHERE_API_KEY)
+
+
+def _embed_texts(texts: List[str]) -> List[List[float]]:
+    if settings.EMBED_PROVIDER == "local":
+        return embed_texts_locally(texts)
+    response = get_client().embed(texts=texts, model=settings.COHERE_EMBED_MODEL)
+    return response.embeddings
+
+
+embed_hedger = HedgedCaller(
+    "embed",
+    quantile=settings.EMBED_HEDGE_QUANTILE,
+    min_delay_ms=settings.EMBED_HEDGE_MIN_DELAY_MS,
+    max_delay_ms=settings.EMBED_HEDGE_MAX_DELAY_MS,
+    budget_ratio=settings.EMBED_HEDGE_BUDGET
+)
+
+
+async def _scheduled_embed(texts: List[str], priority: Priority) -> List[List[float]]:
+    if settings.EMBED_HEDGING_ENABLED:
+        # Hedged inside one scheduler slot, so latency samples and hedge
+        # delays cover the provider call only, not time spent queueing,
+        # and a hedge never joins the queue when it is congested
+        return await llm_scheduler.run_async(
+            lambda: embed_hedger.call(lambda: llm_scheduler.submit(_embed_texts, texts)),
+            priority=priority
+        )
+    return await llm_scheduler.run(_embed_texts, texts, priority=priority)
+
+
+embedding_batcher = EmbeddingBatcher(
+    _scheduled_embed,
+    max_wait_ms=settings.EMBED_BATCH_WINDOW_MS,
+    max_batch_size=settings.EMBED_BATCH_MAX_SIZE
+)
+
+
+async def embed_texts(texts: List[str], priority: Priority = Priority.INTERACTIVE) -> List[List[float]]:
+    """
+    Embed texts through the shared micro-batcher
+    """
+    return await embedding_batcher.embed(texts, priority=priority)
+
+
+async def _with_template_fallback(
+    llm_call: Callable[[], str],
+    template_call: Callable[[], str],
+    priority: Priority,
+    error_text: str
+) -> str:
+    """
+    Pick between the LLM and the deterministic templates based on
+    SKILL_ANALYSIS_MODE. In "auto" mode any provider failure or timeout
+    falls back to the template; in "llm" mode it gives error_text.
+    """
+    mode = settings.SKILL_ANALYSIS_MODE
+    if mode == "llm":
+        try:
+            return await llm_scheduler.run(llm_call, priority=priority)
+        except Exception:
+            return error_text
+    if mode == "auto":
+        try:
+            return await asyncio.wait_for(
+                llm_scheduler.run(llm_call, priority=priority),
+                timeout=settings.LLM_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning("LLM call timed out, falling back to template text")
+            return template_call()
+        except Exception:
+            logger.warning("LLM call failed, falling back to template text")
+            return template_call()
+    return template_call()
+
+
+def _team_description(team_profile: Dict) -> str:
+    """
+    Create a natural language description of the team
+    """
+    return f"""
     Team Profile:
     - Size: {team_profile['size']} members
     - Experience Level: {team_profile['experience']}
     - Skills: {', '.join(team_profile['skills'])}
     - Project Deadline: {team_profile['deadline']} days
     """
-    
-    response = co.embed(texts=[team_description])
-    return response.embeddings[0]
 
 
-def get_problem_recommendations(team_profile: Dict, problem: Dict, similarity_score: float) -> str:
+async def get_team_embedding(team_profile: Dict, priority: Priority = Priority.INTERACTIVE) -> List[float]:
+    """
+    Convert team profile into an embedding vector using Cohere
+    """
+    return (await get_team_embeddings([team_profile], priority))[0]
+
+
+async def get_team_embeddings(team_profiles: List[Dict], priority: Priority = Priority.INTERACTIVE) -> List[List[float]]:
+    """
+    Embed several team profiles in one request
+    """
+    return await embed_texts([_team_description(profile) for profile in team_profiles], priority)
+
+
+async def get_problem_embeddings(problems: List[Dict], priority: Priority = Priority.INTERACTIVE) -> List[List[float]]:
+    """
+    Embed problem descriptions in one request
+    """
+    return await embed_texts([p['description'] for p in problems], priority)
+
+
+async def get_problem_recommendations(
+    team_profile: Dict,
+    problem: Dict,
+    similarity_score: float,
+    priority: Priority = Priority.INTERACTIVE
+) -> str:
+    """
+    Generate a natural language recommendation
+    """
+    return await _with_template_fallback(
+        lambda: _llm_problem_recommendations(team_profile, problem, similarity_score),
+        lambda: template_recommendation(team_profile, problem, similarity_score),
+        priority,
+        "Could not generate recommendation due to an external error."
+    )
+
+
+def _llm_problem_recommendations(team_profile: Dict, problem: Dict, similarity_score: float) -> str:
     """
     Generate a natural language recommendation using Cohere
     """
-    co = cohere.Client(settings.COHERE_API_KEY)
+    co = get_client()
     
     prompt = f"""
     Team Profile:
@@ -60,18 +189,32 @@ def get_problem_recommendations(team_profile: Dict, problem: Dict, similarity_sc
     except Exception as e:
         logger.error(f"Cohere API error: {e}")
         logger.error(f"Prompt sent: {prompt}")
-        return "Could not generate recommendation due to an external error."
+        raise
 
-def analyze_skill_gap(team_profile: Dict, problem: Dict) -> str:
+async def analyze_skill_gap(
+    team_profile: Dict,
+    problem: Dict,
+    priority: Priority = Priority.INTERACTIVE
+) -> str:
     """
     Analyze the skill gap between team's current skills and problem requirements
     """
-    co = cohere.Client(settings.COHERE_API_KEY)
+    return await _with_template_fallback(
+        lambda: _llm_skill_gap(team_profile, problem),
+        lambda: template_skill_gap(team_profile, problem),
+        priority,
+        "Could not analyze skill gaps due to an external error."
+    )
+
+
+def _llm_skill_gap(team_profile: Dict, problem: Dict) -> str:
+    """
+    Analyze the skill gap using Cohere
+    """
+    co = get_client()
     
-    # Find missing skills
-    team_skills = set(skill.lower() for skill in team_profile['skills'])
-    required_skills = set(skill.lower() for skill in problem['required_skills'])
-    missing_skills = required_skills - team_skills
+    # Find missing skills, comparing canonical skill names
+    missing_skills = skill_taxonomy.missing_skills(team_profile['skills'], problem['required_skills'])
     
     prompt = f"""
     Team Profile:
@@ -102,4 +245,4 @@ def analyze_skill_gap(team_profile: Dict, problem: Dict) -> str:
     except Exception as e:
         logger.error(f"Cohere API error: {e}")
         logger.error(f"Prompt sent: {prompt}")
-        return "Could not analyze skill gaps due to an external error."
\ No newline at end of file
+        raise
\ No newline at end of file
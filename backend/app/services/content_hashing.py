@@ -0,0 +1,41 @@
+import hashlib
+import re
+from typing import BinaryIO, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_description(description: str) -> str:
+    """
+    Case and whitespace differences do not make a different problem
+    """
+    return _WHITESPACE.sub(" ", description).strip().lower()
+
+
+def _scoped_hasher(event_id: Optional[int]):
+    # The same content in two event catalogs is two different entries
+    hasher = hashlib.sha256()
+    hasher.update(f"{'' if event_id is None else event_id}\0".encode())
+    return hasher
+
+
+def problem_content_hash(description: str, event_id: Optional[int] = None) -> str:
+    hasher = _scoped_hasher(event_id)
+    hasher.update(normalize_description(description).encode())
+    return hasher.hexdigest()
+
+
+def file_content_hash(
+    fileobj: BinaryIO,
+    event_id: Optional[int] = None,
+    chunk_size: int = 1024 * 1024
+) -> str:
+    """
+    Hash a whole file object in chunks, leaving it rewound
+    """
+    hasher = _scoped_hasher(event_id)
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        hasher.update(chunk)
+    fileobj.seek(0)
+    return hasher.hexdigest()
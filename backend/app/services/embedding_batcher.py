@@ -0,0 +1,130 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+import logging
+from ..core.metrics import EMBED_BATCH_SIZE
+from .llm_scheduler import Priority
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[List[str], Priority], Awaitable[List[List[float]]]]
+
+# Lower rank is more urgent; a shared batch runs at its most urgent member's priority
+PRIORITY_RANK = {Priority.INTERACTIVE: 0, Priority.BATCH: 1, Priority.BACKGROUND: 2}
+
+
+class EmbeddingBatcher:
+    """
+    Gathers embedding requests from concurrent callers into shared calls.
+
+    Requests are held for at most `max_wait_ms` or until `max_batch_size`
+    texts are pending, then sent as one call; each caller gets back only
+    its own vectors.
+    """
+
+    def __init__(self, embed_fn: EmbedFn, max_wait_ms: float = 10.0, max_batch_size: int = 96):
+        self.embed_fn = embed_fn
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._pending_priority = Priority.BACKGROUND
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks: batches in flight are held here
+        self._sending: Set[asyncio.Task] = set()
+
+        self.stats = {"requests": 0, "texts": 0, "calls": 0}
+
+    async def embed(self, texts: List[str], priority: Priority = Priority.INTERACTIVE) -> List[List[float]]:
+        """
+        Embed `texts`, sharing the outbound call with other concurrent callers
+        """
+        if not texts:
+            return []
+
+        self.stats["requests"] += 1
+        self.stats["texts"] += len(texts)
+
+        # Requests that fill a batch on their own gain nothing from waiting
+        if len(texts) >= self.max_batch_size:
+            chunks = [
+                texts[i:i + self.max_batch_size]
+                for i in range(0, len(texts), self.max_batch_size)
+            ]
+            results = await asyncio.gather(*(self._call(chunk, priority) for chunk in chunks))
+            return [vector for chunk in results for vector in chunk]
+
+        if self._pending_texts + len(texts) > self.max_batch_size:
+            self._flush()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((texts, future))
+        self._pending_texts += len(texts)
+        if PRIORITY_RANK[priority] < PRIORITY_RANK[self._pending_priority]:
+            self._pending_priority = priority
+
+        if self._pending_texts >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch = self._pending
+        priority = self._pending_priority
+        self._pending = []
+        self._pending_texts = 0
+        self._pending_priority = Priority.BACKGROUND
+        task = asyncio.ensure_future(self._send(batch, priority))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """
+        Send whatever is pending and wait for batches in flight, cancelling
+        those still running after `timeout` seconds
+        """
+        self._flush()
+        if not self._sending:
+            return
+        _, running = await asyncio.wait(set(self._sending), timeout=timeout)
+        for task in running:
+            task.cancel()
+        if running:
+            logger.warning(f"Cancelled {len(running)} embedding batches still running at shutdown")
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def _send(self, batch: List[Tuple[List[str], asyncio.Future]], priority: Priority) -> None:
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        try:
+            vectors = await self._call(texts, priority)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Batched embedding call failed for {len(batch)} requests: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for request_texts, future in batch:
+            if not future.done():
+                future.set_result(vectors[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+
+    async def _call(self, texts: List[str], priority: Priority) -> List[List[float]]:
+        self.stats["calls"] += 1
+        EMBED_BATCH_SIZE.observe(len(texts))
+        return await self.embed_fn(texts, priority)
@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.problem_embedding import ProblemEmbedding
+import logging
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+class EmbeddingSnapshot:
+    """
+    A read-only, memory-mapped copy of the stored embeddings. `ids` is
+    sorted, so lookups are a binary search instead of a dict build.
+    """
+
+    def __init__(self, version: str, model: str, ids: np.ndarray, matrix: np.ndarray):
+        self.version = version
+        self.model = model
+        self.ids = ids
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def lookup(self, problem_ids: Sequence[int]) -> Dict[int, np.ndarray]:
+        if not len(self.ids) or not len(problem_ids):
+            return {}
+        wanted = np.asarray(problem_ids, dtype=np.int64)
+        rows = np.searchsorted(self.ids, wanted)
+        rows[rows >= len(self.ids)] = 0
+        hits = self.ids[rows] == wanted
+        return {int(pid): self.matrix[row] for pid, row, hit in zip(wanted, rows, hits) if hit}
+
+
+class EmbeddingSnapshotStore:
+    """
+    Versioned embedding snapshots on disk.
+
+    A snapshot is a pair of .npy files (problem ids and the embedding
+    matrix) named by version, plus a small manifest naming the current
+    version. Writers fill new files and then swap the manifest with an
+    atomic rename; readers mmap the files read-only, so every worker on the
+    host shares the same pages through the OS page cache and opening a
+    snapshot costs no more than reading the manifest.
+    """
+
+    def __init__(self, directory: str, keep: int = 3, check_interval: float = 5.0):
+        self.directory = Path(directory)
+        self.keep = keep
+        self.check_interval = check_interval
+        self._snapshot: Optional[EmbeddingSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_NAME
+
+    def _read_manifest(self) -> Optional[dict]:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Unreadable embedding snapshot manifest: {str(e)}")
+            return None
+
+    def current(self) -> Optional[EmbeddingSnapshot]:
+        """
+        The newest snapshot for the configured embedding model, if any.
+        The manifest is re-read at most every `check_interval` seconds.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._snapshot
+
+        with self._lock:
+            self._checked_at = now
+            manifest = self._read_manifest()
+            if manifest is None or manifest.get("model") != settings.EMBEDDING_MODEL_ID:
+                self._snapshot = None
+                return None
+            if self._snapshot is not None and self._snapshot.version == manifest["version"]:
+                return self._snapshot
+
+            try:
+                rows = manifest["rows"]
+                ids = np.load(self.directory / manifest["ids"], mmap_mode="r")[:rows]
+                matrix = np.load(self.directory / manifest["embeddings"], mmap_mode="r")[:rows]
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Could not open embedding snapshot {manifest.get('version')}: {str(e)}")
+                return self._snapshot
+
+            self._snapshot = EmbeddingSnapshot(manifest["version"], manifest["model"], ids, matrix)
+            logger.info(f"Mapped embedding snapshot {manifest['version']} with {rows} rows")
+            return self._snapshot
+
+    def lookup(self, problem_ids: Sequence[int]) -> Dict[int, np.ndarray]:
+        snapshot = self.current()
+        return snapshot.lookup(problem_ids) if snapshot is not None else {}
+
+    def _stored_count(self, db: Session) -> int:
+        return db.query(ProblemEmbedding).filter(ProblemEmbedding.model == settings.EMBEDDING_MODEL_ID).count()
+
+    def needs_refresh(self, db: Session, min_new_rows: int) -> bool:
+        manifest = self._read_manifest()
+        stored = self._stored_count(db)
+        if manifest is None or manifest.get("model") != settings.EMBEDDING_MODEL_ID:
+            return stored > 0
+        return stored - manifest["rows"] >= min_new_rows
+
+    def write(self, db: Session, batch_size: int = 5000) -> Optional[str]:
+        """
+        Write a snapshot of every stored embedding and make it current.
+        Returns the new version, or None if there is nothing to snapshot.
+        """
+        total = self._stored_count(db)
+        first = (
+            db.query(ProblemEmbedding.vector)
+            .filter(ProblemEmbedding.model == settings.EMBEDDING_MODEL_ID)
+            .first()
+        )
+        if not total or first is None:
+            return None
+        dims = len(first[0]) // np.dtype(np.float32).itemsize
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        version = f"{int(time.time() * 1000)}-{os.getpid()}"
+        ids_name = f"ids-{version}.npy"
+        embeddings_name = f"embeddings-{version}.npy"
+        ids = np.lib.format.open_memmap(self.directory / ids_name, mode="w+", dtype=np.int64, shape=(total,))
+        matrix = np.lib.format.open_memmap(
+            self.directory / embeddings_name, mode="w+", dtype=np.float32, shape=(total, dims)
+        )
+
+        # Keyset pagination in id order keeps `ids` sorted for lookups
+        rows = 0
+        last_id = 0
+        while rows < total:
+            batch = (
+                db.query(ProblemEmbedding.problem_id, ProblemEmbedding.vector)
+                .filter(
+                    ProblemEmbedding.model == settings.EMBEDDING_MODEL_ID,
+                    ProblemEmbedding.problem_id > last_id
+                )
+                .order_by(ProblemEmbedding.problem_id)
+                .limit(min(batch_size, total - rows))
+                .all()
+            )
+            if not batch:
+                break
+            count = len(batch)
+            ids[rows:rows + count] = [problem_id for problem_id, _ in batch]
+            matrix[rows:rows + count] = np.vstack([np.frombuffer(blob, dtype=np.float32) for _, blob in batch])
+            rows += count
+            last_id = batch[-1][0]
+
+        ids.flush()
+        matrix.flush()
+        del ids, matrix
+
+        manifest = {
+            "version": version,
+            "model": settings.EMBEDDING_MODEL_ID,
+            "rows": rows,
+            "dims": dims,
+            "ids": ids_name,
+            "embeddings": embeddings_name,
+            "created_at": time.time()
+        }
+        tmp_path = self.directory / f"{MANIFEST_NAME}.{version}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+        logger.info(f"Wrote embedding snapshot {version} with {rows} rows")
+
+        self._prune(version)
+        self._checked_at = 0.0
+        return version
+
+    def _prune(self, current_version: str) -> None:
+        # Workers still mapping an old snapshot keep their pages after unlink
+        versions = sorted(
+            (path.stat().st_mtime, path.name[len("ids-"):-len(".npy")])
+            for path in self.directory.glob("ids-*.npy")
+        )
+        stale = [version for _, version in versions if version != current_version][:-(self.keep - 1) or None]
+        for version in stale:
+            for name in (f"ids-{version}.npy", f"embeddings-{version}.npy"):
+                try:
+                    (self.directory / name).unlink()
+                except FileNotFoundError:
+                    pass
+
+
+embedding_snapshots = EmbeddingSnapshotStore(
+    settings.EMBEDDING_SNAPSHOT_DIR,
+    keep=settings.EMBEDDING_SNAPSHOT_KEEP
+)
@@ -0,0 +1,102 @@
+from typing import Dict, Iterator, List, Sequence, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.problem_embedding import ProblemEmbedding
+from .cohere_service import embed_texts
+from .embedding_snapshots import embedding_snapshots
+from .llm_scheduler import Priority
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def to_blob(vector: Sequence[float]) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def get_embeddings(db: Session, problem_ids: Sequence[int]) -> Dict[int, np.ndarray]:
+    """
+    Stored embeddings for the given problems, for the current model.
+    The mapped snapshot answers first; only newer problems hit the database.
+    """
+    found: Dict[int, np.ndarray] = embedding_snapshots.lookup(problem_ids)
+    ids = [problem_id for problem_id in problem_ids if problem_id not in found]
+    for i in range(0, len(ids), 1000):
+        rows = (
+            db.query(ProblemEmbedding.problem_id, ProblemEmbedding.vector)
+            .filter(
+                ProblemEmbedding.problem_id.in_(ids[i:i + 1000]),
+                ProblemEmbedding.model == settings.EMBEDDING_MODEL_ID
+            )
+            .all()
+        )
+        for problem_id, blob in rows:
+            found[problem_id] = from_blob(blob)
+    return found
+
+
+def save_embeddings(db: Session, problem_ids: Sequence[int], vectors: Sequence[Sequence[float]]) -> None:
+    """
+    Store embeddings, replacing any existing ones. The caller commits.
+    """
+    ids = list(problem_ids)
+    if not ids:
+        return
+    db.query(ProblemEmbedding).filter(ProblemEmbedding.problem_id.in_(ids)).delete(synchronize_session=False)
+    db.bulk_insert_mappings(ProblemEmbedding, [
+        {"problem_id": problem_id, "model": settings.EMBEDDING_MODEL_ID, "vector": to_blob(vector)}
+        for problem_id, vector in zip(ids, vectors)
+    ])
+
+
+async def ensure_embeddings(
+    db: Session,
+    problems: Sequence,
+    priority: Priority = Priority.INTERACTIVE
+) -> np.ndarray:
+    """
+    Embedding matrix for `problems` (objects with id and description),
+    reusing stored vectors and embedding only the missing ones.
+    """
+    if not problems:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    stored = get_embeddings(db, [p.id for p in problems])
+    missing = [p for p in problems if p.id not in stored]
+
+    if missing:
+        vectors = await embed_texts([p.description for p in missing], priority)
+        save_embeddings(db, [p.id for p in missing], vectors)
+        db.commit()
+        for problem, vector in zip(missing, vectors):
+            stored[problem.id] = np.asarray(vector, dtype=np.float32)
+        logger.info(f"Embedded {len(missing)} problems, reused {len(problems) - len(missing)}")
+
+    return np.vstack([stored[p.id] for p in problems])
+
+
+def iter_embeddings(db: Session, batch_size: int = 1000) -> Iterator[Tuple[List[int], np.ndarray]]:
+    """
+    Stream every stored embedding for the current model in (ids, matrix) batches
+    """
+    last_id = 0
+    while True:
+        rows = (
+            db.query(ProblemEmbedding.problem_id, ProblemEmbedding.vector)
+            .filter(
+                ProblemEmbedding.model == settings.EMBEDDING_MODEL_ID,
+                ProblemEmbedding.problem_id > last_id
+            )
+            .order_by(ProblemEmbedding.problem_id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return
+        yield [row[0] for row in rows], np.vstack([from_blob(row[1]) for row in rows])
+        last_id = rows[-1][0]
@@ -0,0 +1,43 @@
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from ..models.event import Event
+from ..models.problem import Problem
+from ..schemas.event import EventCreate, EventUpdate
+from .base import CRUDBase
+
+class EventService(CRUDBase[Event, EventCreate, EventUpdate]):
+    def get_by_slug(self, db: Session, *, slug: str) -> Optional[Event]:
+        return db.query(Event).filter(Event.slug == slug).first()
+
+    def create_with_owner(
+        self,
+        db: Session,
+        *,
+        obj_in: EventCreate,
+        owner_id: int
+    ) -> Event:
+        obj_in_data = obj_in.dict()
+        db_obj = Event(**obj_in_data, owner_id=owner_id)
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def get_problems(
+        self,
+        db: Session,
+        *,
+        event_id: int,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Problem]:
+        return (
+            db.query(Problem)
+            .filter(Problem.event_id == event_id)
+            .order_by(Problem.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+event_service = EventService(Event)
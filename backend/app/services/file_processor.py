@@ -1,19 +1,107 @@
+import asyncio
+import functools
 from fastapi import UploadFile
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional
-import tempfile
+from typing import List, Dict, Any, Awaitable, Callable, Iterator, NamedTuple, Optional
 import os
+import pickle
+import shutil
+import tempfile
 from pathlib import Path
 import logging
 from datetime import datetime
-from ..core.exceptions import FileProcessingError, MalformedDataError
-from ..schemas.problem import ProblemCreate
+from ..core.exceptions import FileProcessingError, FileTooLargeError, MalformedDataError
 from ..models.problem import Problem
+from .skill_taxonomy import skill_taxonomy
+from .near_duplicates import NearDuplicateIndex
+from .skill_analytics import skill_analytics
+from .problem_service import problem_service
+from .parse_pool import parse_pool
+from .sheet_readers import (
+    ARROW_AVAILABLE,
+    COLUMNAR_EXTENSIONS,
+    SUPPORTED_EXTENSIONS,
+    iter_sheet_frames,
+    sheet_names
+)
+from .upload_service import upload_service
+from .sheet_templates import column_key, header_fingerprint, sheet_template_service
+from .content_hashing import file_content_hash, problem_content_hash
+from .ingest_progress import IngestProgress
+from ..core.config import settings
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+DUPLICATE_ACTIONS = ("report", "skip", "merge")
+
+# Consumes batches of stored problem ids (None ends them): the embed and
+# index stages, e.g. catalog_indexer.index_stream
+IndexStages = Callable[[asyncio.Queue, IngestProgress], Awaitable[None]]
+
+
+class SheetParseError(ValueError):
+    """
+    A sheet without usable problems. Raised in parse pool workers, so it is
+    a plain picklable exception; process_file turns it into MalformedDataError.
+    """
+
+
+class ExtractedProblem(NamedTuple):
+    """
+    A problem read from an uploaded sheet, before it is stored
+    """
+    title: str
+    description: str
+    tech_stack: List[str]
+
+
+class _HeldSheet:
+    """
+    Parsed chunks of a sheet held back until it is clear whether they are
+    used, spilled to a temp file so holding a sheet costs no memory
+    """
+
+    def __init__(self, sheet: Optional[str], layout: Dict):
+        self.sheet = sheet
+        self.layout = layout
+        self.chunks = 0
+        self._file = tempfile.TemporaryFile()
+
+    def append(self, item: Dict) -> None:
+        pickle.dump(item, self._file, pickle.HIGHEST_PROTOCOL)
+        self.chunks += 1
+
+    def read(self) -> Iterator[Dict]:
+        self._file.seek(0)
+        for _ in range(self.chunks):
+            yield pickle.load(self._file)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+async def _run_stages(*stages: Awaitable) -> None:
+    """
+    Run pipeline stages concurrently; the first one to fail cancels the rest
+    """
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+near_duplicate_index = NearDuplicateIndex(
+    num_perm=settings.MINHASH_NUM_PERM,
+    bands=settings.LSH_BANDS,
+    threshold=settings.NEAR_DUPLICATE_THRESHOLD
+)
+
 class FileProcessorService:
     def __init__(self):
         # Common problem statement column names
@@ -27,71 +115,496 @@ class FileProcessorService:
             'implement', 'create', 'develop', 'build', 'design',
             'requirement', 'feature', 'functionality'
         ]
+        
+        # Near-duplicate rows found by the last process_file call
+        self.duplicates: List[Dict[str, Any]] = []
+        # Whether the last process_file call matched an earlier identical upload
+        self.reused_upload = False
+        # Stage progress of the last process_file call
+        self.progress: Optional[IngestProgress] = None
 
-    async def process_file(self, file: UploadFile, db: Session, team_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    async def process_file(
+        self,
+        file: UploadFile,
+        db: Session,
+        team_id: Optional[int] = None,
+        on_duplicate: str = "report",
+        event_id: Optional[int] = None,
+        progress: Optional[IngestProgress] = None,
+        index_with: Optional[IndexStages] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Process uploaded Excel file and extract problem statements
+        Process uploaded Excel file and extract problem statements.
+        Rows that nearly duplicate the catalog (or earlier rows) are listed in
+        self.duplicates and stored, skipped or merged according to on_duplicate.
+        With event_id, problems join that event's catalog and are only compared
+        against it. Rows already in the catalog are not inserted again, and an
+        identical re-upload returns the problems stored the first time
+        (self.reused_upload is then True).
+
+        The upload goes through receive -> parse -> validate -> store, and
+        with index_with also embed -> index, reporting into progress. This
+        returns once every row is stored; embedding may still be running
+        then (progress.indexing).
         """
+        self.duplicates = []
+        self.reused_upload = False
+        self.progress = progress or IngestProgress(file.filename)
+        receive = self.progress.stage("receive")
         try:
-            ext = os.path.splitext(file.filename)[1].lower()
-            if ext not in (('.xlsx', '.xls', '.csv')):
-                raise FileProcessingError("Only Excel (.xlsx, .xls) or CSV (.csv) files are allowed")
+            ext = self._check_request(file.filename, on_duplicate)
+            receive.start()
             
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix='ext') as tmp:
-                content = await file.read()
-                tmp.write(content)
-                tmp_path = tmp.name
+            upload = file.file
+            upload.seek(0, os.SEEK_END)
+            size = upload.tell()
+            upload.seek(0)
+            if size > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
+                raise FileTooLargeError(settings.MAX_UPLOAD_SIZE_MB)
+            receive.bytes = size
 
-            try:
-                if ext == ".csv":
-                    df = pd.read_csv(tmp_path)
-                else:
-                    df = pd.read_excel(tmp_path)
-                
-                
-                # Process and extract problems
-                problems = self._extract_problems(df)
-                
-                stored_problems = self._store_problems(db, problems, file.filename)
-                
-                return stored_problems
+            loop = asyncio.get_running_loop()
+            content_hash = await loop.run_in_executor(None, file_content_hash, upload, event_id)
+            previous = self._reuse_upload(db, content_hash, file.filename)
+            if previous is not None:
+                return previous
 
+            # Parsing is CPU-bound, so it runs in the parse pool instead of on the
+            # event loop; the workers read the upload from a named temp file
+            with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
+                await loop.run_in_executor(None, shutil.copyfileobj, upload, tmp, 1024 * 1024)
+            receive.finish()
+            try:
+                return await self._ingest(
+                    db, tmp.name, ext, file.filename, on_duplicate, event_id, content_hash, index_with
+                )
             finally:
-                # Clean up temporary file
-                os.unlink(tmp_path)
+                os.unlink(tmp.name)
 
+        except FileProcessingError as e:
+            self.progress.fail(str(e.detail))
+            raise
         except Exception as e:
             logger.error(f"Error processing file: {str(e)}")
+            self.progress.fail(str(e))
             raise FileProcessingError(str(e))
-        
+
+    async def process_local_file(
+        self,
+        file_path: str,
+        filename: str,
+        db: Session,
+        on_duplicate: str = "report",
+        event_id: Optional[int] = None,
+        progress: Optional[IngestProgress] = None,
+        index_with: Optional[IndexStages] = None
+    ) -> List[Problem]:
+        """
+        process_file for a file already on local disk, such as a completed
+        chunked upload; it is parsed in place without another copy
+        """
+        self.duplicates = []
+        self.reused_upload = False
+        self.progress = progress or IngestProgress(filename)
+        receive = self.progress.stage("receive")
+        try:
+            ext = self._check_request(filename, on_duplicate)
+            receive.start()
+
+            def hash_file() -> str:
+                with open(file_path, "rb") as f:
+                    return file_content_hash(f, event_id)
+
+            content_hash = await asyncio.get_running_loop().run_in_executor(None, hash_file)
+            receive.bytes = os.path.getsize(file_path)
+            previous = self._reuse_upload(db, content_hash, filename)
+            if previous is not None:
+                return previous
+            receive.finish()
+            return await self._ingest(db, file_path, ext, filename, on_duplicate, event_id, content_hash, index_with)
+
+        except FileProcessingError as e:
+            self.progress.fail(str(e.detail))
+            raise
+        except Exception as e:
+            logger.error(f"Error processing file: {str(e)}")
+            self.progress.fail(str(e))
+            raise FileProcessingError(str(e))
+
+    def _check_request(self, filename: str, on_duplicate: str) -> str:
+        """
+        Validate the upload's options and return its file extension
+        """
+        if on_duplicate not in DUPLICATE_ACTIONS:
+            raise FileProcessingError(f"on_duplicate must be one of {', '.join(DUPLICATE_ACTIONS)}")
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in SUPPORTED_EXTENSIONS:
+            raise FileProcessingError(
+                "Only Excel (.xlsx, .xls), CSV (.csv), Parquet (.parquet) or Arrow (.arrow, .feather) files are allowed"
+            )
+        if ext in COLUMNAR_EXTENSIONS and not ARROW_AVAILABLE:
+            raise FileProcessingError("Parquet and Arrow uploads are not enabled on this server (pyarrow is not installed)")
+        return ext
+
+    def _reuse_upload(self, db: Session, content_hash: str, filename: str) -> Optional[List[Problem]]:
+        """
+        A file already processed for this event short-circuits to the
+        problems it produced, without parsing or embedding anything again
+        """
+        previous = upload_service.get_by_hash(db, content_hash=content_hash)
+        if previous is None:
+            return None
+        problems = {p.id: p for p in problem_service.get_multi_by_ids(db, ids=previous.problem_ids)}
+        if len(problems) == len(set(previous.problem_ids)):
+            logger.info(f"{filename} was already processed as upload {previous.id}")
+            self.reused_upload = True
+            self.progress.stage("receive").finish()
+            self.progress.skip("parse", "validate", "store", "embed", "index")
+            self.progress.status = "done"
+            return [problems[problem_id] for problem_id in previous.problem_ids]
+        # Some of its problems were deleted since, so process it again
+        upload_service.forget(db, previous)
+        return None
+
+    async def _ingest(
+        self,
+        db: Session,
+        file_path: str,
+        ext: str,
+        filename: str,
+        on_duplicate: str,
+        event_id: Optional[int],
+        content_hash: str,
+        index_with: Optional[IndexStages] = None
+    ) -> List[Problem]:
+        """
+        Parse, validate and store the file as overlapping stages joined by
+        bounded queues: a full queue pauses the stage before it, so memory
+        stays at a few chunks however large the file. Each stored batch is
+        handed on to index_with right away.
+        """
+        progress = self.progress
+        parsed: asyncio.Queue = asyncio.Queue(settings.INGEST_QUEUE_CHUNKS)
+        validated: asyncio.Queue = asyncio.Queue(settings.INGEST_QUEUE_CHUNKS)
+        # Only ids are passed on, so slow embedding never holds back storing
+        stored_ids: asyncio.Queue = asyncio.Queue()
+        if index_with is not None:
+            progress.indexing = asyncio.ensure_future(index_with(stored_ids, progress))
+        else:
+            progress.skip("embed", "index")
+
+        layouts: List[Dict] = []
+        stored_problems: List[Problem] = []
+        try:
+            await _run_stages(
+                self._parse_stage(file_path, ext, sheet_template_service.snapshot(db), parsed, layouts),
+                self._validate_stage(parsed, validated),
+                self._store_stage(db, validated, stored_ids, stored_problems, filename, on_duplicate, event_id)
+            )
+        finally:
+            # Rows committed before a failure are still embedded
+            stored_ids.put_nowait(None)
+
+        upload_service.record(
+            db,
+            content_hash=content_hash,
+            filename=filename,
+            event_id=event_id,
+            problem_ids=list(dict.fromkeys(p.id for p in stored_problems))
+        )
+        sheet_template_service.learn(db, layouts)
+        if progress.status == "running":
+            progress.status = "stored" if index_with is not None else "done"
+        return stored_problems
+
+    async def _parse_stage(
+        self,
+        file_path: str,
+        ext: str,
+        templates: Dict[str, Dict],
+        out: asyncio.Queue,
+        layouts: List[Dict]
+    ) -> None:
+        """
+        Stream the problems of every sheet from the parse pool, in sheet
+        order. All sheets are parsed in parallel. In a workbook, sheets with
+        a recognised problem column win over ones that only look like prose,
+        such as an instructions sheet, so the latter are held back (on disk)
+        until it is clear that no sheet has one. A lone sheet is always
+        streamed straight through. Layouts of the sheets used go to `layouts`.
+        """
+        stage = self.progress.stage("parse")
+        stage.start()
+        loop = asyncio.get_running_loop()
+        sheets = await parse_pool.run(sheet_names, file_path, ext)
+        streams = [
+            parse_pool.stream(
+                iter_problem_chunks, file_path, ext, settings.INGEST_CHUNK_ROWS, sheet, templates,
+                maxsize=settings.INGEST_QUEUE_CHUNKS
+            )
+            for sheet in sheets
+        ]
+
+        used = []
+        held: List[_HeldSheet] = []
+        errors = []
+        matched = False
+        try:
+            for sheet, stream in zip(sheets, streams):
+                sheet_info = None
+                try:
+                    async for item in stream:
+                        if "layout" in item:
+                            sheet_info = item
+                            if matched and not sheet_info["header_match"]:
+                                break
+                            continue
+                        if len(sheets) > 1 and not sheet_info["header_match"]:
+                            if not held or held[-1].sheet != sheet:
+                                held.append(_HeldSheet(sheet, sheet_info["layout"]))
+                            await loop.run_in_executor(None, held[-1].append, item)
+                            continue
+                        if not matched:
+                            matched = True
+                            for held_sheet in held:
+                                held_sheet.close()
+                            held = []
+                        if not used or used[-1][0] != sheet:
+                            used.append((sheet, sheet_info["layout"]))
+                        stage.rows += len(item["descriptions"])
+                        await stage.put(out, item)
+                except SheetParseError as e:
+                    errors.append(str(e))
+                finally:
+                    await stream.aclose()
+
+            for held_sheet in held:
+                used.append((held_sheet.sheet, held_sheet.layout))
+                items = held_sheet.read()
+                while True:
+                    item = await loop.run_in_executor(None, next, items, None)
+                    if item is None:
+                        break
+                    stage.rows += len(item["descriptions"])
+                    await stage.put(out, item)
+        finally:
+            for stream in streams:
+                await stream.aclose()
+            for held_sheet in held:
+                held_sheet.close()
+
+        if not used:
+            raise MalformedDataError(errors[0] if errors else "No data found in file")
+        if sheets != [None]:
+            logger.info(f"Reading problems from sheets: {', '.join(sheet for sheet, _ in used)}")
+        layouts.extend(layout for _, layout in used)
+        await out.put(None)
+        stage.finish()
+
+    async def _validate_stage(self, source: asyncio.Queue, out: asyncio.Queue) -> None:
+        """
+        Check parsed rows and regroup them into batches of
+        INGEST_COMMIT_ROWS, each stored as its own transaction
+        """
+        stage = self.progress.stage("validate")
+        stage.start()
+        batch: List[ExtractedProblem] = []
+        while True:
+            chunk = await source.get()
+            if chunk is None:
+                break
+            for title, description, tech_stack in zip(
+                chunk["titles"], chunk["descriptions"], chunk["tech_stacks"]
+            ):
+                if not description or not description.strip():
+                    stage.rejected += 1
+                    continue
+                batch.append(ExtractedProblem(title or self._generate_title(description), description, tech_stack))
+                stage.rows += 1
+                if len(batch) == settings.INGEST_COMMIT_ROWS:
+                    await stage.put(out, batch)
+                    batch = []
+        if batch:
+            await stage.put(out, batch)
+        await out.put(None)
+        stage.finish()
+
+    async def _store_stage(
+        self,
+        db: Session,
+        source: asyncio.Queue,
+        stored_ids: asyncio.Queue,
+        stored_problems: List[Problem],
+        filename: str,
+        on_duplicate: str,
+        event_id: Optional[int]
+    ) -> None:
+        """
+        Store each validated batch in a worker thread: MinHash signatures,
+        LSH lookups and the commit would otherwise stall the event loop.
+        The thread has a session of its own, which keeps what it loaded
+        readable after commit since the problems are returned from it.
+        """
+        stage = self.progress.stage("store")
+        stage.start()
+        loop = asyncio.get_running_loop()
+        store_db = Session(bind=db.get_bind(), autoflush=False, expire_on_commit=False)
+        handed_on = set()
+        try:
+            while True:
+                problems = await source.get()
+                if problems is None:
+                    break
+                stored = await loop.run_in_executor(None, functools.partial(
+                    self._store_problems,
+                    store_db,
+                    problems,
+                    filename,
+                    on_duplicate,
+                    event_id,
+                    row_offset=stage.rows
+                ))
+                stored_problems.extend(stored)
+                stage.rows += len(problems)
+                new_ids = [p.id for p in stored if p.id not in handed_on]
+                handed_on.update(new_ids)
+                if new_ids:
+                    stored_ids.put_nowait(new_ids)
+        finally:
+            store_db.close()
+        stage.finish()
+
     def _store_problems(
         self,
         db: Session,
-        problems: List[ProblemCreate],
-        source_file: str
+        problems: List[ExtractedProblem],
+        source_file: str,
+        on_duplicate: str = "report",
+        event_id: Optional[int] = None,
+        row_offset: int = 0
     ) -> List[Problem]:
         """
-        Store processed problems in database
+        Store processed problems in database. row_offset is the number of
+        problems from earlier chunks of the same file, for duplicate reports.
+        New problems are bulk inserted and returned as detached Problem
+        objects carrying their new ids, so nothing is re-read afterwards.
         """
         
         current_time = datetime.utcnow()
+        signatures = near_duplicate_index.signatures([prob.description for prob in problems])
+        matches = near_duplicate_index.find_duplicates(db, signatures, event_id)
+
+        merge_targets: Dict[int, Problem] = {}
+        if on_duplicate == "merge":
+            merge_targets = {
+                p.id: p for p in problem_service.get_multi_by_ids(
+                    db, ids=list({match[1] for match in matches if match is not None and match[0] == "catalog"})
+                )
+            }
+
         stored_problems = []
-        for prob in problems:
+        new_problems = []
+        new_signatures = []
+        row_problems: Dict[int, Problem] = {}
+        merged_originals: Dict[int, List[str]] = {}
+        for row, (prob, signature, match) in enumerate(zip(problems, signatures, matches)):
+            if match is not None:
+                kind, target, similarity = match
+                self.duplicates.append({
+                    "row": row_offset + row,
+                    "title": prob.title,
+                    "duplicate_of": target if kind == "catalog" else None,
+                    "duplicate_of_row": row_offset + target if kind == "batch" else None,
+                    "similarity": round(similarity, 3),
+                    "action": on_duplicate
+                })
+                if on_duplicate == "skip":
+                    continue
+                if on_duplicate == "merge":
+                    existing = merge_targets.get(target) if kind == "catalog" else row_problems.get(target)
+                    if existing is not None:
+                        if kind == "catalog" and existing.id not in merged_originals:
+                            merged_originals[existing.id] = list(existing.tech_stack or [])
+                        existing.tech_stack = skill_taxonomy.resolve_many(
+                            list(existing.tech_stack or []) + list(prob.tech_stack)
+                        )
+                        if existing not in stored_problems:
+                            stored_problems.append(existing)
+                        row_problems[row] = existing
+                        continue
+
             db_problem = Problem(
                 title=prob.title,
                 description=prob.description,
                 tech_stack=prob.tech_stack,
                 source_file=source_file, 
-                created_at=current_time
+                created_at=current_time,
+                event_id=event_id,
+                content_hash=problem_content_hash(prob.description, event_id)
             )
-            db.add(db_problem)
             stored_problems.append(db_problem)
+            new_problems.append(db_problem)
+            new_signatures.append(signature)
+            row_problems[row] = db_problem
+        
+        if self.duplicates:
+            logger.info(f"Found {len(self.duplicates)} near-duplicate rows in {source_file}")
         
         try:
+            row_ids, inserted = problem_service.bulk_create(
+                db,
+                rows=[
+                    {
+                        "title": prob.title,
+                        "description": prob.description,
+                        "tech_stack": prob.tech_stack,
+                        "source_file": prob.source_file,
+                        "created_at": prob.created_at,
+                        "event_id": prob.event_id,
+                        "content_hash": prob.content_hash
+                    }
+                    for prob in new_problems
+                ],
+                batch_size=settings.INGEST_INSERT_BATCH_ROWS
+            )
+
+            # Rows whose content is already stored resolve to the stored problem
+            existing = {
+                p.id: p for p in problem_service.get_multi_by_ids(
+                    db, ids=[problem_id for problem_id in row_ids if problem_id not in inserted]
+                )
+            }
+            added: Dict[int, Problem] = {}
+            added_signatures = []
+            replacements: Dict[int, Problem] = {}
+            for prob, signature, problem_id in zip(new_problems, new_signatures, row_ids):
+                if problem_id in inserted and problem_id not in added:
+                    prob.id = problem_id
+                    added[problem_id] = prob
+                    added_signatures.append(signature)
+                else:
+                    replacements[id(prob)] = added.get(problem_id) or existing[problem_id]
+            if replacements:
+                logger.info(f"{len(replacements)} rows of {source_file} are already in the catalog")
+                seen = set()
+                resolved = []
+                for prob in stored_problems:
+                    prob = replacements.get(id(prob), prob)
+                    if id(prob) not in seen:
+                        seen.add(id(prob))
+                        resolved.append(prob)
+                stored_problems = resolved
+
+            db.flush()
+            near_duplicate_index.add(db, list(added), added_signatures)
+            # Merged catalog problems are re-counted with their new stack
+            skill_analytics.record(db, merged_originals.values(), sign=-1)
+            skill_analytics.record(
+                db,
+                [prob.tech_stack for prob in added.values()]
+                + [prob.tech_stack for prob in stored_problems if prob.id in merged_originals]
+            )
             db.commit()
-            for prob in stored_problems:
-                db.refresh(prob)
             return stored_problems
         except Exception as e:
             db.rollback()
@@ -99,30 +612,7 @@ class FileProcessorService:
             raise FileProcessingError("Error storing problems in database")
         
 
-    def _read_excel_file(self, file_path: str) -> pd.DataFrame:
-        """
-        Read Excel file with various attempts to handle different formats
-        """
-        try:
-            df = pd.read_excel(file_path)
-            
-            if df.empty:
-                xl = pd.ExcelFile(file_path)
-                for sheet in xl.sheet_names:
-                    df = pd.read_excel(file_path, sheet_name=sheet)
-                    if not df.empty:
-                        break
-
-            if df.empty:
-                raise MalformedDataError("No data found in Excel file")
-
-            return df
-
-        except Exception as e:
-            logger.error(f"Error reading Excel file: {str(e)}")
-            raise FileProcessingError(f"Error reading Excel file: {str(e)}")
-
-    def _extract_problems(self, df: pd.DataFrame) -> List[ProblemCreate]:
+    def _extract_problems(self, df: pd.DataFrame) -> List[ExtractedProblem]:
         """
         Extract problem statements from DataFrame
         """
@@ -133,45 +623,148 @@ class FileProcessorService:
 
         # Extract tech stack if available
         tech_stack_col = self._identify_tech_stack_column(df)
-        problems = []
-        
-        for idx, row in df.iterrows():
-            try:
-                problem_text = str(row[problem_col]).strip()
-                
-                # Skipping invalid problems
-                if problem_text.lower() in ['nan', '', 'none']:
-                    continue
-
-                # Extract tech stack if exists
-                tech_stack = []
-                if tech_stack_col:
-                    tech_stack = self._extract_tech_stack(row[tech_stack_col])
-
-                # Create problem object
-                problem = ProblemCreate(
-                    title=self._generate_title(problem_text),
-                    description=problem_text,
-                    tech_stack=tech_stack
-                )
-                problems.append(problem)
-                
-            except Exception as e:
-                logger.warning(f"Error processing row {idx}: {str(e)}")
-                continue
+        problems = self._extract_rows(df, problem_col, tech_stack_col)
             
         if not problems:
             raise MalformedDataError("No valid problem statements found in file")
 
         return problems
 
+    def _iter_sheet_chunks(
+        self,
+        file_path: str,
+        ext: str,
+        chunk_rows: int,
+        sheet: Optional[str] = None,
+        templates: Optional[Dict[str, Dict]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Read one sheet of an upload (or a CSV) chunk_rows rows at a time and
+        yield the problems of each chunk as parallel lists (titles,
+        descriptions, tech_stacks), so only one chunk is held at a time.
+        The first item describes the sheet instead: its header layout and
+        whether the problem column was found by name. A header found in
+        templates (fingerprint -> columns) skips column detection, and only
+        the columns it names are read.
+        """
+        layout: Dict[str, Any] = {}
+
+        def choose_columns(header: List[str]) -> Optional[List[str]]:
+            layout["fingerprint"] = header_fingerprint(header)
+            layout["columns"] = [column_key(col) for col in header]
+            known = sheet_template_service.resolve(header, (templates or {}).get(layout["fingerprint"]))
+            if known is None:
+                return None
+            layout["known"] = known
+            return list(dict.fromkeys(col for col in known.values() if col))
+
+        chunks = iter_sheet_frames(file_path, ext, sheet, chunk_rows, choose_columns)
+
+        problem_col = tech_stack_col = title_col = None
+        found = 0
+        for df in chunks:
+            if problem_col is None:
+                known = layout.get("known")
+                if known is not None:
+                    problem_col = known["problem_column"]
+                    tech_stack_col = known["tech_stack_column"]
+                    title_col = known["title_column"]
+                else:
+                    problem_col = self._identify_problem_column(df)
+                    if not problem_col:
+                        raise SheetParseError("Could not identify problem statement column")
+                    tech_stack_col = self._identify_tech_stack_column(df)
+                    title_col = self._identify_title_column(df)
+
+                template_hit = "known" in layout
+                # Found by column name (or a known layout) rather than by
+                # guessing from the content
+                header_match = template_hit or column_key(problem_col) in self.possible_column_names
+                yield {
+                    "header_match": header_match,
+                    "layout": {
+                        "fingerprint": layout["fingerprint"],
+                        "columns": layout["columns"],
+                        "problem_column": column_key(problem_col),
+                        "tech_stack_column": column_key(tech_stack_col) if tech_stack_col else None,
+                        "title_column": column_key(title_col) if title_col else None,
+                        "template_hit": template_hit,
+                        "header_match": header_match
+                    }
+                }
+
+            columns = self._extract_columns(df, problem_col, tech_stack_col, title_col)
+            if columns["descriptions"]:
+                found += len(columns["descriptions"])
+                yield columns
+
+        if not found:
+            raise SheetParseError("No valid problem statements found in file")
+
+    def _extract_rows(
+        self,
+        df: pd.DataFrame,
+        problem_col: str,
+        tech_stack_col: Optional[str]
+    ) -> List[ExtractedProblem]:
+        """
+        Extract problem statements from already identified columns
+        """
+        columns = self._extract_columns(df, problem_col, tech_stack_col)
+        return [
+            ExtractedProblem(title, description, tech_stack)
+            for title, description, tech_stack in zip(
+                columns["titles"], columns["descriptions"], columns["tech_stacks"]
+            )
+        ]
+
+    def _extract_columns(
+        self,
+        df: pd.DataFrame,
+        problem_col: str,
+        tech_stack_col: Optional[str],
+        title_col: Optional[str] = None
+    ) -> Dict[str, list]:
+        """
+        Extract titles, descriptions and tech stacks as parallel lists, with
+        column-wide string operations instead of a per-row loop. Titles come
+        from title_col where it has one (e.g. a re-imported export) and are
+        generated from the description otherwise.
+        """
+        texts = df[problem_col].astype(str).str.strip()
+        
+        # Skipping invalid problems
+        valid = ~texts.str.lower().isin(['nan', '', 'none'])
+        texts = texts[valid]
+        if texts.empty:
+            return {"titles": [], "descriptions": [], "tech_stacks": []}
+
+        titles = self._generate_titles(texts)
+        if title_col:
+            given = df.loc[valid, title_col].fillna('').astype(str).str.strip()
+            titles = given.where(given != '', titles)
+
+        if tech_stack_col:
+            # Sheets repeat the same stacks a lot: resolve each distinct value once
+            raw_stacks = df.loc[valid, tech_stack_col].fillna('')
+            resolved = {value: self._extract_tech_stack(value) for value in raw_stacks.unique()}
+            tech_stacks = raw_stacks.map(resolved).tolist()
+        else:
+            tech_stacks = [[] for _ in range(len(texts))]
+
+        return {
+            "titles": titles.tolist(),
+            "descriptions": texts.tolist(),
+            "tech_stacks": [list(tech_stack) for tech_stack in tech_stacks]
+        }
+
     def _identify_problem_column(self, df: pd.DataFrame) -> str:
         """
         Identify the column containing problem statements
         """
         # exact matches
         for col in df.columns:
-            if str(col).lower() in self.possible_column_names:
+            if column_key(col) in self.possible_column_names:
                 return col
 
         # content-based identification
@@ -207,11 +800,17 @@ class FileProcessorService:
         tech_keywords = ['technology', 'tech stack', 'technical', 'skills', 'requirements']
         
         for col in df.columns:
-            if any(keyword in str(col).lower() for keyword in tech_keywords):
+            if any(keyword in column_key(col) for keyword in tech_keywords):
                 return col
         
         return None
 
+    def _identify_title_column(self, df: pd.DataFrame) -> Optional[str]:
+        for col in df.columns:
+            if column_key(col) in ('title', 'problem title'):
+                return col
+        return None
+
     def _extract_tech_stack(self, tech_text: str) -> List[str]:
         """
         Extract technology stack from text
@@ -224,7 +823,7 @@ class FileProcessorService:
         tech_stack = str(tech_text).replace(' and ', ',').replace('&', ',').replace(';', ',').split(',')
         tech_stack = [tech.strip() for tech in tech_stack if tech.strip()]
         
-        return tech_stack
+        return skill_taxonomy.resolve_many(tech_stack)
     
 
     def _generate_title(self, description: str, max_length: int = 100) -> str:
@@ -238,4 +837,28 @@ class FileProcessorService:
         if len(title) <= max_length:
             return title
         
-        return title[:max_length-3] + '...'
\ No newline at end of file
+        return title[:max_length-3] + '...'
+
+    def _generate_titles(self, descriptions: pd.Series, max_length: int = 100) -> pd.Series:
+        """
+        Vectorized _generate_title for a column of descriptions
+        """
+        titles = descriptions.str.split('.', n=1).str[0].str.strip()
+        too_long = titles.str.len() > max_length
+        titles[too_long] = titles[too_long].str[:max_length-3] + '...'
+        return titles
+
+
+def iter_problem_chunks(
+    file_path: str,
+    ext: str,
+    chunk_rows: int,
+    sheet: Optional[str] = None,
+    templates: Optional[Dict[str, Dict]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse pool entry point: the extracted problems of one sheet of an
+    uploaded file, chunk by chunk, as plain lists so only compact results
+    cross the process boundary
+    """
+    return FileProcessorService()._iter_sheet_chunks(file_path, ext, chunk_rows, sheet, templates)
@@ -0,0 +1,118 @@
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+import logging
+import time
+from ..core.metrics import HEDGE_LATENCY, HEDGES_SENT, HEDGES_WON
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent call latencies
+    """
+
+    def __init__(self, window: int = 500):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(int(quantile * len(ordered)), len(ordered) - 1)
+        return ordered[index]
+
+
+class HedgedCaller:
+    """
+    Sends a duplicate call when the first one is slower than the observed
+    tail latency, and returns whichever answers first.
+
+    Hedges are paid for out of a token budget that grows by `budget_ratio`
+    per call, so extra load stays capped at roughly that fraction.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        quantile: float = 0.95,
+        min_delay_ms: float = 50.0,
+        max_delay_ms: float = 2000.0,
+        budget_ratio: float = 0.05,
+        max_tokens: float = 10.0,
+        min_samples: int = 20
+    ):
+        self.name = name
+        self.quantile = quantile
+        self.min_delay = min_delay_ms / 1000
+        self.max_delay = max_delay_ms / 1000
+        self.budget_ratio = budget_ratio
+        self.max_tokens = max_tokens
+        self.min_samples = min_samples
+
+        self.latency = LatencyTracker()
+        self._tokens = 0.0
+        self.stats = {"calls": 0, "hedges_sent": 0, "hedges_won": 0}
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        How long to wait before hedging, or None while there is too little data
+        """
+        if len(self.latency.samples) < self.min_samples:
+            return None
+        delay = self.latency.percentile(self.quantile)
+        return min(max(delay, self.min_delay), self.max_delay)
+
+    async def call(self, make_call: Callable[[], Awaitable[T]]) -> T:
+        self.stats["calls"] += 1
+        self._tokens = min(self._tokens + self.budget_ratio, self.max_tokens)
+
+        start = time.monotonic()
+        primary = asyncio.ensure_future(make_call())
+        tasks = [primary]
+        try:
+            delay = self.hedge_delay()
+            if delay is None:
+                return self._finish(await primary, start, "primary")
+
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or self._tokens < 1:
+                return self._finish(await primary, start, "primary")
+
+            self._tokens -= 1
+            self.stats["hedges_sent"] += 1
+            HEDGES_SENT.labels(call=self.name).inc()
+            hedge = asyncio.ensure_future(make_call())
+            tasks.append(hedge)
+
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is hedge:
+                        self.stats["hedges_won"] += 1
+                        HEDGES_WON.labels(call=self.name).inc()
+                    return self._finish(task.result(), start, "hedge" if task is hedge else "primary")
+
+            raise error
+        finally:
+            # Whichever call lost (or all of them, if the caller gave up) is abandoned
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _finish(self, result: T, start: float, outcome: str) -> T:
+        elapsed = time.monotonic() - start
+        self.latency.record(elapsed)
+        HEDGE_LATENCY.labels(call=self.name, outcome=outcome).observe(elapsed)
+        return result
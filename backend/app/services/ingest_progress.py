@@ -0,0 +1,163 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+INGEST_STAGES = ("receive", "parse", "validate", "store", "embed", "index")
+
+
+class StageProgress:
+    """
+    Counters for one stage of an ingest. blocked_seconds is time spent
+    waiting for room in the next stage's queue, i.e. how much the stages
+    after it held it back.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "pending"
+        self.rows = 0
+        self.rejected = 0
+        self.bytes = 0
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.blocked_seconds = 0.0
+        self._started = None
+        self._finished = None
+
+    def start(self) -> None:
+        if self._started is None:
+            self.status = "running"
+            self.started_at = datetime.utcnow()
+            self._started = time.monotonic()
+
+    def finish(self, status: str = "done") -> None:
+        if self._started is None:
+            self.start()
+        if self._finished is None:
+            self.status = status
+            self.finished_at = datetime.utcnow()
+            self._finished = time.monotonic()
+
+    async def put(self, queue: asyncio.Queue, item: Any) -> None:
+        """
+        Hand item to the next stage, counting the wait if its queue is full
+        """
+        if queue.full():
+            started = time.monotonic()
+            await queue.put(item)
+            self.blocked_seconds += time.monotonic() - started
+        else:
+            queue.put_nowait(item)
+
+    @property
+    def seconds(self) -> Optional[float]:
+        if self._started is None:
+            return None
+        return (self._finished or time.monotonic()) - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "rows": self.rows,
+            "rejected": self.rejected,
+            "bytes": self.bytes,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "blocked_seconds": round(self.blocked_seconds, 3)
+        }
+
+
+class IngestProgress:
+    """
+    Where one upload is in the receive -> parse -> validate -> store ->
+    embed -> index pipeline. status is "running" until its problems are
+    stored, "stored" while they are still being embedded, then "done"
+    (or "failed").
+    """
+
+    def __init__(self, filename: str, owner_id: Optional[int] = None, ingest_id: Optional[str] = None):
+        self.id = ingest_id or uuid.uuid4().hex
+        self.filename = filename
+        self.owner_id = owner_id
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.stages = {name: StageProgress(name) for name in INGEST_STAGES}
+        # Embedding still running after the upload response, kept referenced
+        self.indexing: Optional[asyncio.Task] = None
+
+    def stage(self, name: str) -> StageProgress:
+        return self.stages[name]
+
+    def skip(self, *names: str) -> None:
+        for name in names:
+            self.stages[name].finish("skipped")
+
+    def fail(self, error: str) -> None:
+        self.status = "failed"
+        self.error = error
+        # Rows stored before the failure are still being embedded
+        indexing = self.indexing is not None and not self.indexing.done()
+        for stage in self.stages.values():
+            if indexing and stage.name in ("embed", "index"):
+                continue
+            if stage.status == "running":
+                stage.finish("failed")
+            elif stage.status == "pending":
+                stage.finish("skipped")
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "stages": [stage.to_dict() for stage in self.stages.values()]
+        }
+
+
+class IngestTracker:
+    """
+    Recent ingests of this process by id, for progress polling. Only the
+    last `keep` are remembered; running ones are never dropped.
+    """
+
+    def __init__(self, keep: int = 200):
+        self.keep = keep
+        self._ingests: "OrderedDict[str, IngestProgress]" = OrderedDict()
+
+    def start(self, filename: str, owner_id: Optional[int] = None, ingest_id: Optional[str] = None) -> IngestProgress:
+        progress = IngestProgress(filename, owner_id, ingest_id)
+        self._ingests[progress.id] = progress
+        self._ingests.move_to_end(progress.id)
+        for old_id in [key for key, old in self._ingests.items() if old.finished][:max(0, len(self._ingests) - self.keep)]:
+            del self._ingests[old_id]
+        return progress
+
+    def get(self, ingest_id: str) -> Optional[IngestProgress]:
+        return self._ingests.get(ingest_id)
+
+    def list(self, owner_id: Optional[int] = None) -> List[IngestProgress]:
+        """
+        Most recent first
+        """
+        return [
+            progress for progress in reversed(self._ingests.values())
+            if owner_id is None or progress.owner_id == owner_id
+        ]
+
+
+ingest_tracker = IngestTracker()
@@ -0,0 +1,128 @@
+import asyncio
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+from ..core.metrics import LLM_QUEUE_DEPTH, LLM_QUEUE_WAIT
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+    BACKGROUND = "background"
+
+
+DEFAULT_WEIGHTS = {
+    Priority.INTERACTIVE: 8,
+    Priority.BATCH: 2,
+    Priority.BACKGROUND: 1
+}
+
+
+class LLMScheduler:
+    """
+    Shared scheduler for outbound provider calls.
+
+    At most `max_concurrency` calls run at once. When all slots are busy,
+    waiting calls are released by weighted fair queuing across priority
+    classes, so bulk work keeps moving without starving interactive calls.
+    """
+
+    def __init__(self, max_concurrency: int = 8, weights: Optional[Dict[Priority, float]] = None):
+        self.max_concurrency = max_concurrency
+        self.weights = {Priority(k): float(v) for k, v in (weights or DEFAULT_WEIGHTS).items()}
+        # Room for a hedge next to every running call, see run_async
+        self._executor = ThreadPoolExecutor(max_workers=2 * max_concurrency, thread_name_prefix="llm")
+
+        self._running = 0
+        self._queue: List[Tuple[float, int, Priority, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._depth: Dict[Priority, int] = {p: 0 for p in Priority}
+
+    async def run(self, fn: Callable[..., Any], *args: Any, priority: Priority = Priority.INTERACTIVE) -> Any:
+        """
+        Run a blocking provider call once the scheduler grants it a slot
+        """
+        await self._acquire(Priority(priority))
+
+        future = self.submit(fn, *args)
+        # The slot is freed when the call really finishes, even if the caller gives up waiting
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.shield(future)
+
+    async def run_async(self, make_call: Callable[[], Awaitable[Any]], priority: Priority = Priority.INTERACTIVE) -> Any:
+        """
+        Await make_call() within one slot. It starts its provider calls with
+        submit(), e.g. a hedged call whose duplicate shares the slot instead
+        of queueing for another.
+        """
+        await self._acquire(Priority(priority))
+
+        task = asyncio.ensure_future(make_call())
+        task.add_done_callback(lambda _: self._release())
+        return await asyncio.shield(task)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> asyncio.Future:
+        """
+        Start a blocking provider call on the scheduler's threads without
+        taking a slot; only for use within a slot already held (run_async)
+        """
+        return asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+
+    async def _acquire(self, priority: Priority) -> None:
+        if self._running < self.max_concurrency and not self._queue:
+            self._running += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        start = max(self._virtual_time, self._last_finish[priority])
+        finish = start + 1.0 / self.weights.get(priority, 1.0)
+        self._last_finish[priority] = finish
+
+        grant = loop.create_future()
+        heapq.heappush(self._queue, (finish, next(self._seq), priority, start, grant))
+        self._set_depth(priority, 1)
+
+        enqueued_at = loop.time()
+        try:
+            await grant
+        except asyncio.CancelledError:
+            if grant.done() and not grant.cancelled():
+                # Slot was handed over just as the caller went away; pass it on
+                self._release()
+            else:
+                # No longer waiting; the heap entry is skipped when popped
+                self._set_depth(priority, -1)
+            raise
+        finally:
+            LLM_QUEUE_WAIT.labels(priority=priority.value).observe(loop.time() - enqueued_at)
+
+    def _release(self) -> None:
+        while self._queue:
+            _, _, priority, start, grant = heapq.heappop(self._queue)
+            if grant.done():
+                # Cancelled while queued, already taken off the depth
+                continue
+            self._set_depth(priority, -1)
+            self._virtual_time = start
+            grant.set_result(None)
+            return
+        self._running -= 1
+
+    def _set_depth(self, priority: Priority, delta: int) -> None:
+        self._depth[priority] += delta
+        LLM_QUEUE_DEPTH.labels(priority=priority.value).set(self._depth[priority])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": {p.value: depth for p, depth in self._depth.items()}
+        }
@@ -0,0 +1,28 @@
+from functools import lru_cache
+from typing import List
+from ..core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_local_model():
+    """
+    Local sentence-transformers model for offline embedding runs.
+    sentence-transformers is optional and only needed when EMBED_PROVIDER=local.
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        raise RuntimeError(
+            "EMBED_PROVIDER=local needs the sentence-transformers package "
+            "(pip install sentence-transformers)"
+        )
+    logger.info(f"Loading local embedding model {settings.LOCAL_EMBED_MODEL}")
+    return SentenceTransformer(settings.LOCAL_EMBED_MODEL)
+
+
+def embed_texts_locally(texts: List[str]) -> List[List[float]]:
+    vectors = get_local_model().encode(texts, batch_size=64, show_progress_bar=False)
+    return vectors.tolist()
@@ -0,0 +1,159 @@
+import asyncio
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.problem import Problem
+from .catalog_partitions import partition_registry
+from .cohere_service import get_team_embedding
+from .embedding_store import iter_embeddings
+from .problem_matcher import team_to_profile
+from .row_writers import row_writer
+from .skill_taxonomy import skill_taxonomy
+import logging
+
+logger = logging.getLogger(__name__)
+
+MATCH_EXPORT_COLUMNS = (
+    "rank",
+    "problem_id",
+    "title",
+    "similarity",
+    "skill_match",
+    "matched_skills",
+    "missing_skills",
+    "tech_stack",
+    "event_id"
+)
+
+
+async def embed_team(team) -> np.ndarray:
+    """
+    The team profile's embedding, from the embedding provider
+    """
+    return np.asarray(await get_team_embedding(team_to_profile(team)), dtype=np.float32)
+
+
+def _score_catalog(db: Session, query: np.ndarray, batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cosine similarity of every embedded problem to the query, read batch by
+    batch from the embedding store. Only ids and scores are kept.
+    """
+    norm = np.linalg.norm(query)
+    query = query / norm if norm else query
+    ids, scores = [], []
+    for batch_ids, matrix in iter_embeddings(db, batch_size):
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1
+        ids.append(np.asarray(batch_ids, dtype=np.int64))
+        scores.append((matrix @ query / norms).astype(np.float32))
+    if not ids:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    return np.concatenate(ids), np.concatenate(scores)
+
+
+def _best_first(ids: np.ndarray, scores: np.ndarray, limit: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.arange(len(scores))
+    if limit is not None and limit < len(scores):
+        order = np.argpartition(-scores, limit - 1)[:limit]
+    order = order[np.argsort(-scores[order], kind="stable")]
+    return ids[order], scores[order]
+
+
+async def rank_problems(
+    db: Session,
+    query: np.ndarray,
+    event_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    batch_size: int = 2000
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Problem ids and similarities to the query, best first. An event is
+    ranked from its cached partition; the whole catalog is scanned from
+    stored embeddings, leaving out problems not embedded yet.
+    """
+    if event_id is not None:
+        partition = await partition_registry.get(db, event_id)
+        ranked = partition.semantic_top(query, limit or len(partition.problem_ids))
+        return (
+            np.array([problem_id for problem_id, _ in ranked], dtype=np.int64),
+            np.array([score for _, score in ranked], dtype=np.float32)
+        )
+    ids, scores = await asyncio.get_running_loop().run_in_executor(
+        None, _score_catalog, db, query, batch_size
+    )
+    return _best_first(ids, scores, limit)
+
+
+def iter_match_rows(
+    db: Session,
+    team_skills: Sequence[str],
+    problem_ids: np.ndarray,
+    scores: np.ndarray,
+    batch_size: int = 2000
+) -> Iterator[List[Tuple]]:
+    """
+    Rows of MATCH_EXPORT_COLUMNS in rank order, batch_size problems at a
+    time. Problems deleted since they were ranked are skipped.
+    """
+    covered = {skill.lower() for skill in skill_taxonomy.resolve_many(team_skills)}
+    rank = 0
+    for start in range(0, len(problem_ids), batch_size):
+        ids = [int(problem_id) for problem_id in problem_ids[start:start + batch_size]]
+        problems = {
+            p.id: p for p in
+            db.query(Problem.id, Problem.title, Problem.tech_stack, Problem.event_id)
+            .filter(Problem.id.in_(ids))
+        }
+        rows = []
+        for problem_id, score in zip(ids, scores[start:start + batch_size]):
+            problem = problems.get(problem_id)
+            if problem is None:
+                continue
+            rank += 1
+            stack = skill_taxonomy.resolve_many(problem.tech_stack)
+            matched = [skill for skill in stack if skill.lower() in covered]
+            missing = [skill for skill in stack if skill.lower() not in covered]
+            rows.append((
+                rank,
+                problem_id,
+                problem.title,
+                round(float(score), 4),
+                round(len(matched) / len(stack), 4) if stack else None,
+                matched,
+                missing,
+                stack,
+                problem.event_id
+            ))
+        yield rows
+
+
+def _encode_next(batches: Iterator[List[Tuple]], writer) -> Optional[bytes]:
+    rows = next(batches, None)
+    return None if rows is None else writer.write(rows)
+
+
+async def stream_team_matches(
+    db: Session,
+    team,
+    problem_ids: np.ndarray,
+    scores: np.ndarray,
+    fmt: str,
+    batch_size: int = 2000
+) -> AsyncIterator[bytes]:
+    """
+    Serialize problems already ranked for the team (see rank_problems) as
+    CSV, NDJSON or .xlsx, with the skills each covers and misses. Rows
+    are looked up and encoded a batch at a time, off the event loop.
+    """
+    writer = row_writer(fmt, MATCH_EXPORT_COLUMNS, sheet_name="Matches")
+    yield writer.begin()
+    loop = asyncio.get_running_loop()
+    batches = iter_match_rows(db, team.tech_skills, problem_ids, scores, batch_size)
+    while True:
+        data = await loop.run_in_executor(None, _encode_next, batches, writer)
+        if data is None:
+            break
+        if data:
+            yield data
+    yield writer.end()
+    logger.info(f"Exported {len(problem_ids)} matches for team {team.id} as {fmt}")
@@ -0,0 +1,178 @@
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.problem import Problem
+from ..models.problem_signature import ProblemMinHash, ProblemLSHBucket
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHasher:
+    """
+    MinHash signatures over character shingles of normalized text
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        normalized = re.sub(r"\s+", " ", str(text).lower()).strip()
+        if len(normalized) <= self.shingle_size:
+            grams = {normalized}
+        else:
+            grams = {
+                normalized[i:i + self.shingle_size]
+                for i in range(len(normalized) - self.shingle_size + 1)
+            }
+        return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self._shingles(text)
+        # (a * x + b) mod p for every permutation and shingle, then the column-wise minimum
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        """
+        Estimated Jaccard similarity of the two underlying shingle sets
+        """
+        return float(np.mean(sig_a == sig_b))
+
+
+class NearDuplicateIndex:
+    """
+    Persistent LSH index over problem MinHash signatures.
+
+    Each signature is split into `bands` bands; problems sharing any band
+    bucket are candidates, so a lookup touches a handful of index entries
+    instead of the whole catalog.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        threshold: float = 0.8,
+        max_bucket_candidates: int = 32
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        # Compare against at most this many problems (or rows) per bucket
+        self.max_bucket_candidates = max_bucket_candidates
+
+    def signatures(self, texts: Sequence[str]) -> List[np.ndarray]:
+        return [self.hasher.signature(text) for text in texts]
+
+    def bucket_keys(self, signature: np.ndarray) -> List[int]:
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(band.to_bytes(2, "little") + chunk.tobytes(), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    def find_duplicates(
+        self,
+        db: Session,
+        signatures: List[np.ndarray],
+        event_id: Optional[int] = None
+    ) -> List[Optional[Tuple[str, int, float]]]:
+        """
+        For each signature, the closest earlier match above the threshold:
+        ("catalog", problem_id, similarity) or ("batch", row_index, similarity).
+        Rows later in the batch are compared against earlier rows too, but
+        only against rows that were not duplicates themselves: a duplicate
+        is represented by what it matched, so a batch of near-identical rows
+        costs one comparison per row rather than one per earlier row. Each
+        bucket contributes at most max_bucket_candidates candidates.
+        Only problems of the same event (or, for None, of no event) match.
+        """
+        all_keys = [self.bucket_keys(sig) for sig in signatures]
+
+        # Catalog candidates of the same event, looked up through the bucket
+        # index; filtered before the cap so other events never crowd them out
+        key_to_problems: Dict[int, List[int]] = defaultdict(list)
+        unique_keys = list({key for keys in all_keys for key in keys})
+        same_event = Problem.event_id.is_(None) if event_id is None else Problem.event_id == event_id
+        for i in range(0, len(unique_keys), 1000):
+            rows = (
+                db.query(ProblemLSHBucket.bucket_key, ProblemLSHBucket.problem_id)
+                .join(Problem, Problem.id == ProblemLSHBucket.problem_id)
+                .filter(ProblemLSHBucket.bucket_key.in_(unique_keys[i:i + 1000]), same_event)
+                .all()
+            )
+            for key, problem_id in rows:
+                if len(key_to_problems[key]) < self.max_bucket_candidates:
+                    key_to_problems[key].append(problem_id)
+
+        candidate_ids = {pid for pids in key_to_problems.values() for pid in pids}
+        catalog_signatures: Dict[int, np.ndarray] = {}
+        candidate_list = list(candidate_ids)
+        for i in range(0, len(candidate_list), 1000):
+            for problem_id, blob in (
+                db.query(ProblemMinHash.problem_id, ProblemMinHash.signature)
+                .filter(ProblemMinHash.problem_id.in_(candidate_list[i:i + 1000]))
+                .all()
+            ):
+                catalog_signatures[problem_id] = np.frombuffer(blob, dtype=np.uint32)
+
+        batch_buckets: Dict[int, List[int]] = defaultdict(list)
+        results: List[Optional[Tuple[str, int, float]]] = []
+
+        for row, (signature, keys) in enumerate(zip(signatures, all_keys)):
+            best = None
+            best_score = self.threshold
+
+            for problem_id in {pid for key in keys for pid in key_to_problems.get(key, ())}:
+                other = catalog_signatures.get(problem_id)
+                if other is None:
+                    continue
+                score = self.hasher.similarity(signature, other)
+                if score >= best_score:
+                    best, best_score = ("catalog", problem_id, score), score
+
+            for other_row in {r for key in keys for r in batch_buckets.get(key, ())}:
+                score = self.hasher.similarity(signature, signatures[other_row])
+                if score >= best_score and (best is None or best[0] == "batch"):
+                    best, best_score = ("batch", other_row, score), score
+
+            results.append(best)
+            if best is None:
+                for key in keys:
+                    if len(batch_buckets[key]) < self.max_bucket_candidates:
+                        batch_buckets[key].append(row)
+
+        return results
+
+    def add(self, db: Session, problem_ids: Sequence[int], signatures: Sequence[np.ndarray]) -> None:
+        """
+        Index stored problems. The caller commits.
+        """
+        minhashes = []
+        buckets = []
+        for problem_id, signature in zip(problem_ids, signatures):
+            minhashes.append({"problem_id": problem_id, "signature": signature.tobytes()})
+            buckets.extend(
+                {"bucket_key": key, "problem_id": problem_id}
+                for key in self.bucket_keys(signature)
+            )
+        if minhashes:
+            db.bulk_insert_mappings(ProblemMinHash, minhashes)
+            db.bulk_insert_mappings(ProblemLSHBucket, buckets)
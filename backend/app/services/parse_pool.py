@@ -0,0 +1,188 @@
+import asyncio
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+from ..core.config import settings
+from ..core.metrics import PARSE_QUEUE_DEPTH
+import logging
+
+logger = logging.getLogger(__name__)
+
+_ITEM, _ERROR, _DONE = range(3)
+
+
+def _stream_job(fn: Callable, args: tuple, items, stop) -> None:
+    """
+    Run the generator fn(*args) in a worker, handing each item to the
+    parent through a bounded queue. A full queue blocks the generator, so
+    a worker never parses further ahead than the parent can take.
+    """
+    try:
+        for item in fn(*args):
+            if stop.is_set():
+                return
+            items.put((_ITEM, item))
+    except Exception as e:
+        try:
+            items.put((_ERROR, e))
+        except Exception:
+            # The exception itself could not be pickled
+            items.put((_ERROR, RuntimeError(str(e))))
+        return
+    items.put((_DONE, None))
+
+
+class _ThreadChannel:
+    """
+    Producer side of an asyncio.Queue for generators run in a thread
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, items: asyncio.Queue):
+        self._loop = loop
+        self._items = items
+
+    def put(self, item) -> None:
+        asyncio.run_coroutine_threadsafe(self._items.put(item), self._loop).result()
+
+
+class ParseStream:
+    """
+    Items of a generator running in the parse pool, as an async iterator.
+    The job starts as soon as the stream is created; aclose() stops it
+    early and waits for the worker to be released.
+    """
+
+    POLL_SECONDS = 0.5
+
+    def __init__(self, pool: "ParsePool", fn: Callable, args: tuple, maxsize: int):
+        loop = asyncio.get_running_loop()
+        executor = pool._get_executor()
+        if executor is None:
+            self._items = asyncio.Queue(maxsize)
+            self._stop = threading.Event()
+            channel = _ThreadChannel(loop, self._items)
+        else:
+            manager = pool._get_manager()
+            self._items = channel = manager.Queue(maxsize)
+            self._stop = manager.Event()
+        self._threaded = executor is None
+        self._finished = False
+        self._job = loop.run_in_executor(executor, _stream_job, fn, args, channel, self._stop)
+        pool._track(self._job)
+
+    async def _get(self):
+        if self._threaded:
+            return await asyncio.wait_for(self._items.get(), self.POLL_SECONDS)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self._items.get(timeout=self.POLL_SECONDS)
+        )
+
+    def __aiter__(self) -> "ParseStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._finished:
+            raise StopAsyncIteration
+        while True:
+            try:
+                kind, item = await self._get()
+                break
+            except (asyncio.TimeoutError, queue.Empty):
+                # A worker that died never reports back
+                if self._job.done() and self._job.exception() is not None:
+                    self._finished = True
+                    raise self._job.exception()
+        if kind == _ITEM:
+            return item
+        self._finished = True
+        if kind == _ERROR:
+            raise item
+        raise StopAsyncIteration
+
+    async def aclose(self) -> None:
+        self._finished = True
+        if self._job.done():
+            return
+        self._stop.set()
+        # Drain what the worker already queued so a blocked put returns
+        while not self._job.done():
+            try:
+                self._items.get_nowait()
+            except (asyncio.QueueEmpty, queue.Empty):
+                pass
+            await asyncio.wait({self._job}, timeout=0.05)
+
+
+class ParsePool:
+    """
+    A bounded pool of worker processes for CPU-bound upload parsing, so a
+    large spreadsheet never blocks the event loop. Jobs must be module-level
+    functions with picklable arguments and results. With max_workers=0 jobs
+    run in the default thread pool instead (handy for tests and debugging).
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        if self._executor is None:
+            # Fresh interpreters instead of forks of a threaded server process
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started parse pool with {self.max_workers} workers")
+        return self._executor
+
+    def _get_manager(self):
+        if self._manager is None:
+            # Serves the queues streamed results cross between processes
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        return self._manager
+
+    def _track(self, job: asyncio.Future) -> None:
+        self.pending += 1
+        PARSE_QUEUE_DEPTH.set(self.pending)
+        job.add_done_callback(self._untrack)
+
+    def _untrack(self, job: asyncio.Future) -> None:
+        self.pending -= 1
+        PARSE_QUEUE_DEPTH.set(self.pending)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run fn(*args) in the pool. `pending` counts jobs queued or running.
+        """
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        PARSE_QUEUE_DEPTH.set(self.pending)
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            PARSE_QUEUE_DEPTH.set(self.pending)
+
+    def stream(self, fn: Callable, *args, maxsize: int = 4) -> ParseStream:
+        """
+        Run the generator fn(*args) in the pool and iterate its items as
+        they are produced. At most maxsize items wait to be taken.
+        """
+        return ParseStream(self, fn, args, maxsize)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+
+parse_pool = ParsePool(max_workers=settings.PARSE_POOL_SIZE)
@@ -0,0 +1,183 @@
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.problem import Problem
+from ..models.problem_cluster import ProblemCluster
+from ..models.problem_embedding import ProblemEmbedding
+from .embedding_store import iter_embeddings, to_blob, from_blob
+import logging
+
+logger = logging.getLogger(__name__)
+
+REPRESENTATIVES_PER_CLUSTER = 3
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def _update_representatives(current: List, candidates: List) -> List:
+    merged = {int(pid): float(score) for pid, score in current}
+    for pid, score in candidates:
+        merged[int(pid)] = max(float(score), merged.get(int(pid), -1.0))
+    ranked = sorted(merged.items(), key=lambda item: item[1], reverse=True)
+    return [[pid, round(score, 4)] for pid, score in ranked[:REPRESENTATIVES_PER_CLUSTER]]
+
+
+class ProblemClusterService:
+    """
+    Topic clusters over stored problem embeddings.
+
+    New problems are assigned to the nearest centroid as they arrive and
+    the centroid is nudged towards them; a full mini-batch k-means pass
+    rebuilds the clusters once enough of the catalog has arrived since.
+    """
+
+    def __init__(self, n_clusters: int = 20, recluster_fraction: float = 0.2, batch_size: int = 1024):
+        self.n_clusters = n_clusters
+        self.recluster_fraction = recluster_fraction
+        self.batch_size = batch_size
+        self.assigned_since_recluster = 0
+
+    def assign(self, db: Session, problem_ids: Sequence[int], vectors: np.ndarray) -> None:
+        """
+        Assign new problems to their nearest cluster. Cost is proportional to
+        the number of new problems (plus one read of the k centroids).
+        """
+        clusters = db.query(ProblemCluster).order_by(ProblemCluster.id).all()
+        if not clusters or not len(problem_ids):
+            self.assigned_since_recluster += len(problem_ids)
+            return
+
+        centroids = np.vstack([from_blob(c.centroid) for c in clusters])
+        points = _normalize(np.asarray(vectors, dtype=np.float32))
+        similarities = points @ _normalize(centroids).T
+        nearest = similarities.argmax(axis=1)
+
+        sums = np.zeros_like(centroids)
+        counts = np.zeros(len(clusters), dtype=np.int64)
+        np.add.at(sums, nearest, points)
+        np.add.at(counts, nearest, 1)
+
+        for index, cluster in enumerate(clusters):
+            if not counts[index]:
+                continue
+            # Running mean: fold the new members into the centroid
+            total = cluster.size + counts[index]
+            centroid = centroids[index] + (sums[index] - counts[index] * centroids[index]) / total
+            cluster.centroid = to_blob(centroid)
+            cluster.size = int(total)
+            members = np.where(nearest == index)[0]
+            cluster.representatives = _update_representatives(
+                cluster.representatives or [],
+                [(problem_ids[m], similarities[m, index]) for m in members]
+            )
+            cluster.updated_at = datetime.utcnow()
+
+        for index in np.unique(nearest):
+            member_ids = [int(problem_ids[m]) for m in np.where(nearest == index)[0]]
+            db.query(Problem).filter(Problem.id.in_(member_ids)).update(
+                {"cluster_id": clusters[index].id}, synchronize_session=False
+            )
+
+        db.commit()
+        self.assigned_since_recluster += len(problem_ids)
+
+    def needs_recluster(self, db: Session) -> bool:
+        sizes = [size for (size,) in db.query(ProblemCluster.size).all()]
+        if not sizes:
+            return self.assigned_since_recluster >= self.n_clusters
+        return self.assigned_since_recluster >= self.recluster_fraction * max(sum(sizes), 1)
+
+    def recluster(self, db: Session) -> int:
+        """
+        Rebuild clusters from every stored embedding with mini-batch k-means.
+        Returns the number of clusters written.
+        """
+        total = db.query(ProblemEmbedding).filter(ProblemEmbedding.model == settings.EMBEDDING_MODEL_ID).count()
+        n_clusters = min(self.n_clusters, total)
+        if n_clusters < 2:
+            return 0
+
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=self.batch_size, random_state=0, n_init=3)
+        pending: List[np.ndarray] = []
+        pending_rows = 0
+        for _, matrix in iter_embeddings(db, self.batch_size):
+            # partial_fit needs at least n_clusters rows in its first batch
+            pending.append(_normalize(matrix))
+            pending_rows += len(matrix)
+            if pending_rows >= max(self.batch_size, n_clusters):
+                kmeans.partial_fit(np.vstack(pending))
+                pending, pending_rows = [], 0
+        if pending:
+            kmeans.partial_fit(np.vstack(pending))
+
+        centroids = kmeans.cluster_centers_.astype(np.float32)
+        normalized_centroids = _normalize(centroids)
+        sizes = np.zeros(n_clusters, dtype=np.int64)
+        representatives: List[List] = [[] for _ in range(n_clusters)]
+        assignments: Dict[int, List[int]] = {i: [] for i in range(n_clusters)}
+
+        for ids, matrix in iter_embeddings(db, self.batch_size):
+            similarities = _normalize(matrix) @ normalized_centroids.T
+            nearest = similarities.argmax(axis=1)
+            np.add.at(sizes, nearest, 1)
+            for row, (problem_id, index) in enumerate(zip(ids, nearest)):
+                assignments[index].append(problem_id)
+                representatives[index] = _update_representatives(
+                    representatives[index], [(problem_id, similarities[row, index])]
+                )
+
+        db.query(Problem).update({"cluster_id": None}, synchronize_session=False)
+        db.query(ProblemCluster).delete(synchronize_session=False)
+        for index in range(n_clusters):
+            cluster = ProblemCluster(
+                centroid=to_blob(centroids[index]),
+                size=int(sizes[index]),
+                representatives=representatives[index],
+                updated_at=datetime.utcnow()
+            )
+            db.add(cluster)
+            db.flush()
+            member_ids = assignments[index]
+            for i in range(0, len(member_ids), 1000):
+                db.query(Problem).filter(Problem.id.in_(member_ids[i:i + 1000])).update(
+                    {"cluster_id": cluster.id}, synchronize_session=False
+                )
+
+        db.commit()
+        self.assigned_since_recluster = 0
+        logger.info(f"Re-clustered {total} problems into {n_clusters} clusters")
+        return n_clusters
+
+    def list_clusters(self, db: Session) -> List[Dict[str, Any]]:
+        clusters = db.query(ProblemCluster).order_by(ProblemCluster.size.desc()).all()
+        representative_ids = {
+            pid for cluster in clusters for pid, _ in (cluster.representatives or [])
+        }
+        titles = dict(
+            db.query(Problem.id, Problem.title).filter(Problem.id.in_(representative_ids)).all()
+        ) if representative_ids else {}
+
+        return [
+            {
+                "id": cluster.id,
+                "size": cluster.size,
+                "representative_titles": [
+                    titles[pid] for pid, _ in (cluster.representatives or []) if pid in titles
+                ],
+                "updated_at": cluster.updated_at
+            }
+            for cluster in clusters
+        ]
+
+
+problem_clusters = ProblemClusterService(
+    n_clusters=settings.PROBLEM_CLUSTER_COUNT,
+    recluster_fraction=settings.RECLUSTER_AFTER_FRACTION
+)
@@ -1,11 +1,19 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import asyncio
+from datetime import datetime
 from ..schemas.problem import Problem, ProblemMatch
 from ..schemas.team import Team
 import cohere
-from ..services.cohere_service import get_team_embedding, get_problem_recommendations, analyze_skill_gap
+from ..services.cohere_service import (
+    get_team_embeddings,
+    get_problem_embeddings,
+    get_problem_recommendations,
+    analyze_skill_gap
+)
+from ..services.llm_scheduler import Priority
 from ..core.config import settings
 
 # class ProblemMatcherService:
@@ -108,37 +116,139 @@ from ..core.config import settings
         
 #         return similarities
     
-def match_problems_to_team(team_profile: Dict, problems: List[Dict]) -> List[Dict]:
+def team_to_profile(team: Any) -> Dict:
+    """
+    Build the matching profile dict for a stored team
+    """
+    deadline_days = 30
+    if team.deadline:
+        deadline_days = max((team.deadline - datetime.utcnow()).days, 1)
+
+    return {
+        "size": team.team_size,
+        "experience": team.experience_level,
+        "skills": team.tech_skills,
+        "deadline": deadline_days
+    }
+
+
+def problem_to_details(problem: Any) -> Dict:
+    """
+    Build the matching problem dict for a stored problem
+    """
+    return {
+        "id": str(problem.id),
+        "description": problem.description,
+        "required_skills": problem.tech_stack
+    }
+
+
+async def match_problems_to_team(
+    team_profile: Dict,
+    problems: List[Dict],
+    priority: Priority = Priority.INTERACTIVE,
+    problem_embeddings: Optional[np.ndarray] = None
+) -> List[Dict]:
     """
     Match problems to team profile and generate recommendations
     """
-    co = cohere.Client(settings.COHERE_API_KEY)
-    
-    # Get team embedding
-    team_embedding = get_team_embedding(team_profile)
-    
-    # Get problem embeddings
-    problem_descriptions = [p['description'] for p in problems]
-    problem_embeddings = co.embed(texts=problem_descriptions).embeddings
-    
-    # Calculate similarities
-    similarities = cosine_similarity([team_embedding], problem_embeddings)[0]
-    
-    # Generate recommendations and create results
-    results = []
-    for i, (problem, similarity) in enumerate(zip(problems, similarities)):
-        recommendation = get_problem_recommendations(team_profile, problem, similarity)
-        skill_gap = analyze_skill_gap(team_profile, problem)
+    return (await match_problems_to_teams(
+        [team_profile], problems, priority=priority, problem_embeddings=problem_embeddings
+    ))[0]
+
+
+async def match_problems_to_teams(
+    team_profiles: List[Dict],
+    problems: List[Dict],
+    top_k: Optional[int] = None,
+    priority: Priority = Priority.INTERACTIVE,
+    problem_embeddings: Optional[np.ndarray] = None
+) -> List[List[Dict]]:
+    """
+    Match one problem set against several teams.
+    Problems and teams are each embedded once and scored together.
+    """
+    return [
+        matches async for matches in
+        iter_team_matches(team_profiles, problems, top_k, priority, problem_embeddings)
+    ]
+
+
+async def iter_team_matches(
+    team_profiles: List[Dict],
+    problems: List[Dict],
+    top_k: Optional[int] = None,
+    priority: Priority = Priority.INTERACTIVE,
+    problem_embeddings: Optional[np.ndarray] = None,
+    return_exceptions: bool = False
+) -> AsyncIterator[List[Dict]]:
+    """
+    Yield each team's ranked matches in the order the teams were given.
+    Pass `problem_embeddings` (one row per problem) to skip embedding the
+    problems, e.g. for stored problems with cached vectors. With
+    `return_exceptions`, a team whose ranking fails yields the exception
+    and the remaining teams are still ranked.
+    """
+    if not team_profiles:
+        return
+    if not problems:
+        for _ in team_profiles:
+            yield []
+        return
+
+    if problem_embeddings is None:
+        # One embedding call for all problems, one for all teams
+        problem_embeddings, team_embeddings = await asyncio.gather(
+            get_problem_embeddings(problems, priority),
+            get_team_embeddings(team_profiles, priority)
+        )
+    else:
+        team_embeddings = await get_team_embeddings(team_profiles, priority)
+    problem_embeddings = np.asarray(problem_embeddings)
+    team_embeddings = np.asarray(team_embeddings)
+
+    # Calculate similarities for every (team, problem) pair at once
+    similarities = cosine_similarity(team_embeddings, problem_embeddings)
+
+    for team_profile, team_similarities in zip(team_profiles, similarities):
+        try:
+            matches = await _rank_matches(team_profile, problems, team_similarities, top_k, priority)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            matches = e
+        yield matches
+
+
+async def _rank_matches(
+    team_profile: Dict,
+    problems: List[Dict],
+    similarities: np.ndarray,
+    top_k: Optional[int] = None,
+    priority: Priority = Priority.INTERACTIVE
+) -> List[Dict]:
+    """
+    Generate recommendations for a team's best problems, sorted by similarity
+    """
+    order = np.argsort(-similarities, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+
+    async def build_result(i: int) -> Dict:
+        problem = problems[i]
+        similarity = float(similarities[i])
+        recommendation, skill_gap = await asyncio.gather(
+            get_problem_recommendations(team_profile, problem, similarity, priority),
+            analyze_skill_gap(team_profile, problem, priority)
+        )
         
-        results.append({
+        return {
             'problem_id': problem['id'],
-            'similarity_score': float(similarity),
+            'similarity_score': similarity,
             'recommendation': recommendation,
             'skill_gap_analysis': skill_gap,
             'problem_details': problem
-        })
-    
-    # Sort by similarity score
-    results.sort(key=lambda x: x['similarity_score'], reverse=True)
+        }
     
-    return results
\ No newline at end of file
+    # The scheduler bounds how many of these reach the provider at once
+    return list(await asyncio.gather(*(build_result(i) for i in order)))
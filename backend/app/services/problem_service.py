@@ -0,0 +1,114 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.event import Event
+from ..models.problem import Problem
+from ..models.problem_cluster import ProblemCluster
+from ..schemas.problem import ProblemCreate, ProblemUpdate
+from .base import CRUDBase
+from .skill_analytics import skill_analytics
+from .catalog_partitions import partition_registry
+
+class ProblemService(CRUDBase[Problem, ProblemCreate, ProblemUpdate]):
+    def get_multi_by_ids(
+        self,
+        db: Session,
+        *,
+        ids: List[int]
+    ) -> List[Problem]:
+        if not ids:
+            return []
+        return db.query(Problem).filter(Problem.id.in_(ids)).all()
+
+    def get_by_source_file(self, db: Session, *, source_file: str, event_id: Optional[int]) -> List[Problem]:
+        """
+        Problems uploaded from `source_file` into one event's catalog (or,
+        for None, into no event); filenames repeat across events
+        """
+        same_event = Problem.event_id.is_(None) if event_id is None else Problem.event_id == event_id
+        return (
+            db.query(Problem)
+            .filter(Problem.source_file == source_file, same_event)
+            .order_by(Problem.id)
+            .all()
+        )
+
+    def bulk_create(
+        self,
+        db: Session,
+        *,
+        rows: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> Tuple[List[int], Set[int]]:
+        """
+        Insert many problems in a few statements, skipping rows whose
+        content_hash is already in the catalog (ON CONFLICT DO NOTHING).
+        Returns the id for every row in order, the existing problem's id for
+        skipped rows, and the set of ids actually inserted. Postgres gets
+        multi-row INSERT ... RETURNING; other databases an executemany
+        followed by an id query. The caller commits.
+        """
+        table = Problem.__table__
+        dialect = db.get_bind().dialect.name
+        ids: List[int] = []
+        inserted: Set[int] = set()
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            if dialect == "postgresql":
+                stmt = (
+                    postgresql.insert(table)
+                    .values(batch)
+                    .on_conflict_do_nothing(index_elements=[table.c.content_hash])
+                    .returning(table.c.id)
+                )
+                inserted.update(row[0] for row in db.execute(stmt))
+            else:
+                # The open write transaction keeps other writers out, so the
+                # new ids are exactly those above the previous maximum
+                last_id = db.query(func.max(Problem.id)).scalar() or 0
+                if dialect == "sqlite":
+                    stmt = sqlite.insert(table).on_conflict_do_nothing(index_elements=[table.c.content_hash])
+                else:
+                    stmt = insert(table)
+                db.execute(stmt, batch)
+                inserted.update(
+                    problem_id for (problem_id,) in db.query(Problem.id).filter(Problem.id > last_id)
+                )
+
+            by_hash = dict(
+                db.query(Problem.content_hash, Problem.id)
+                .filter(Problem.content_hash.in_({row["content_hash"] for row in batch}))
+            )
+            ids.extend(by_hash[row["content_hash"]] for row in batch)
+        return ids, inserted
+
+    def can_delete(self, db: Session, problem: Problem, user) -> bool:
+        """
+        Deleting a problem changes its event's catalog and the shared skill
+        and cluster counts: only the event's owner or an admin may do it
+        """
+        if user.email in settings.ADMIN_EMAILS:
+            return True
+        if problem.event_id is None:
+            return False
+        owner_id = db.query(Event.owner_id).filter(Event.id == problem.event_id).scalar()
+        return owner_id is not None and owner_id == user.id
+
+    def remove(self, db: Session, *, id: int) -> Optional[Problem]:
+        obj = db.query(Problem).get(id)
+        if obj is None:
+            return None
+        skill_analytics.record(db, [obj.tech_stack], sign=-1)
+        if obj.cluster_id is not None:
+            cluster = db.query(ProblemCluster).get(obj.cluster_id)
+            if cluster is not None and cluster.size > 0:
+                cluster.size -= 1
+        db.delete(obj)
+        db.commit()
+        if obj.event_id is not None:
+            partition_registry.invalidate(obj.event_id)
+        return obj
+
+problem_service = ProblemService(Problem)
@@ -0,0 +1,263 @@
+import csv
+import io
+import json
+import math
+import re
+import zipfile
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, List, Sequence
+from xml.sax.saxutils import escape
+
+# format -> (media type, file extension)
+ROW_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", ".csv"),
+    "ndjson": ("application/x-ndjson", ".ndjson"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx")
+}
+
+XLSX_MAX_CELL_CHARS = 32767
+_ILLEGAL_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+class ChunkSink:
+    """
+    Write-only file object collecting what a writer produced since the
+    last drain, so a file can be streamed out while it is being written
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _text(value: Any) -> str:
+    # Lists (tech stacks, skills) read back the way sheets are imported
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class CsvRowWriter:
+    def __init__(self, columns: Sequence[str], sheet_name: str = "Sheet1"):
+        self.columns = list(columns)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def begin(self) -> bytes:
+        self._writer.writerow(self.columns)
+        return self._drain()
+
+    def write(self, rows: Iterable[Sequence]) -> bytes:
+        self._writer.writerows(
+            ["" if value is None else _text(value) for value in row] for row in rows
+        )
+        return self._drain()
+
+    def end(self) -> bytes:
+        return b""
+
+
+class NdjsonRowWriter:
+    def __init__(self, columns: Sequence[str], sheet_name: str = "Sheet1"):
+        self.columns = list(columns)
+
+    def begin(self) -> bytes:
+        return b""
+
+    def write(self, rows: Iterable[Sequence]) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(self.columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+    def end(self) -> bytes:
+        return b""
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" state="frozen"/>'
+    '</sheetView></sheetViews>'
+    '<sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+
+def _xlsx_cell(value: Any, style: str = "") -> str:
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"{style}><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return f"<c{style}><v>{value!r}</v></c>"
+    text = _ILLEGAL_XML_CHARS.sub("", _text(value))[:XLSX_MAX_CELL_CHARS]
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c t="inlineStr"{style}><is><t{space}>{escape(text)}</t></is></c>'
+
+
+class XlsxRowWriter:
+    """
+    A one-sheet .xlsx written as a stream: the package is a zip written to
+    a non-seekable sink (entries end with data descriptors) and the
+    worksheet entry is deflated row by row, so nothing but the current
+    batch is held and the first bytes go out before any row is read.
+    Strings are stored inline rather than in a shared string table, which
+    would have to be complete before the sheet.
+    """
+
+    def __init__(self, columns: Sequence[str], sheet_name: str = "Sheet1"):
+        self.columns = list(columns)
+        self.sheet_name = _ILLEGAL_XML_CHARS.sub("", sheet_name)[:31] or "Sheet1"
+        self._sink = ChunkSink()
+        self._zip = None
+        self._sheet = None
+
+    def begin(self) -> bytes:
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+        self._zip.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        self._zip.writestr("_rels/.rels", _ROOT_RELS)
+        self._zip.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(self.sheet_name, {'"': "&quot;"})))
+        self._zip.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        self._zip.writestr("xl/styles.xml", _STYLES)
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", mode="w", force_zip64=True)
+        header = "".join(_xlsx_cell(column, ' s="1"') for column in self.columns)
+        self._sheet.write(f"{_SHEET_START}<row>{header}</row>".encode("utf-8"))
+        return self._sink.drain()
+
+    def write(self, rows: Iterable[Sequence]) -> bytes:
+        self._sheet.write("".join(
+            "<row>" + "".join(_xlsx_cell(value) for value in row) + "</row>" for row in rows
+        ).encode("utf-8"))
+        return self._sink.drain()
+
+    def end(self) -> bytes:
+        self._sheet.write(_SHEET_END.encode("utf-8"))
+        self._sheet.close()
+        self._zip.close()
+        return self._sink.drain()
+
+
+ROW_WRITERS = {
+    "csv": CsvRowWriter,
+    "ndjson": NdjsonRowWriter,
+    "xlsx": XlsxRowWriter
+}
+
+
+def row_writer(fmt: str, columns: Sequence[str], sheet_name: str = "Sheet1"):
+    """
+    An incremental writer for fmt: begin() returns the file's opening bytes,
+    write(rows) those of each batch of rows, end() the closing bytes
+    """
+    return ROW_WRITERS[fmt](columns, sheet_name)
+
+
+def encode_rows(
+    fmt: str,
+    columns: Sequence[str],
+    batches: Iterable[Sequence[Sequence]],
+    sheet_name: str = "Sheet1"
+) -> Iterator[bytes]:
+    """
+    Serialize batches of rows as CSV, NDJSON or .xlsx, yielding the bytes
+    of each batch as soon as it is encoded
+    """
+    writer = row_writer(fmt, columns, sheet_name)
+    yield writer.begin()
+    for rows in batches:
+        data = writer.write(rows)
+        if data:
+            yield data
+    yield writer.end()
@@ -0,0 +1,279 @@
+import posixpath
+import zipfile
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from xml.etree.ElementTree import iterparse, parse
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Optional Rust-based reader, faster still than the XML streaming below
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+try:
+    # Optional; only needed for Parquet and Arrow files
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+ARROW_AVAILABLE = pa is not None
+
+COLUMNAR_EXTENSIONS = (".parquet", ".arrow", ".feather")
+SUPPORTED_EXTENSIONS = (".xlsx", ".xls", ".csv") + COLUMNAR_EXTENSIONS
+
+# Called with a sheet's header; returns the columns to read (None for all)
+ColumnChooser = Callable[[List[str]], Optional[List[str]]]
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _xlsx_sheet_paths(archive: zipfile.ZipFile) -> Optional[Dict[str, str]]:
+    """
+    Sheet name -> worksheet XML path inside the archive, in workbook order.
+    None for workbooks this reader does not handle (e.g. strict OOXML).
+    """
+    workbook = parse(archive.open("xl/workbook.xml")).getroot()
+    if workbook.tag != f"{MAIN_NS}workbook":
+        return None
+    rels = parse(archive.open("xl/_rels/workbook.xml.rels")).getroot()
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{PACKAGE_REL_NS}Relationship")}
+    paths = {}
+    for sheet in workbook.iter(f"{MAIN_NS}sheet"):
+        target = targets.get(sheet.get(f"{REL_NS}id"))
+        if target is None:
+            continue
+        paths[sheet.get("name")] = (
+            target.lstrip("/") if target.startswith("/") else posixpath.normpath(f"xl/{target}")
+        )
+    return paths
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    try:
+        source = archive.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    strings = []
+    with source:
+        for _, element in iterparse(source):
+            if element.tag == f"{MAIN_NS}si":
+                # Rich text is split over several runs
+                strings.append("".join(t.text or "" for t in element.iter(f"{MAIN_NS}t")))
+                element.clear()
+    return strings
+
+
+_column_indexes: Dict[str, int] = {}
+
+
+def _column_index(ref: str) -> int:
+    letters = ref.rstrip("0123456789")
+    index = _column_indexes.get(letters)
+    if index is None:
+        index = -1
+        for char in letters:
+            index = (index + 1) * 26 + ord(char) - 65
+        _column_indexes[letters] = index
+    return index
+
+
+def _xlsx_rows(archive: zipfile.ZipFile, sheet_path: str) -> Iterator[List]:
+    """
+    Stream a worksheet's rows as lists of cell values, without building a
+    cell object per value. Strings and numbers come back as they are stored;
+    dates stay Excel serial numbers, which problem text never needs.
+    """
+    shared = _shared_strings(archive)
+    cell_tag, row_tag, value_tag = f"{MAIN_NS}c", f"{MAIN_NS}row", f"{MAIN_NS}v"
+    with archive.open(sheet_path) as source:
+        row: List = []
+        for _, element in iterparse(source):
+            tag = element.tag
+            if tag == cell_tag:
+                kind = element.get("t")
+                value_element = element.find(value_tag)
+                if kind == "s":
+                    value = shared[int(value_element.text)]
+                elif kind == "inlineStr":
+                    value = "".join(t.text or "" for t in element.iter(f"{MAIN_NS}t"))
+                elif value_element is None or value_element.text is None:
+                    value = None
+                elif kind in ("str", "e"):
+                    value = value_element.text
+                elif kind == "b":
+                    value = value_element.text == "1"
+                else:
+                    number = float(value_element.text)
+                    value = int(number) if number.is_integer() else number
+                ref = element.get("r")
+                if ref:
+                    # Empty cells are left out of the XML
+                    row.extend([None] * (_column_index(ref) - len(row)))
+                row.append(value)
+                element.clear()
+            elif tag == row_tag:
+                yield row
+                row = []
+                element.clear()
+
+
+def _arrow_batches(
+    file_path: str,
+    ext: str,
+    chunk_rows: int,
+    choose_columns: Optional[ColumnChooser] = None
+) -> Iterator:
+    """
+    Record batches of a Parquet or Arrow IPC (file or stream) file, read
+    from a memory map so Arrow IPC data is never copied before conversion.
+    Columns left out by choose_columns are never decoded (Parquet) or
+    converted (Arrow).
+    """
+    if ext == ".parquet":
+        parquet_file = pq.ParquetFile(file_path, memory_map=True)
+        usecols = choose_columns(parquet_file.schema_arrow.names) if choose_columns else None
+        yield from parquet_file.iter_batches(batch_size=chunk_rows, columns=usecols)
+        return
+    source = pa.memory_map(file_path)
+    try:
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        source.seek(0)
+        reader = batches = pa.ipc.open_stream(source)
+    usecols = choose_columns(reader.schema.names) if choose_columns else None
+    if usecols is not None:
+        indices = [reader.schema.get_field_index(name) for name in usecols]
+    for batch in batches:
+        if usecols is not None:
+            batch = pa.RecordBatch.from_arrays([batch.column(i) for i in indices], names=usecols)
+        # Slicing is zero-copy, and keeps frames at chunk size
+        for offset in range(0, batch.num_rows, chunk_rows):
+            yield batch.slice(offset, chunk_rows)
+
+
+def _batch_to_frame(batch) -> pd.DataFrame:
+    columns = []
+    for column, field in zip(batch.columns, batch.schema):
+        if pa.types.is_list(field.type) or pa.types.is_large_list(field.type):
+            # Native list columns (e.g. a tech stack) become the comma
+            # separated text the extraction expects from sheets
+            column = pc.binary_join(column.cast(pa.list_(pa.string())), ", ")
+        columns.append(column)
+    return pa.Table.from_arrays(columns, names=batch.schema.names).to_pandas()
+
+
+def sheet_names(file_path: str, ext: str) -> List[Optional[str]]:
+    """
+    Sheets of a workbook in order; [None] for a CSV or columnar file,
+    which has just one
+    """
+    if ext == ".csv" or ext in COLUMNAR_EXTENSIONS:
+        return [None]
+    if CalamineWorkbook is not None:
+        return list(CalamineWorkbook.from_path(file_path).sheet_names)
+    if ext == ".xlsx":
+        with zipfile.ZipFile(file_path) as archive:
+            paths = _xlsx_sheet_paths(archive)
+        if paths is not None:
+            return list(paths)
+    return list(pd.ExcelFile(file_path).sheet_names)
+
+
+def _header(row: Sequence) -> List[str]:
+    names = []
+    for i, value in enumerate(row):
+        name = str(value).strip() if value is not None and str(value).strip() else f"column_{i}"
+        # Repeated headers would collapse into one DataFrame column
+        while name in names:
+            name = f"{name}_{i}"
+        names.append(name)
+    return names
+
+
+def _frames_from_rows(
+    rows: Iterable[Sequence],
+    chunk_rows: int,
+    choose_columns: Optional[ColumnChooser] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Turn a row iterator (header first) into DataFrames of chunk_rows rows,
+    so a sheet is never held as one frame. Blank leading rows are skipped,
+    and only the columns choose_columns picks are kept.
+    """
+    rows = iter(rows)
+    for row in rows:
+        if any(value not in (None, "") for value in row):
+            columns = _header(row)
+            break
+    else:
+        return
+
+    usecols = choose_columns(columns) if choose_columns else None
+    if usecols is not None:
+        indices = [columns.index(name) for name in usecols]
+        rows = (tuple(row[i] if i < len(row) else None for i in indices) for row in rows)
+        columns = usecols
+
+    width = len(columns)
+    while True:
+        chunk = [
+            tuple(row[:width]) + (None,) * (width - len(row))
+            for row in islice(rows, chunk_rows)
+        ]
+        if not chunk:
+            return
+        yield pd.DataFrame.from_records(chunk, columns=columns)
+
+
+def iter_sheet_frames(
+    file_path: str,
+    ext: str,
+    sheet: Optional[str],
+    chunk_rows: int,
+    choose_columns: Optional[ColumnChooser] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Read one sheet (or a CSV, Parquet or Arrow file) as DataFrames of at
+    most chunk_rows rows. Excel sheets are streamed row by row: with
+    calamine when it is installed, otherwise .xlsx worksheet XML is parsed
+    incrementally. Only workbooks neither handles (legacy .xls, strict
+    OOXML) go through pd.read_excel whole.
+
+    choose_columns is called once with the header, before any data is
+    read, and can narrow the frames to the columns it returns.
+    """
+    if ext == ".csv":
+        usecols = choose_columns(list(pd.read_csv(file_path, nrows=0).columns)) if choose_columns else None
+        yield from pd.read_csv(file_path, chunksize=chunk_rows, usecols=usecols)
+        return
+    if ext in COLUMNAR_EXTENSIONS:
+        if pa is None:
+            raise RuntimeError("Parquet and Arrow files need the pyarrow package (pip install pyarrow)")
+        for batch in _arrow_batches(file_path, ext, chunk_rows, choose_columns):
+            yield _batch_to_frame(batch)
+        return
+    if CalamineWorkbook is not None:
+        # iter_rows() converts one row at a time, unlike to_python()
+        rows = CalamineWorkbook.from_path(file_path).get_sheet_by_name(sheet).iter_rows()
+        yield from _frames_from_rows(rows, chunk_rows, choose_columns)
+        return
+    if ext == ".xlsx":
+        with zipfile.ZipFile(file_path) as archive:
+            paths = _xlsx_sheet_paths(archive)
+            if paths is not None:
+                yield from _frames_from_rows(_xlsx_rows(archive, paths[sheet]), chunk_rows, choose_columns)
+                return
+    df = pd.read_excel(file_path, sheet_name=sheet)
+    usecols = choose_columns([str(col) for col in df.columns]) if choose_columns else None
+    if usecols is not None:
+        df.columns = [str(col) for col in df.columns]
+        df = df[usecols]
+    yield df
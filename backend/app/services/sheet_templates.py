@@ -0,0 +1,169 @@
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.exceptions import TemplateError
+from ..models.sheet_template import SheetTemplate
+from ..schemas.sheet_template import SheetTemplateCreate, SheetTemplateUpdate
+from .base import CRUDBase
+import logging
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_ROLES = ("problem_column", "tech_stack_column", "title_column")
+
+
+def column_key(col) -> str:
+    # "Tech Stack", "tech_stack" and "TECH STACK" name the same column
+    return str(col).lower().replace('_', ' ').strip()
+
+
+def header_fingerprint(header: Sequence) -> str:
+    """
+    Identity of a sheet layout: its normalized column names, in order
+    """
+    return hashlib.sha256("\x1f".join(column_key(col) for col in header).encode("utf-8")).hexdigest()
+
+
+class SheetTemplateService(CRUDBase[SheetTemplate, SheetTemplateCreate, SheetTemplateUpdate]):
+    """
+    Known sheet layouts and the columns resolved for them. A sheet whose
+    header matches a template skips column detection, and only its problem,
+    tech stack and title columns are read. Layouts are learned from
+    successful ingests; manual templates (created or edited through the
+    API) are never overwritten by learning.
+    """
+
+    def get_by_fingerprint(self, db: Session, *, fingerprint: str) -> Optional[SheetTemplate]:
+        return db.query(SheetTemplate).filter(SheetTemplate.fingerprint == fingerprint).first()
+
+    def create(self, db: Session, *, obj_in: SheetTemplateCreate, owner_id: Optional[int] = None) -> SheetTemplate:
+        columns = [column_key(col) for col in obj_in.columns]
+        roles = self._check_roles(columns, obj_in.dict(include=set(TEMPLATE_ROLES)))
+        db_obj = SheetTemplate(
+            fingerprint=header_fingerprint(columns),
+            name=obj_in.name,
+            columns=columns,
+            source="manual",
+            uses=0,
+            owner_id=owner_id,
+            **roles
+        )
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def update(self, db: Session, *, db_obj: SheetTemplate, obj_in: SheetTemplateUpdate) -> SheetTemplate:
+        update_data = obj_in.dict(exclude_unset=True)
+        roles = {role: getattr(db_obj, role) for role in TEMPLATE_ROLES}
+        roles.update({role: update_data[role] for role in TEMPLATE_ROLES if role in update_data})
+        update_data.update(self._check_roles(db_obj.columns, roles))
+        # An edited layout is curated from now on
+        update_data["source"] = "manual"
+        return super().update(db, db_obj=db_obj, obj_in=update_data)
+
+    def _check_roles(self, columns: List[str], roles: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+        """
+        Normalize the role columns and make sure they are in the layout
+        """
+        checked = {}
+        for role in TEMPLATE_ROLES:
+            value = roles.get(role)
+            if value is None or not str(value).strip():
+                if role == "problem_column":
+                    raise TemplateError("problem_column is required")
+                checked[role] = None
+                continue
+            key = column_key(value)
+            if key not in columns:
+                raise TemplateError(f"{role} '{value}' is not one of the template's columns")
+            checked[role] = key
+        return checked
+
+    def snapshot(self, db: Session) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        fingerprint -> resolved columns for every template, as plain dicts
+        that can be handed to parse pool workers
+        """
+        rows = db.query(
+            SheetTemplate.fingerprint,
+            SheetTemplate.problem_column,
+            SheetTemplate.tech_stack_column,
+            SheetTemplate.title_column
+        ).all()
+        return {row[0]: dict(zip(TEMPLATE_ROLES, row[1:])) for row in rows}
+
+    def learn(self, db: Session, layouts: List[Dict]) -> None:
+        """
+        Record the layouts of an ingested file's sheets: known ones count a
+        use, new ones become learned templates. Layouts whose problem column
+        was only guessed from the content are not learned, so a wrong guess
+        is detected afresh next time instead of becoming permanent.
+        """
+        layouts = [layout for layout in layouts if layout.get("header_match")]
+        if not layouts:
+            return
+        now = datetime.utcnow()
+        existing = {
+            template.fingerprint: template
+            for template in db.query(SheetTemplate).filter(
+                SheetTemplate.fingerprint.in_({layout["fingerprint"] for layout in layouts})
+            )
+        }
+        learned = []
+        for layout in layouts:
+            template = existing.get(layout["fingerprint"])
+            if template is None:
+                template = SheetTemplate(
+                    fingerprint=layout["fingerprint"],
+                    columns=layout["columns"],
+                    source="learned",
+                    uses=0,
+                    created_at=now,
+                    **{role: layout[role] for role in TEMPLATE_ROLES}
+                )
+                db.add(template)
+                existing[layout["fingerprint"]] = template
+                learned.append(template)
+            template.uses = (template.uses or 0) + 1
+            template.last_used_at = now
+        try:
+            db.commit()
+        except IntegrityError:
+            # The same layout was learned concurrently; it is counted next time
+            db.rollback()
+            logger.info("Sheet layout was already learned")
+            return
+        if learned:
+            logger.info(f"Learned {len(learned)} new sheet layouts")
+
+    def can_edit(self, template: SheetTemplate, user) -> bool:
+        """
+        Templates apply to everyone's uploads: only their creator or an
+        admin may change them
+        """
+        return user.email in settings.ADMIN_EMAILS or (
+            template.owner_id is not None and template.owner_id == user.id
+        )
+
+    def resolve(self, header: Sequence, template: Optional[Dict[str, Optional[str]]]) -> Optional[Dict[str, Optional[str]]]:
+        """
+        A template's columns as named in this header, or None if the
+        template does not apply
+        """
+        if template is None:
+            return None
+        names: Dict[str, str] = {}
+        for col in header:
+            # The first of two columns with the same key wins, as in detection
+            names.setdefault(column_key(col), col)
+        resolved = {role: names.get(template[role]) if template[role] else None for role in TEMPLATE_ROLES}
+        if resolved["problem_column"] is None:
+            return None
+        return resolved
+
+
+sheet_template_service = SheetTemplateService(SheetTemplate)
@@ -0,0 +1,199 @@
+from collections import Counter
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Sequence
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from ..models.problem import Problem
+from ..models.skill_stats import SkillCount, SkillPair, CatalogStat
+from .skill_taxonomy import skill_taxonomy
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOTAL_PROBLEMS = "total_problems"
+TOTAL_SKILL_MENTIONS = "total_skill_mentions"
+
+
+class SkillAnalytics:
+    """
+    Incrementally maintained skill demand counters for the problem catalog.
+
+    Counts are adjusted whenever problems are stored, merged or deleted, so
+    reads cost the same no matter how large the catalog is.
+    """
+
+    def record(self, db: Session, tech_stacks: Iterable[Sequence[str]], sign: int = 1) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) problems' tech stacks from the
+        counters. The caller commits, so counters change with the problems.
+        """
+        skill_deltas: Counter = Counter()
+        pair_deltas: Counter = Counter()
+        problems = 0
+        for stack in tech_stacks:
+            skills = sorted({skill for skill in (stack or []) if skill})
+            problems += 1
+            skill_deltas.update(skills)
+            pair_deltas.update(combinations(skills, 2))
+
+        if not problems:
+            return
+
+        self._apply_counts(db, skill_deltas, sign)
+        self._apply_pairs(db, pair_deltas, sign)
+        self._apply_stat(db, TOTAL_PROBLEMS, sign * problems)
+        self._apply_stat(db, TOTAL_SKILL_MENTIONS, sign * sum(skill_deltas.values()))
+
+    def _insert(self, db: Session):
+        return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+    def _upsert(self, db: Session, table, keys: Sequence[str], column: str, rows: List[Dict]) -> None:
+        """
+        Add each row's `column` onto the stored row with the same keys, or
+        insert it, in one INSERT ... ON CONFLICT DO UPDATE per batch. The
+        database does the addition, so concurrent uploads never lose an
+        increment or race to insert the same new key. Rows are sent in key
+        order, so concurrent transactions lock them in the same order.
+        """
+        if not rows:
+            return
+        insert = self._insert(db)
+        rows = sorted(rows, key=lambda row: tuple(row[key] for key in keys))
+        for i in range(0, len(rows), 1000):
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c[key] for key in keys],
+                set_={column: table.c[column] + stmt.excluded[column]}
+            )
+            db.execute(stmt, rows[i:i + 1000])
+
+    def _apply_counts(self, db: Session, deltas: Counter, sign: int) -> None:
+        self._upsert(
+            db, SkillCount.__table__, ["skill"], "problem_count",
+            [{"skill": skill, "problem_count": sign * delta} for skill, delta in deltas.items()]
+        )
+        if sign < 0:
+            db.query(SkillCount).filter(SkillCount.problem_count <= 0).delete(synchronize_session=False)
+
+    def _apply_pairs(self, db: Session, deltas: Counter, sign: int) -> None:
+        self._upsert(
+            db, SkillPair.__table__, ["skill_a", "skill_b"], "problem_count",
+            [
+                {"skill_a": skill_a, "skill_b": skill_b, "problem_count": sign * delta}
+                for (skill_a, skill_b), delta in deltas.items()
+            ]
+        )
+        if sign < 0:
+            db.query(SkillPair).filter(SkillPair.problem_count <= 0).delete(synchronize_session=False)
+
+    def _apply_stat(self, db: Session, key: str, delta: int) -> None:
+        table = CatalogStat.__table__
+        total = table.c.value + delta
+        db.execute(
+            self._insert(db)(table)
+            .values(key=key, value=max(delta, 0))
+            .on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={"value": case((total < 0, 0), else_=total)}
+            )
+        )
+
+    def _stat(self, db: Session, key: str) -> int:
+        row = db.query(CatalogStat).get(key)
+        return row.value if row else 0
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> int:
+        """
+        Recompute every counter from the stored problems. Returns the number
+        of problems counted.
+        """
+        db.query(SkillPair).delete(synchronize_session=False)
+        db.query(SkillCount).delete(synchronize_session=False)
+        db.query(CatalogStat).filter(
+            CatalogStat.key.in_([TOTAL_PROBLEMS, TOTAL_SKILL_MENTIONS])
+        ).delete(synchronize_session=False)
+        db.flush()
+
+        counted = 0
+        last_id = 0
+        while True:
+            rows = (
+                db.query(Problem.id, Problem.tech_stack)
+                .filter(Problem.id > last_id)
+                .order_by(Problem.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            self.record(db, [row.tech_stack for row in rows])
+            counted += len(rows)
+            last_id = rows[-1].id
+
+        db.commit()
+        logger.info(f"Rebuilt skill counters from {counted} problems")
+        return counted
+
+    def skill_demand(self, db: Session, limit: int = 20, pair_limit: int = 20) -> Dict[str, Any]:
+        total = self._stat(db, TOTAL_PROBLEMS)
+        skills = (
+            db.query(SkillCount)
+            .order_by(SkillCount.problem_count.desc(), SkillCount.skill)
+            .limit(limit)
+            .all()
+        )
+        pairs = (
+            db.query(SkillPair)
+            .order_by(SkillPair.problem_count.desc(), SkillPair.skill_a, SkillPair.skill_b)
+            .limit(pair_limit)
+            .all()
+        )
+        return {
+            "total_problems": total,
+            "skills": [
+                {
+                    "skill": row.skill,
+                    "problem_count": row.problem_count,
+                    "share": round(row.problem_count / total, 4) if total else 0.0
+                }
+                for row in skills
+            ],
+            "co_occurrence": [
+                {"skill_a": row.skill_a, "skill_b": row.skill_b, "problem_count": row.problem_count}
+                for row in pairs
+            ]
+        }
+
+    def team_coverage(self, db: Session, team_skills: Sequence[str], missing_limit: int = 10) -> Dict[str, Any]:
+        """
+        How much of the catalog's skill demand a team's skills cover
+        """
+        skills = skill_taxonomy.resolve_many(team_skills)
+        counts = dict(
+            db.query(SkillCount.skill, SkillCount.problem_count)
+            .filter(SkillCount.skill.in_(skills))
+            .all()
+        ) if skills else {}
+        total_mentions = self._stat(db, TOTAL_SKILL_MENTIONS)
+        covered = sum(counts.values())
+
+        top_missing_query = db.query(SkillCount).order_by(SkillCount.problem_count.desc(), SkillCount.skill)
+        if skills:
+            top_missing_query = top_missing_query.filter(SkillCount.skill.notin_(skills))
+
+        return {
+            "total_problems": self._stat(db, TOTAL_PROBLEMS),
+            "coverage": round(covered / total_mentions, 4) if total_mentions else 0.0,
+            "skills": [
+                {"skill": skill, "problem_count": counts.get(skill, 0)}
+                for skill in skills
+            ],
+            "top_missing_skills": [
+                {"skill": row.skill, "problem_count": row.problem_count}
+                for row in top_missing_query.limit(missing_limit).all()
+            ]
+        }
+
+
+skill_analytics = SkillAnalytics()
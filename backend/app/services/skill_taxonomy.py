@@ -0,0 +1,233 @@
+import re
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Iterable, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Canonical skill name -> known synonyms / spellings
+CANONICAL_SKILLS: Dict[str, List[str]] = {
+    "Python": ["py", "python3"],
+    "JavaScript": ["js", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": ["ts"],
+    "Java": [],
+    "C": [],
+    "C++": ["cpp", "cplusplus"],
+    "C#": ["csharp", "c sharp"],
+    "Go": ["golang"],
+    "Rust": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Dart": [],
+    "PHP": [],
+    "Ruby": [],
+    "R": [],
+    "Solidity": [],
+    "React": ["reactjs", "react.js", "react js"],
+    "React Native": ["reactnative", "react-native", "rn"],
+    "Angular": ["angularjs", "angular.js"],
+    "Vue": ["vuejs", "vue.js"],
+    "Next.js": ["nextjs", "next"],
+    "Svelte": ["sveltejs"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "Tailwind CSS": ["tailwind", "tailwindcss"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "Express": ["expressjs", "express.js"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": ["fast api"],
+    "Spring Boot": ["spring", "springboot"],
+    "Ruby on Rails": ["rails", "ror"],
+    "Flutter": [],
+    "Android": ["android sdk"],
+    "iOS": ["ios sdk"],
+    "PostgreSQL": ["postgres", "psql", "pgsql"],
+    "MySQL": [],
+    "SQLite": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Firebase": [],
+    "SQL": [],
+    "GraphQL": [],
+    "REST API": ["rest", "restful", "rest apis", "restful api"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Git": ["github", "gitlab"],
+    "Linux": [],
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["dl"],
+    "Artificial Intelligence": ["ai"],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": ["cv", "opencv"],
+    "Data Science": [],
+    "Data Analysis": ["data analytics"],
+    "TensorFlow": ["tf"],
+    "PyTorch": ["torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": [],
+    "LLM": ["llms", "large language models", "generative ai", "genai"],
+    "Blockchain": ["web3"],
+    "IoT": ["internet of things"],
+    "Arduino": [],
+    "Raspberry Pi": ["raspberrypi", "rpi"],
+    "Cybersecurity": ["security", "infosec", "cyber security"],
+    "UI/UX": ["ui", "ux", "ui ux", "figma"],
+    "Unity": ["unity3d"],
+    "AR/VR": ["ar", "vr", "augmented reality", "virtual reality"],
+}
+
+
+def normalize_skill(skill: str) -> str:
+    """
+    Normalize a skill string into a lookup key
+    """
+    key = str(skill).strip().lower()
+    # "React.js", "react-js" and "React JS" should all collapse together
+    key = re.sub(r"[\s._\-/]+", "", key)
+    return key
+
+
+class SkillTaxonomy:
+    def __init__(
+        self,
+        skills: Dict[str, List[str]] = CANONICAL_SKILLS,
+        ngram_size: int = 3,
+        fuzzy_threshold: float = 0.85,
+        min_length_ratio: float = 0.8,
+        cache_size: int = 10000
+    ):
+        self.ngram_size = ngram_size
+        self.fuzzy_threshold = fuzzy_threshold
+        self.min_length_ratio = min_length_ratio
+        self.cache_size = cache_size
+
+        # Exact lookup: normalized key -> canonical name
+        self.aliases: Dict[str, str] = {}
+        # Fuzzy lookup: character n-gram -> normalized keys containing it
+        self.ngram_index: Dict[str, Set[str]] = defaultdict(set)
+        self.key_ngrams: Dict[str, Set[str]] = {}
+        # Normalized key -> canonical name, for keys the taxonomy resolved;
+        # least recently used keys are dropped beyond cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+        for canonical, synonyms in skills.items():
+            self.add_skill(canonical, synonyms)
+
+    def add_skill(self, canonical: str, synonyms: Iterable[str] = ()) -> None:
+        """
+        Register a canonical skill and its synonyms
+        """
+        for name in [canonical, *synonyms]:
+            key = normalize_skill(name)
+            if not key:
+                continue
+            self.aliases[key] = canonical
+            grams = self._ngrams(key)
+            self.key_ngrams[key] = grams
+            for gram in grams:
+                self.ngram_index[gram].add(key)
+        self._cache.clear()
+
+    def _ngrams(self, key: str) -> Set[str]:
+        padded = f"^{key}$"
+        if len(padded) <= self.ngram_size:
+            return {padded}
+        return {
+            padded[i:i + self.ngram_size]
+            for i in range(len(padded) - self.ngram_size + 1)
+        }
+
+    def _fuzzy_lookup(self, key: str) -> Optional[str]:
+        """
+        Find the closest known key by n-gram Dice similarity. Keys of quite
+        different length, and keys the input merely extends ("Reactor",
+        "Tensorflow.js"), are never matched: those are other technologies.
+        """
+        grams = self._ngrams(key)
+        overlap: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self.ngram_index.get(gram, ()):
+                overlap[candidate] += 1
+
+        best_key = None
+        best_score = 0.0
+        for candidate, shared in overlap.items():
+            if key.startswith(candidate) or min(len(key), len(candidate)) < self.min_length_ratio * max(len(key), len(candidate)):
+                continue
+            score = 2 * shared / (len(grams) + len(self.key_ngrams[candidate]))
+            if score > best_score:
+                best_score = score
+                best_key = candidate
+
+        if best_key is not None and best_score >= self.fuzzy_threshold:
+            return self.aliases[best_key]
+        return None
+
+    def resolve(self, skill: str) -> str:
+        """
+        Resolve a raw skill string to its canonical name.
+        Unknown skills are returned cleaned up but otherwise unchanged.
+        """
+        raw = str(skill).strip()
+        key = normalize_skill(raw)
+        if not key:
+            return raw
+
+        canonical = self._cache.get(key)
+        if canonical is not None:
+            self._cache.move_to_end(key)
+            return canonical
+
+        canonical = self.aliases.get(key)
+        # Very short keys ("c", "r", "go") are too ambiguous for fuzzy matching
+        if canonical is None and len(key) > 3:
+            canonical = self._fuzzy_lookup(key)
+        if canonical is None:
+            # Not cached, so another spelling of an unknown skill keeps its own
+            return raw
+
+        self._cache[key] = canonical
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return canonical
+
+    def resolve_many(self, skills: Iterable[str]) -> List[str]:
+        """
+        Resolve a list of skills, dropping duplicates while keeping order
+        """
+        resolved = []
+        seen = set()
+        for skill in skills or []:
+            canonical = self.resolve(skill)
+            if canonical and canonical.lower() not in seen:
+                seen.add(canonical.lower())
+                resolved.append(canonical)
+        return resolved
+
+    def missing_skills(self, team_skills: Iterable[str], required_skills: Iterable[str]) -> List[str]:
+        """
+        Required skills the team does not cover, compared on canonical names
+        """
+        team = {skill.lower() for skill in self.resolve_many(team_skills)}
+        return [
+            skill for skill in self.resolve_many(required_skills)
+            if skill.lower() not in team
+        ]
+
+    def matched_skills(self, team_skills: Iterable[str], required_skills: Iterable[str]) -> List[str]:
+        """
+        Required skills the team already covers, compared on canonical names
+        """
+        team = {skill.lower() for skill in self.resolve_many(team_skills)}
+        return [
+            skill for skill in self.resolve_many(required_skills)
+            if skill.lower() in team
+        ]
+
+
+skill_taxonomy = SkillTaxonomy()
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.team import Team
+from .skill_taxonomy import skill_taxonomy
+import logging
+
+logger = logging.getLogger(__name__)
+
+SKILL_DIMENSIONS = 128
+EXPERIENCE_LEVELS = {
+    "beginner": 0.0,
+    "intermediate": 0.5,
+    "advanced": 0.8,
+    "expert": 1.0
+}
+EXPERIENCE_WEIGHT = 0.35
+SIZE_WEIGHT = 0.25
+MAX_TEAM_SIZE = 10
+
+
+def _skill_bucket(skill: str) -> int:
+    digest = hashlib.blake2b(skill.lower().encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "little") % SKILL_DIMENSIONS
+
+
+def team_vector(tech_skills: List[str], experience_level: str, team_size: int) -> np.ndarray:
+    """
+    Profile vector for a team: canonical skills hashed into a fixed number of
+    dimensions, plus experience and size features. Unit length.
+    """
+    vector = np.zeros(SKILL_DIMENSIONS + 2, dtype=np.float32)
+    skills = skill_taxonomy.resolve_many(tech_skills or [])
+    for skill in skills:
+        vector[_skill_bucket(skill)] += 1.0
+    if skills:
+        vector[:SKILL_DIMENSIONS] /= np.linalg.norm(vector[:SKILL_DIMENSIONS])
+
+    experience = EXPERIENCE_LEVELS.get(str(experience_level).strip().lower(), 0.5)
+    vector[SKILL_DIMENSIONS] = EXPERIENCE_WEIGHT * experience
+    vector[SKILL_DIMENSIONS + 1] = SIZE_WEIGHT * min(team_size or 0, MAX_TEAM_SIZE) / MAX_TEAM_SIZE
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class TeamIndex:
+    """
+    In-memory nearest-neighbour index over team profile vectors.
+
+    Loaded from the database on first use, then kept current by team_service
+    on create, update and delete. Reloaded after `refresh_seconds` so other
+    workers' changes show up too.
+    """
+
+    def __init__(self, refresh_seconds: float = 300.0):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((0, SKILL_DIMENSIONS + 2), dtype=np.float32)
+        self._ids: List[int] = []
+        self._owners: List[int] = []
+        self._rows: Dict[int, int] = {}
+        self._loaded_at: Optional[float] = None
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+
+        teams = db.query(Team.id, Team.owner_id, Team.tech_skills, Team.experience_level, Team.team_size).all()
+        vectors = [team_vector(t.tech_skills, t.experience_level, t.team_size) for t in teams]
+        with self._lock:
+            self._matrix = np.vstack(vectors) if vectors else np.zeros((0, SKILL_DIMENSIONS + 2), dtype=np.float32)
+            self._ids = [t.id for t in teams]
+            self._owners = [t.owner_id for t in teams]
+            self._rows = {team_id: row for row, team_id in enumerate(self._ids)}
+            self._loaded_at = time.monotonic()
+        logger.info(f"Loaded team index with {len(self._ids)} teams")
+
+    def upsert(self, team: Team) -> None:
+        if self._loaded_at is None:
+            return  # built from the database on first lookup anyway
+        vector = team_vector(team.tech_skills, team.experience_level, team.team_size)
+        with self._lock:
+            row = self._rows.get(team.id)
+            if row is None:
+                self._matrix = np.vstack([self._matrix, vector])
+                self._ids.append(team.id)
+                self._owners.append(team.owner_id)
+                self._rows[team.id] = len(self._ids) - 1
+            else:
+                self._matrix[row] = vector
+                self._owners[row] = team.owner_id
+
+    def remove(self, team_id: int) -> None:
+        with self._lock:
+            row = self._rows.pop(team_id, None)
+            if row is None:
+                return
+            # Move the last row into the gap so removal stays O(dimensions)
+            last = len(self._ids) - 1
+            if row != last:
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = self._ids[last]
+                self._owners[row] = self._owners[last]
+                self._rows[self._ids[row]] = row
+            self._matrix = self._matrix[:last]
+            self._ids.pop()
+            self._owners.pop()
+
+    def similar(self, db: Session, team: Team, k: int = 5) -> List[Tuple[int, float]]:
+        """
+        The k teams with the most similar profiles, among teams with the same owner
+        """
+        self._ensure_loaded(db)
+        query = team_vector(team.tech_skills, team.experience_level, team.team_size)
+        with self._lock:
+            if not self._ids:
+                return []
+            scores = self._matrix @ query
+            owners = np.asarray(self._owners)
+            ids = np.asarray(self._ids)
+
+        candidates = np.where((owners == team.owner_id) & (ids != team.id))[0]
+        if not len(candidates):
+            return []
+        k = min(k, len(candidates))
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+team_index = TeamIndex(refresh_seconds=settings.TEAM_INDEX_REFRESH_SECONDS)
@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from ..models.team import Team
 from ..schemas.team import TeamCreate, TeamUpdate
 from .base import CRUDBase
+from .team_index import team_index
 
 class TeamService(CRUDBase[Team, TeamCreate, TeamUpdate]):
     def get_by_owner(
@@ -30,6 +31,16 @@ class TeamService(CRUDBase[Team, TeamCreate, TeamUpdate]):
             .all()
         )
 
+    def get_multi_by_ids(
+        self,
+        db: Session,
+        *,
+        ids: List[int]
+    ) -> List[Team]:
+        if not ids:
+            return []
+        return db.query(Team).filter(Team.id.in_(ids)).all()
+
     def create_with_owner(
         self,
         db: Session,
@@ -42,6 +53,23 @@ class TeamService(CRUDBase[Team, TeamCreate, TeamUpdate]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        team_index.upsert(db_obj)
         return db_obj
 
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Team,
+        obj_in: Union[TeamUpdate, Dict[str, Any]]
+    ) -> Team:
+        team = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        team_index.upsert(team)
+        return team
+
+    def remove(self, db: Session, *, id: int) -> Team:
+        team = super().remove(db, id=id)
+        team_index.remove(id)
+        return team
+
 team_service = TeamService(Team)
\ No newline at end of file
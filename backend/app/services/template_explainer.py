@@ -0,0 +1,89 @@
+from typing import Dict, List
+from .skill_taxonomy import skill_taxonomy
+
+# Rough build-time expectations by experience level, in days
+EXPERIENCE_PACE = {
+    "beginner": 1.5,
+    "intermediate": 1.0,
+    "advanced": 0.75,
+    "expert": 0.6
+}
+
+
+def _join(skills: List[str]) -> str:
+    if not skills:
+        return "none"
+    if len(skills) == 1:
+        return skills[0]
+    return f"{', '.join(skills[:-1])} and {skills[-1]}"
+
+
+def _match_strength(similarity_score: float) -> str:
+    if similarity_score >= 0.6:
+        return "a strong"
+    if similarity_score >= 0.4:
+        return "a good"
+    if similarity_score >= 0.25:
+        return "a moderate"
+    return "a weak"
+
+
+def _required_skills(problem: Dict) -> List[str]:
+    # Canonical and deduplicated, so both texts count the same skills
+    return skill_taxonomy.resolve_many(problem.get('required_skills') or [])
+
+
+def template_recommendation(team_profile: Dict, problem: Dict, similarity_score: float) -> str:
+    """
+    Build a recommendation without calling the LLM
+    """
+    required = _required_skills(problem)
+    matched = skill_taxonomy.matched_skills(team_profile['skills'], required)
+    missing = skill_taxonomy.missing_skills(team_profile['skills'], required)
+
+    parts = [f"This problem is {_match_strength(similarity_score)} fit for the team ({similarity_score:.0%} profile similarity)."]
+
+    if required:
+        parts.append(f"The team already covers {len(matched)} of {len(required)} required skills"
+                     + (f" ({_join(matched)})." if matched else "."))
+    elif matched:
+        parts.append(f"Relevant team skills: {_join(matched)}.")
+
+    if missing:
+        parts.append(f"Plan time to ramp up on {_join(missing)}.")
+
+    pace = EXPERIENCE_PACE.get(str(team_profile.get('experience', '')).lower(), 1.0)
+    problem_deadline = problem.get('deadline') or team_profile['deadline']
+    if team_profile['deadline'] < problem_deadline * pace:
+        parts.append(f"The {team_profile['deadline']}-day deadline is tight for a {team_profile['experience'].lower()} team.")
+    else:
+        parts.append(f"The {team_profile['deadline']}-day deadline looks feasible for a team of {team_profile['size']}.")
+
+    return " ".join(parts)
+
+
+def template_skill_gap(team_profile: Dict, problem: Dict) -> str:
+    """
+    Describe the skill gap without calling the LLM
+    """
+    required = _required_skills(problem)
+    missing = skill_taxonomy.missing_skills(team_profile['skills'], required)
+
+    if not required:
+        return "The problem does not list specific skill requirements."
+    if not missing:
+        return "No skill gaps: the team covers every required skill."
+
+    coverage = 1 - len(missing) / len(required)
+    if coverage >= 0.75:
+        severity = "minor"
+    elif coverage >= 0.4:
+        severity = "moderate"
+    else:
+        severity = "significant"
+
+    return (
+        f"Missing skills: {_join(missing)}. "
+        f"This is a {severity} gap ({coverage:.0%} of required skills covered). "
+        f"Prioritise {missing[0]} first and pair it with the team's existing strengths."
+    )
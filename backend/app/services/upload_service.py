@@ -0,0 +1,49 @@
+from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models.upload import Upload
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UploadService:
+    """
+    Processed upload files by content hash, so a repeated upload can be
+    answered with the problems it produced the first time
+    """
+
+    def get_by_hash(self, db: Session, *, content_hash: str) -> Optional[Upload]:
+        return db.query(Upload).filter(Upload.content_hash == content_hash).first()
+
+    def record(
+        self,
+        db: Session,
+        *,
+        content_hash: str,
+        filename: str,
+        event_id: Optional[int],
+        problem_ids: List[int]
+    ) -> Optional[Upload]:
+        upload = Upload(
+            content_hash=content_hash,
+            filename=filename,
+            event_id=event_id,
+            problem_ids=problem_ids
+        )
+        db.add(upload)
+        try:
+            db.commit()
+        except IntegrityError:
+            # The same file was processed concurrently and recorded first
+            db.rollback()
+            logger.info(f"Upload {content_hash[:12]} was already recorded")
+            return None
+        return upload
+
+    def forget(self, db: Session, upload: Upload) -> None:
+        db.delete(upload)
+        db.commit()
+
+
+upload_service = UploadService()
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import math
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+from ..core.config import settings
+from ..core.exceptions import ChecksumMismatchError, FileProcessingError, FileTooLargeError
+from .sheet_readers import SUPPORTED_EXTENSIONS
+import logging
+
+logger = logging.getLogger(__name__)
+
+SESSION_FILE = "session.json"
+DATA_FILE = "data"
+
+
+class UploadSessionStore:
+    """
+    Chunked, resumable uploads on local disk.
+
+    Each session is a directory holding its metadata, a data file
+    preallocated to the declared size, and one small marker per confirmed
+    part. Parts are written straight to their offset in the data file while
+    being hashed, and only confirmed (marker renamed into place) once the
+    checksum matches, so parts may arrive in any order or in parallel. A
+    retried part is unconfirmed before it overwrites its own range, so a
+    failed retry leaves it missing rather than confirmed over bad bytes.
+    Completing a session leaves the data file ready to ingest without
+    reassembly. Every part written keeps the session from expiring.
+    """
+
+    def __init__(self, directory: str, part_size_mb: int = 8, ttl_hours: float = 24.0):
+        self.directory = Path(directory)
+        self.part_size = part_size_mb * 1024 * 1024
+        self.ttl = ttl_hours * 3600
+
+    def _session_dir(self, session_id: str) -> Path:
+        # Ids are generated here; anything else is not a session
+        if not session_id.isalnum():
+            raise KeyError(session_id)
+        return self.directory / session_id
+
+    def data_path(self, session_id: str) -> Path:
+        return self._session_dir(session_id) / DATA_FILE
+
+    def create(
+        self,
+        *,
+        filename: str,
+        size: int,
+        owner_id: int,
+        event_id: Optional[int] = None,
+        on_duplicate: str = "report"
+    ) -> Dict:
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in SUPPORTED_EXTENSIONS:
+            raise FileProcessingError(
+                "Only Excel (.xlsx, .xls), CSV (.csv), Parquet (.parquet) or Arrow (.arrow, .feather) files are allowed"
+            )
+        if size <= 0:
+            raise FileProcessingError("size must be greater than 0")
+        if size > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
+            raise FileTooLargeError(settings.MAX_UPLOAD_SIZE_MB)
+        self.expire()
+
+        session = {
+            "id": uuid.uuid4().hex,
+            "filename": filename,
+            "size": size,
+            "part_size": self.part_size,
+            "part_count": math.ceil(size / self.part_size),
+            "owner_id": owner_id,
+            "event_id": event_id,
+            "on_duplicate": on_duplicate,
+            "created_at": time.time()
+        }
+        session_dir = self._session_dir(session["id"])
+        (session_dir / "parts").mkdir(parents=True)
+        with open(session_dir / DATA_FILE, "wb") as f:
+            f.truncate(size)
+        with open(session_dir / SESSION_FILE, "w") as f:
+            json.dump(session, f)
+        logger.info(f"Started upload session {session['id']} for {filename} ({session['part_count']} parts)")
+        return session
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        try:
+            with open(self._session_dir(session_id) / SESSION_FILE) as f:
+                return json.load(f)
+        except (KeyError, FileNotFoundError):
+            return None
+
+    def part_length(self, session: Dict, part_number: int) -> int:
+        if not 1 <= part_number <= session["part_count"]:
+            raise FileProcessingError(f"part_number must be between 1 and {session['part_count']}")
+        offset = (part_number - 1) * session["part_size"]
+        return min(session["part_size"], session["size"] - offset)
+
+    async def write_part(
+        self,
+        session: Dict,
+        part_number: int,
+        chunks: AsyncIterator[bytes],
+        sha256: str
+    ) -> Dict:
+        """
+        Write one part from a stream of body chunks and confirm it if its
+        SHA-256 matches. Returns the part's marker.
+        """
+        expected = self.part_length(session, part_number)
+        session_dir = self._session_dir(session["id"])
+        offset = (part_number - 1) * session["part_size"]
+        marker = session_dir / "parts" / f"{part_number:06d}.json"
+        # The range is about to change; it is confirmed again only if the hash matches
+        marker.unlink(missing_ok=True)
+        # expire() goes by the session file's mtime
+        os.utime(session_dir / SESSION_FILE)
+        hasher = hashlib.sha256()
+        written = 0
+        fd = os.open(session_dir / DATA_FILE, os.O_WRONLY)
+        try:
+            async for chunk in chunks:
+                if written + len(chunk) > expected:
+                    raise FileProcessingError(f"Part {part_number} must be {expected} bytes")
+                os.pwrite(fd, chunk, offset + written)
+                hasher.update(chunk)
+                written += len(chunk)
+        finally:
+            os.close(fd)
+        if written != expected:
+            raise FileProcessingError(f"Part {part_number} must be {expected} bytes, got {written}")
+        if hasher.hexdigest() != sha256.lower():
+            raise ChecksumMismatchError(part_number)
+
+        part = {"part_number": part_number, "size": written, "sha256": hasher.hexdigest()}
+        tmp_path = marker.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(part, f)
+        os.replace(tmp_path, marker)
+        return part
+
+    def received_parts(self, session_id: str) -> List[int]:
+        parts_dir = self._session_dir(session_id) / "parts"
+        return sorted(int(path.stem) for path in parts_dir.glob("*.json"))
+
+    def missing_parts(self, session: Dict) -> List[int]:
+        received = set(self.received_parts(session["id"]))
+        return [number for number in range(1, session["part_count"] + 1) if number not in received]
+
+    def discard(self, session_id: str) -> None:
+        shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def expire(self) -> int:
+        """
+        Remove sessions older than the TTL; returns how many were removed
+        """
+        if not self.directory.exists():
+            return 0
+        cutoff = time.time() - self.ttl
+        expired = 0
+        for session_dir in self.directory.iterdir():
+            try:
+                if (session_dir / SESSION_FILE).stat().st_mtime < cutoff:
+                    shutil.rmtree(session_dir, ignore_errors=True)
+                    expired += 1
+            except FileNotFoundError:
+                continue
+        if expired:
+            logger.info(f"Removed {expired} expired upload sessions")
+        return expired
+
+
+upload_sessions = UploadSessionStore(
+    settings.UPLOAD_SESSION_DIR,
+    part_size_mb=settings.UPLOAD_PART_SIZE_MB,
+    ttl_hours=settings.UPLOAD_SESSION_TTL_HOURS
+)
@@ -1,4 +1,5 @@
 from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -8,13 +9,17 @@ from datetime import datetime
 from contextlib import asynccontextmanager
 
 #  routers
-from app.api.endpoints import auth, teams, problems, matching
+from app.api.endpoints import auth, teams, problems, matching, analytics, events, templates
 
 # config and dependencies
 from app.core.config import settings
 from app.db.session import get_db
-from app.core.exceptions import DatabaseError, FileProcessingError
+from app.core.exceptions import DatabaseError, FileProcessingError, ServiceOverloadedError
 from app.core.rate_limit import rate_limiter
+from app.core.admission import admission_controller
+from app.services.embedding_snapshots import embedding_snapshots
+from app.services.parse_pool import parse_pool
+from app.services.cohere_service import embedding_batcher
 from app.core.logging import logger
 
 # services
@@ -31,9 +36,16 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"API Version: {settings.VERSION}")
     
+    # Map the shared embedding snapshot so matching can start right away
+    snapshot = embedding_snapshots.current()
+    if snapshot is not None:
+        logger.info(f"Embedding snapshot {snapshot.version}: {len(snapshot)} problems")
+    
     yield
     
     logger.info("Shutting down Problem Statement Finder API")
+    await embedding_batcher.shutdown()
+    parse_pool.shutdown()
 
 # FastAPI app
 app = FastAPI(
@@ -79,6 +91,23 @@ async def rate_limit_middleware(request, call_next):
     response = await call_next(request)
     return response
 
+# Admission Control Middleware: sheds excess load on expensive endpoints only,
+# so cheap ones like /teams and /health keep answering under overload
+@app.middleware("http")
+async def admission_control_middleware(request, call_next):
+    route = admission_controller.route_for(request.url.path)
+    if route is None:
+        return await call_next(request)
+    try:
+        async with admission_controller.admit(route):
+            return await call_next(request)
+    except ServiceOverloadedError as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"detail": e.detail},
+            headers=e.headers
+        )
+
 # Security Headers Middleware
 @app.middleware("http")
 async def add_security_headers(request, call_next):
@@ -115,6 +144,24 @@ app.include_router(
     tags=["Matching"]
 )
 
+app.include_router(
+    analytics.router,
+    prefix=f"{settings.API_V1_STR}/analytics",
+    tags=["Analytics"]
+)
+
+app.include_router(
+    events.router,
+    prefix=f"{settings.API_V1_STR}/events",
+    tags=["Events"]
+)
+
+app.include_router(
+    templates.router,
+    prefix=f"{settings.API_V1_STR}/templates",
+    tags=["Templates"]
+)
+
 # Initialize services
 file_processor = FileProcessorService()
 
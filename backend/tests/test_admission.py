@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from app.core.admission import AdmissionController
+from app.core.exceptions import ServiceOverloadedError
+
+PATH = "/api/v1/problems/upload"
+
+async def _hold(controller, seconds):
+    async with controller.admit(PATH):
+        await asyncio.sleep(seconds)
+
+def test_requests_beyond_capacity_wait_for_a_slot():
+    """Test that queued requests are admitted in turn when slots free up"""
+    controller = AdmissionController(max_in_flight=1, max_queue=4, target_delay_ms=1000)
+
+    async def run():
+        await asyncio.gather(*(_hold(controller, 0.01) for _ in range(3)))
+
+    asyncio.run(run())
+    assert controller.stats()["in_flight"] == 0
+    assert controller.stats()["queued"] == 0
+    assert not controller.dropping
+
+def test_full_queue_is_shed_with_retry_after():
+    """Test that a request finding the queue full gets 503 and Retry-After"""
+    controller = AdmissionController(max_in_flight=1, max_queue=1, target_delay_ms=1000)
+
+    async def run():
+        holders = [asyncio.ensure_future(_hold(controller, 0.05)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(ServiceOverloadedError) as shed:
+                await _hold(controller, 0)
+        finally:
+            await asyncio.gather(*holders)
+        return shed.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 503
+    assert "queue full" in error.detail
+    assert int(error.headers["Retry-After"]) >= 1
+
+def test_standing_queue_sheds_new_requests():
+    """Test that CoDel starts dropping once queue delay stays above target for an interval"""
+    controller = AdmissionController(
+        max_in_flight=1, max_queue=8, target_delay_ms=10, interval_ms=30, max_wait_ms=5000
+    )
+
+    async def run():
+        # Each request waits behind the ones before it, well past the target
+        holders = [asyncio.ensure_future(_hold(controller, 0.04)) for _ in range(4)]
+        while not controller.dropping:
+            await asyncio.sleep(0.005)
+        try:
+            with pytest.raises(ServiceOverloadedError) as shed:
+                await _hold(controller, 0)
+        finally:
+            await asyncio.gather(*holders)
+        return shed.value
+
+    error = asyncio.run(run())
+    assert "queue delay above target" in error.detail
+    assert int(error.headers["Retry-After"]) >= 1
+
+def test_dropping_stops_when_delay_recovers():
+    """Test that an admission without queueing delay ends the dropping state"""
+    controller = AdmissionController(max_in_flight=1, target_delay_ms=10, interval_ms=30)
+    controller.dropping = True
+
+    asyncio.run(_hold(controller, 0))
+    assert not controller.dropping
+
+def test_request_waiting_too_long_is_shed():
+    """Test that a request still queued after max_wait gets 503"""
+    controller = AdmissionController(max_in_flight=1, max_queue=4, target_delay_ms=1000, max_wait_ms=20)
+
+    async def run():
+        holder = asyncio.ensure_future(_hold(controller, 0.1))
+        await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(ServiceOverloadedError) as shed:
+                await _hold(controller, 0)
+        finally:
+            await holder
+        return shed.value
+
+    assert "timed out" in asyncio.run(run()).detail
+    assert controller.stats()["queued"] == 0
+
+def test_route_for_matches_patterns():
+    """Test that request paths map onto configured paths and patterns"""
+    controller = AdmissionController(paths=[PATH, "/api/v1/uploads/*/complete"])
+    assert controller.route_for(PATH + "/") == PATH
+    assert controller.route_for("/api/v1/uploads/abc/complete") == "/api/v1/uploads/*/complete"
+    assert controller.route_for("/api/v1/events") is None
@@ -0,0 +1,88 @@
+import asyncio
+from app.services.catalog_partitions import PartitionRegistry
+from app.services.embedding_store import save_embeddings
+
+def _add_problems(db_session, event_id, rows, vectors):
+    from app.models.problem import Problem
+
+    problems = [
+        Problem(title=title, description=description, tech_stack=[], source_file="a.csv", event_id=event_id)
+        for title, description in rows
+    ]
+    db_session.add_all(problems)
+    db_session.flush()
+    save_embeddings(db_session, [p.id for p in problems], vectors)
+    db_session.commit()
+    return problems
+
+def test_partition_only_sees_its_event(db_session):
+    """Test that a partition indexes its own event's problems and nothing else"""
+    crops, chatbot = _add_problems(db_session, 101, [
+        ("Crop prices", "Track crop prices for farmers across markets"),
+        ("Admissions bot", "Chatbot answering university admission questions")
+    ], [[1.0, 0.0], [0.0, 1.0]])
+    other, = _add_problems(db_session, 102, [("Crop yield", "Predict crop yield for farmers")], [[1.0, 0.0]])
+
+    registry = PartitionRegistry()
+    partition = asyncio.run(registry.get(db_session, 101))
+
+    assert partition.problem_ids == [crops.id, chatbot.id]
+    assert [pid for pid, _ in partition.lexical_search("farmers crop")] == [crops.id]
+    assert partition.semantic_top([0.1, 0.9], k=1)[0][0] == chatbot.id
+    assert other.id not in partition.problem_ids
+
+def test_partitions_evicted_over_budget(db_session):
+    """Test that the least recently used partition is dropped once over budget"""
+    _add_problems(db_session, 201, [("Crop prices", "Track crop prices for farmers")], [[1.0, 0.0]])
+    _add_problems(db_session, 202, [("Admissions bot", "Chatbot answering admission questions")], [[0.0, 1.0]])
+
+    registry = PartitionRegistry(memory_budget_mb=0)
+    asyncio.run(registry.get(db_session, 201))
+    asyncio.run(registry.get(db_session, 202))
+
+    assert not registry.is_loaded(201)
+    assert registry.is_loaded(202)
+
+def test_partition_reloaded_when_event_changes_elsewhere(db_session):
+    """Test that a cached partition is reloaded once its event gains problems"""
+    crops, = _add_problems(db_session, 301, [("Crop prices", "Track crop prices for farmers")], [[1.0, 0.0]])
+
+    registry = PartitionRegistry()
+    first = asyncio.run(registry.get(db_session, 301))
+    assert asyncio.run(registry.get(db_session, 301)) is first
+
+    # Added without invalidating, as another worker process would
+    chatbot, = _add_problems(db_session, 301, [("Admissions bot", "Chatbot answering admission questions")], [[0.0, 1.0]])
+    assert asyncio.run(registry.get(db_session, 301)).problem_ids == [crops.id, chatbot.id]
+
+def test_loads_of_one_event_never_overlap(db_session):
+    """Test that a caller arriving while others wait on an event's load waits its turn too"""
+    _add_problems(db_session, 401, [("Crop prices", "Track crop prices for farmers")], [[1.0, 0.0]])
+
+    registry = PartitionRegistry()
+    # Every caller finds the partition stale, so each one loads in turn
+    registry._is_current = lambda partition, version: False
+    load = registry._load
+    loading = []
+    overlaps = []
+
+    async def slow_load(*args, **kwargs):
+        loading.append(1)
+        overlaps.append(len(loading))
+        await asyncio.sleep(0.02)
+        loading.pop()
+        return await load(*args, **kwargs)
+
+    registry._load = slow_load
+
+    async def run():
+        first = asyncio.ensure_future(registry.get(db_session, 401))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(registry.get(db_session, 401))
+        await first
+        third = asyncio.ensure_future(registry.get(db_session, 401))
+        await asyncio.gather(second, third)
+
+    asyncio.run(run())
+    assert overlaps == [1, 1, 1]
+    assert not registry._loading
@@ -0,0 +1,32 @@
+from app.services.content_hashing import problem_content_hash
+from app.services.problem_service import problem_service
+
+def _row(description, content_hash):
+    return {
+        "title": description[:20],
+        "description": description,
+        "tech_stack": [],
+        "source_file": "a.csv",
+        "content_hash": content_hash
+    }
+
+def test_problem_hash_normalizes_and_scopes_by_event():
+    """Test that case and whitespace are ignored but the event is not"""
+    text = "Build a  crop price\ntracker"
+    assert problem_content_hash(text) == problem_content_hash(" build a crop price tracker ")
+    assert problem_content_hash(text) != problem_content_hash(text, event_id=1)
+
+def test_bulk_create_skips_stored_content(db_session):
+    """Test that rows already stored resolve to the existing problem ids"""
+    first = problem_content_hash("Crop price tracker")
+    second = problem_content_hash("Campus chatbot")
+    ids, inserted = problem_service.bulk_create(db_session, rows=[_row("Crop price tracker", first)])
+    assert inserted == set(ids)
+
+    again, inserted = problem_service.bulk_create(
+        db_session,
+        rows=[_row("crop price tracker", first), _row("Campus chatbot", second), _row("Campus chatbot", second)]
+    )
+    assert again[0] == ids[0]
+    assert again[1] == again[2]
+    assert inserted == {again[1]}
@@ -0,0 +1,122 @@
+import asyncio
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.llm_scheduler import Priority
+
+class FakeEmbedder:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, texts, priority):
+        self.calls.append((list(texts), priority))
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [[float(len(text))] for text in texts]
+
+def test_concurrent_requests_share_one_call():
+    """Test that requests arriving together are sent as one batch"""
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_wait_ms=20, max_batch_size=10)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.embed(["a", "bb"]),
+            batcher.embed(["ccc"]),
+            batcher.embed(["dddd", "eeeee"])
+        )
+
+    asyncio.run(run())
+    assert len(embedder.calls) == 1
+    assert embedder.calls[0][0] == ["a", "bb", "ccc", "dddd", "eeeee"]
+    assert batcher.stats == {"requests": 3, "texts": 5, "calls": 1}
+
+def test_each_caller_gets_its_own_vectors():
+    """Test that a shared batch is fanned back out in request order"""
+    batcher = EmbeddingBatcher(FakeEmbedder(), max_wait_ms=20, max_batch_size=10)
+
+    async def run():
+        return await asyncio.gather(batcher.embed(["a", "bb"]), batcher.embed(["ccc"]))
+
+    first, second = asyncio.run(run())
+    assert first == [[1.0], [2.0]]
+    assert second == [[3.0]]
+
+def test_full_batch_is_sent_without_waiting():
+    """Test that hitting max_batch_size flushes, and big requests are chunked"""
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_wait_ms=10000, max_batch_size=3)
+
+    async def run():
+        small = await asyncio.wait_for(
+            asyncio.gather(batcher.embed(["a", "b"]), batcher.embed(["c"])), timeout=1
+        )
+        large = await batcher.embed(["x"] * 7)
+        return small, large
+
+    small, large = asyncio.run(run())
+    assert small == [[[1.0], [1.0]], [[1.0]]]
+    assert len(large) == 7
+    assert [len(texts) for texts, _ in embedder.calls] == [3, 3, 3, 1]
+
+def test_batch_runs_at_most_urgent_priority():
+    """Test that a shared batch takes its most urgent member's priority"""
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_wait_ms=20, max_batch_size=10)
+
+    async def run():
+        await asyncio.gather(
+            batcher.embed(["a"], Priority.BACKGROUND),
+            batcher.embed(["b"], Priority.INTERACTIVE)
+        )
+
+    asyncio.run(run())
+    assert embedder.calls[0][1] == Priority.INTERACTIVE
+
+def test_failed_call_reaches_every_caller():
+    """Test that a provider error is raised to all requests in the batch"""
+    batcher = EmbeddingBatcher(FakeEmbedder(fail=True), max_wait_ms=20, max_batch_size=10)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.embed(["a"]), batcher.embed(["b"]), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+def test_empty_request_skips_the_provider():
+    """Test that embedding nothing makes no call"""
+    embedder = FakeEmbedder()
+    assert asyncio.run(EmbeddingBatcher(embedder).embed([])) == []
+    assert embedder.calls == []
+
+def test_shutdown_waits_for_batches_in_flight():
+    """Test that shutdown sends pending requests and lets in-flight batches answer"""
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_wait_ms=10000, max_batch_size=10)
+
+    async def run():
+        waiting = asyncio.ensure_future(batcher.embed(["a", "bb"]))
+        await asyncio.sleep(0)
+        await batcher.shutdown()
+        return await waiting
+
+    assert asyncio.run(run()) == [[1.0], [2.0]]
+    assert not batcher._sending
+
+def test_shutdown_cancels_batches_past_timeout():
+    """Test that batches still running after the timeout are cancelled along with their callers"""
+    async def hanging(texts, priority):
+        await asyncio.sleep(10)
+
+    batcher = EmbeddingBatcher(hanging, max_wait_ms=10000, max_batch_size=10)
+
+    async def run():
+        waiting = asyncio.ensure_future(batcher.embed(["a"]))
+        await asyncio.sleep(0)
+        await batcher.shutdown(timeout=0.01)
+        return await asyncio.gather(waiting, return_exceptions=True)
+
+    result, = asyncio.run(run())
+    assert isinstance(result, asyncio.CancelledError)
+    assert not batcher._sending
@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from app.services.hedging import HedgedCaller
+
+def _warm(caller, seconds=0.01):
+    for _ in range(caller.min_samples):
+        caller.latency.record(seconds)
+
+def test_no_hedge_before_enough_samples():
+    """Test that calls are not duplicated while latency is unknown"""
+    caller = HedgedCaller("test", min_samples=5)
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    assert asyncio.run(caller.call(slow)) == "done"
+    assert len(calls) == 1
+    assert caller.hedge_delay() is None
+
+def test_hedge_wins_and_loser_is_cancelled():
+    """Test that a fast hedge answers and the slow original is cancelled"""
+    caller = HedgedCaller("test", min_samples=5, min_delay_ms=10, budget_ratio=1.0)
+    _warm(caller)
+    attempts = []
+    cancelled = []
+
+    async def make_call():
+        attempt = len(attempts)
+        attempts.append(attempt)
+        try:
+            await asyncio.sleep(1.0 if attempt == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return attempt
+
+    async def run():
+        result = await caller.call(make_call)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == 1
+    assert cancelled == [0]
+    assert caller.stats == {"calls": 1, "hedges_sent": 1, "hedges_won": 1}
+
+def test_hedges_are_capped_by_budget():
+    """Test that no hedge is sent without a full token"""
+    caller = HedgedCaller("test", min_samples=5, min_delay_ms=10, budget_ratio=0.05)
+    _warm(caller)
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.03)
+        return "done"
+
+    asyncio.run(caller.call(slow))
+    assert len(calls) == 1
+    assert caller.stats["hedges_sent"] == 0
+
+def test_error_raised_when_every_attempt_fails():
+    """Test that a failure of the original and the hedge reaches the caller"""
+    caller = HedgedCaller("test", min_samples=5, min_delay_ms=10, budget_ratio=1.0)
+    _warm(caller)
+
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError, match="provider down"):
+        asyncio.run(caller.call(failing))
+    assert caller.stats["hedges_sent"] == 1
+
+def test_hedge_answers_when_original_fails():
+    """Test that a failed original does not fail the call if the hedge succeeds"""
+    caller = HedgedCaller("test", min_samples=5, min_delay_ms=10, budget_ratio=1.0)
+    _warm(caller)
+    attempts = []
+
+    async def make_call():
+        attempt = len(attempts)
+        attempts.append(attempt)
+        await asyncio.sleep(0.03 if attempt == 0 else 0.05)
+        if attempt == 0:
+            raise RuntimeError("original failed")
+        return "hedge"
+
+    assert asyncio.run(caller.call(make_call)) == "hedge"
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+from app.services.llm_scheduler import LLMScheduler, Priority
+
+def _blocked_scheduler(weights=None):
+    """A one-slot scheduler and the event that frees its slot"""
+    scheduler = LLMScheduler(max_concurrency=1, weights=weights)
+    gate = threading.Event()
+    return scheduler, gate
+
+async def _fill_and_queue(scheduler, gate, requests):
+    order = []
+    blocker = asyncio.ensure_future(scheduler.run(gate.wait))
+    await asyncio.sleep(0.01)
+
+    def record(label):
+        order.append(label)
+        return label
+
+    waiting = [
+        asyncio.ensure_future(scheduler.run(record, label, priority=priority))
+        for label, priority in requests
+    ]
+    await asyncio.sleep(0.01)
+    depth = scheduler.stats()["queue_depth"]
+    gate.set()
+    await asyncio.gather(blocker, *waiting)
+    return order, depth
+
+def test_calls_run_in_order_of_priority():
+    """Test that a queued interactive call overtakes earlier background calls"""
+    scheduler, gate = _blocked_scheduler()
+    order, depth = asyncio.run(_fill_and_queue(scheduler, gate, [
+        ("bg", Priority.BACKGROUND),
+        ("batch", Priority.BATCH),
+        ("ui", Priority.INTERACTIVE)
+    ]))
+    assert order == ["ui", "batch", "bg"]
+    assert depth == {"interactive": 1, "batch": 1, "background": 1}
+
+def test_background_calls_are_not_starved():
+    """Test that weighted fair queuing lets background work through a stream of interactive calls"""
+    scheduler, gate = _blocked_scheduler()
+    requests = [(f"ui{i}", Priority.INTERACTIVE) for i in range(20)]
+    requests.insert(0, ("bg", Priority.BACKGROUND))
+    order, _ = asyncio.run(_fill_and_queue(scheduler, gate, requests))
+
+    # Interactive has 8x the background weight, so it gets about 8 turns first
+    assert order.index("bg") <= 9
+    assert order[-1].startswith("ui")
+
+def test_concurrency_is_capped():
+    """Test that no more than max_concurrency calls run at once"""
+    scheduler = LLMScheduler(max_concurrency=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+
+    async def run():
+        await asyncio.gather(*(scheduler.run(work) for _ in range(6)))
+
+    asyncio.run(run())
+    assert max(peak) == 2
+    assert scheduler.stats()["running"] == 0
+
+def test_cancelled_waiter_gives_up_its_place():
+    """Test that a caller cancelled while queued leaves the queue depth and holds no slot"""
+    scheduler, gate = _blocked_scheduler()
+
+    async def run():
+        blocker = asyncio.ensure_future(scheduler.run(gate.wait))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(scheduler.run(lambda: "never"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        depth = scheduler.stats()["queue_depth"]["interactive"]
+        gate.set()
+        await blocker
+        return depth, await asyncio.wait_for(scheduler.run(lambda: "next"), timeout=1)
+
+    assert asyncio.run(run()) == (0, "next")
+    assert scheduler.stats()["running"] == 0
+    assert scheduler.stats()["queue_depth"]["interactive"] == 0
+
+def test_errors_propagate_and_free_the_slot():
+    """Test that a failing call raises to its caller and releases its slot"""
+    scheduler = LLMScheduler(max_concurrency=1)
+
+    def fail():
+        raise ValueError("provider error")
+
+    async def run():
+        try:
+            await scheduler.run(fail)
+        except ValueError as e:
+            error = str(e)
+        return error, await scheduler.run(lambda: "ok")
+
+    assert asyncio.run(run()) == ("provider error", "ok")
+
+def test_run_async_holds_one_slot_for_its_calls():
+    """Test that calls started with submit inside run_async share that call's slot"""
+    scheduler = LLMScheduler(max_concurrency=1)
+
+    async def two_calls():
+        first, second = await asyncio.gather(
+            scheduler.submit(lambda: "a"), scheduler.submit(lambda: "b")
+        )
+        return first + second, scheduler.stats()["running"]
+
+    result, running = asyncio.run(scheduler.run_async(two_calls))
+    assert (result, running) == ("ab", 1)
+    assert scheduler.stats()["running"] == 0
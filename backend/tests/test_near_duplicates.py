@@ -0,0 +1,58 @@
+from app.services.near_duplicates import MinHasher, NearDuplicateIndex
+
+DESCRIPTION = (
+    "Build a mobile application that helps farmers track crop prices across "
+    "regional markets and predicts the best time to sell using historical data."
+)
+
+def test_minhash_similarity():
+    """Test that light edits keep a high estimated similarity"""
+    hasher = MinHasher()
+    original = hasher.signature(DESCRIPTION)
+    edited = hasher.signature(DESCRIPTION.replace("helps", "assists"))
+    unrelated = hasher.signature("Design a chatbot that answers university admission questions.")
+
+    assert hasher.similarity(original, original) == 1.0
+    assert hasher.similarity(original, edited) > 0.7
+    assert hasher.similarity(original, unrelated) < 0.2
+
+def test_find_duplicates_against_catalog(db_session):
+    """Test that indexed problems are found through the LSH buckets"""
+    from app.models.problem import Problem
+
+    index = NearDuplicateIndex(threshold=0.7)
+    problem = Problem(title="Crop prices", description=DESCRIPTION, tech_stack=[], source_file="a.csv")
+    db_session.add(problem)
+    db_session.flush()
+    index.add(db_session, [problem.id], index.signatures([DESCRIPTION]))
+
+    matches = index.find_duplicates(
+        db_session,
+        index.signatures([DESCRIPTION.replace("helps", "assists"), "Something else entirely"])
+    )
+    assert matches[0][0] == "catalog"
+    assert matches[0][1] == problem.id
+    assert matches[1] is None
+
+def test_find_duplicates_within_batch(db_session):
+    """Test that repeated rows in one upload point at the first occurrence"""
+    index = NearDuplicateIndex()
+    matches = index.find_duplicates(db_session, index.signatures([DESCRIPTION, DESCRIPTION]))
+    assert matches[0] is None
+    assert matches[1][:2] == ("batch", 0)
+
+def test_other_events_do_not_crowd_out_candidates(db_session):
+    """Test that a full bucket of other events' problems still finds the same event's duplicate"""
+    from app.models.problem import Problem
+
+    index = NearDuplicateIndex(threshold=0.7, max_bucket_candidates=2)
+    problems = [
+        Problem(title="Crop prices", description=DESCRIPTION, tech_stack=[], source_file="a.csv", event_id=event_id)
+        for event_id in (501, 502, 503, 504)
+    ]
+    db_session.add_all(problems)
+    db_session.flush()
+    index.add(db_session, [p.id for p in problems], index.signatures([DESCRIPTION] * len(problems)))
+
+    matches = index.find_duplicates(db_session, index.signatures([DESCRIPTION]), event_id=504)
+    assert matches[0][:2] == ("catalog", problems[-1].id)
@@ -0,0 +1,36 @@
+import asyncio
+import pytest
+from app.services.parse_pool import ParsePool
+
+def _count(n, fail_at=None):
+    for i in range(n):
+        if i == fail_at:
+            raise ValueError(f"bad row {i}")
+        yield i
+
+async def _collect(pool, *args, maxsize=2, take=None):
+    items = []
+    stream = pool.stream(_count, *args, maxsize=maxsize)
+    try:
+        async for item in stream:
+            items.append(item)
+            if take is not None and len(items) == take:
+                break
+    finally:
+        await stream.aclose()
+    return items
+
+def test_stream_yields_items_in_order():
+    """Test that streamed items arrive in order through a small queue"""
+    assert asyncio.run(_collect(ParsePool(max_workers=0), 10)) == list(range(10))
+
+def test_stream_raises_worker_errors():
+    """Test that an error in the generator reaches the consumer"""
+    with pytest.raises(ValueError, match="bad row 3"):
+        asyncio.run(_collect(ParsePool(max_workers=0), 10, 3))
+
+def test_closed_stream_releases_its_worker():
+    """Test that stopping early does not leave the producer blocked"""
+    pool = ParsePool(max_workers=0)
+    assert asyncio.run(_collect(pool, 1000, take=3)) == [0, 1, 2]
+    assert pool.pending == 0
@@ -0,0 +1,49 @@
+from fastapi import status
+
+def _event_problem(db_session, owner_email):
+    from app.models.event import Event
+    from app.models.problem import Problem
+    from app.models.user import User
+    from app.core.security import get_password_hash
+
+    owner = User(email=owner_email, hashed_password=get_password_hash("otherpassword"), is_active=True)
+    db_session.add(owner)
+    db_session.flush()
+    event = Event(name="Other hackathon", slug=f"event-{owner.id}", owner_id=owner.id)
+    db_session.add(event)
+    db_session.flush()
+    problem = Problem(
+        title="Crop prices",
+        description="Track crop prices for farmers across markets",
+        tech_stack=["Python"],
+        source_file="a.csv",
+        event_id=event.id
+    )
+    db_session.add(problem)
+    db_session.commit()
+    return problem
+
+def test_delete_other_users_problem_is_refused(client, auth_headers, db_session):
+    """Test that a problem in someone else's event cannot be deleted"""
+    from app.models.problem import Problem
+
+    problem = _event_problem(db_session, "owner@example.com")
+
+    response = client.delete(f"/api/v1/problems/problems/{problem.id}", headers=auth_headers)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert db_session.query(Problem).get(problem.id) is not None
+
+def test_event_owner_can_delete_problem(client, auth_headers, db_session, test_user):
+    """Test that the event's owner may delete its problems"""
+    from app.models.event import Event
+    from app.models.problem import Problem
+
+    problem = _event_problem(db_session, "owner2@example.com")
+    db_session.query(Event).filter(Event.id == problem.event_id).update({"owner_id": test_user.id})
+    db_session.commit()
+
+    response = client.delete(f"/api/v1/problems/problems/{problem.id}", headers=auth_headers)
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert db_session.query(Problem).get(problem.id) is None
@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+from datetime import datetime
+from openpyxl import load_workbook
+from app.services.row_writers import encode_rows
+from app.services.sheet_readers import iter_sheet_frames
+
+COLUMNS = ["id", "title", "tech_stack", "created_at"]
+ROWS = [
+    (1, "Build a crop price tracker", ["Python", "React"], datetime(2024, 5, 1, 9, 30)),
+    (2, "Design a campus chatbot\x01", [], None),
+    (3, " padded <title> & more ", ["Go"], datetime(2024, 5, 2))
+]
+
+def _export(fmt):
+    # One row per batch, so the writers' incremental path is exercised
+    return b"".join(encode_rows(fmt, COLUMNS, ([row] for row in ROWS), sheet_name="Problems"))
+
+def test_csv_rows_read_back_like_an_upload():
+    """Test that CSV exports join lists and leave missing values empty"""
+    rows = list(csv.reader(io.StringIO(_export("csv").decode("utf-8"))))
+    assert rows[0] == COLUMNS
+    assert rows[1] == ["1", "Build a crop price tracker", "Python, React", "2024-05-01T09:30:00"]
+    assert rows[2][2:] == ["", ""]
+
+def test_ndjson_keeps_native_types():
+    """Test that NDJSON exports keep lists and numbers as JSON values"""
+    records = [json.loads(line) for line in _export("ndjson").decode("utf-8").splitlines()]
+    assert len(records) == 3
+    assert records[0]["tech_stack"] == ["Python", "React"]
+    assert records[1]["created_at"] is None
+
+def test_streamed_xlsx_opens_and_uploads(tmp_path):
+    """Test that a streamed workbook is readable by openpyxl and the upload reader"""
+    path = tmp_path / "problems.xlsx"
+    path.write_bytes(_export("xlsx"))
+    sheet = load_workbook(path, read_only=True)["Problems"]
+    values = list(sheet.values)
+    assert list(values[0]) == COLUMNS
+    assert values[1][:3] == (1, "Build a crop price tracker", "Python, React")
+    assert values[2][1] == "Design a campus chatbot"
+    assert values[3][1] == " padded <title> & more "
+
+    frame = next(iter_sheet_frames(str(path), ".xlsx", "Problems", chunk_rows=10))
+    assert frame["title"].tolist()[0] == "Build a crop price tracker"
+    assert len(frame) == 3
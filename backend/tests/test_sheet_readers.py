@@ -0,0 +1,47 @@
+from openpyxl import Workbook
+from app.services.sheet_readers import iter_sheet_frames, sheet_names
+from app.services.sheet_templates import header_fingerprint
+
+def _workbook(path):
+    workbook = Workbook()
+    notes = workbook.active
+    notes.title = "Readme"
+    notes.append(["Fill in the Problems sheet"])
+    problems = workbook.create_sheet("Problems")
+    problems.append([])
+    problems.append(["Problem Statement", None, "Tech Stack"])
+    problems.append(["Build a crop price tracker", None, "Python"])
+    problems.append(["Design a campus chatbot", 3, None])
+    workbook.save(path)
+
+def test_sheet_names_in_workbook_order(tmp_path):
+    """Test that every sheet of a workbook is listed"""
+    path = tmp_path / "problems.xlsx"
+    _workbook(path)
+    assert sheet_names(str(path), ".xlsx") == ["Readme", "Problems"]
+
+def test_streamed_rows_keep_their_columns(tmp_path):
+    """Test that blank rows and cells do not shift values between columns"""
+    path = tmp_path / "problems.xlsx"
+    _workbook(path)
+    frames = list(iter_sheet_frames(str(path), ".xlsx", "Problems", chunk_rows=1))
+    assert len(frames) == 2
+    assert list(frames[0].columns) == ["Problem Statement", "column_1", "Tech Stack"]
+    assert frames[0].iloc[0].tolist() == ["Build a crop price tracker", None, "Python"]
+    assert frames[1].iloc[0].tolist() == ["Design a campus chatbot", 3, None]
+
+def test_chosen_columns_are_the_only_ones_read(tmp_path):
+    """Test that a column chooser narrows frames to the columns it names"""
+    path = tmp_path / "problems.xlsx"
+    _workbook(path)
+    frames = list(iter_sheet_frames(
+        str(path), ".xlsx", "Problems", chunk_rows=10,
+        choose_columns=lambda header: ["Tech Stack", "Problem Statement"]
+    ))
+    assert list(frames[0].columns) == ["Tech Stack", "Problem Statement"]
+    assert frames[0].iloc[0].tolist() == ["Python", "Build a crop price tracker"]
+
+def test_header_fingerprint_ignores_case_and_underscores():
+    """Test that spellings of the same header share a template"""
+    assert header_fingerprint(["Problem Statement", "Tech_Stack"]) == header_fingerprint(["problem statement", " TECH STACK"])
+    assert header_fingerprint(["Problem Statement", "Tech Stack"]) != header_fingerprint(["Tech Stack", "Problem Statement"])
@@ -0,0 +1,61 @@
+from app.services.skill_taxonomy import SkillTaxonomy, skill_taxonomy
+from app.services.template_explainer import template_skill_gap, template_recommendation
+
+def test_synonyms_resolve_to_canonical():
+    """Test that spelling variants collapse onto one canonical skill"""
+    for variant in ["ReactJS", "React.js", "react", "React JS"]:
+        assert skill_taxonomy.resolve(variant) == "React"
+    assert skill_taxonomy.resolve("postgres") == "PostgreSQL"
+
+def test_fuzzy_resolution():
+    """Test that close misspellings resolve through the n-gram index"""
+    assert skill_taxonomy.resolve("Postgressql") == "PostgreSQL"
+
+def test_fuzzy_resolution_keeps_distinct_technologies():
+    """Test that related but different technologies are not merged"""
+    for skill in ["Mongoose", "Reactive", "Reactor", "JavaFX", "Tensorflow.js", "Django REST"]:
+        assert skill_taxonomy.resolve(skill) == skill
+
+def test_unknown_spellings_are_not_cached():
+    """Test that an unknown skill keeps each caller's spelling and is not cached"""
+    taxonomy = SkillTaxonomy(cache_size=2)
+    assert taxonomy.resolve("Nodered") == "Nodered"
+    assert taxonomy.resolve("Node-RED") == "Node-RED"
+    for skill in ["ReactJS", "postgres", "node"]:
+        taxonomy.resolve(skill)
+    assert len(taxonomy._cache) == 2
+
+def test_unknown_skill_is_kept():
+    """Test that unknown skills pass through unchanged"""
+    assert skill_taxonomy.resolve("  Haskell ") == "Haskell"
+
+def test_resolve_many_deduplicates():
+    """Test that duplicates are dropped after resolution"""
+    assert skill_taxonomy.resolve_many(["ReactJS", "React.js", "Python"]) == ["React", "Python"]
+
+def test_missing_skills_uses_canonical_names():
+    """Test that the skill gap ignores spelling differences"""
+    taxonomy = SkillTaxonomy()
+    missing = taxonomy.missing_skills(["React.js", "node"], ["ReactJS", "Node.js", "MongoDB"])
+    assert missing == ["MongoDB"]
+
+def test_template_skill_gap():
+    """Test the LLM-free skill gap text"""
+    team_profile = {"size": 3, "experience": "Intermediate", "skills": ["ReactJS"], "deadline": 30}
+    problem = {"description": "Build a dashboard", "required_skills": ["React", "MongoDB"], "deadline": 30}
+
+    text = template_skill_gap(team_profile, problem)
+    assert "MongoDB" in text
+    assert "React" not in text.split("Missing skills:")[1].split(".")[0]
+
+    team_profile["skills"] = ["React", "Mongo"]
+    assert template_skill_gap(team_profile, problem).startswith("No skill gaps")
+
+def test_template_recommendation():
+    """Test the LLM-free recommendation text"""
+    team_profile = {"size": 3, "experience": "Intermediate", "skills": ["React"], "deadline": 30}
+    problem = {"description": "Build a dashboard", "required_skills": ["React", "MongoDB"], "deadline": 30}
+
+    text = template_recommendation(team_profile, problem, 0.72)
+    assert "strong" in text
+    assert "1 of 2" in text
@@ -126,4 +126,37 @@ def test_unauthorized_access(client):
     response = client.get("/api/v1/teams/")
     assert response.status_code == status.HTTP_401_UNAUTHORIZED 
     
-    
\ No newline at end of file
+    
+def test_get_similar_teams(client, auth_headers, test_team, db_session, test_user):
+    """Test nearest-neighbour lookup over the owner's teams"""
+    from app.models.team import Team
+
+    close = Team(
+        name="Close Team",
+        tech_skills=["python", "Fast API"],
+        team_size=3,
+        experience_level="Intermediate",
+        owner_id=test_user.id
+    )
+    far = Team(
+        name="Far Team",
+        tech_skills=["Swift", "iOS"],
+        team_size=6,
+        experience_level="Beginner",
+        owner_id=test_user.id
+    )
+    db_session.add_all([close, far])
+    db_session.commit()
+
+    from app.services.team_index import team_index
+    team_index._loaded_at = None
+
+    response = client.get(
+        f"/api/v1/teams/{test_team.id}/similar?k=2",
+        headers=auth_headers
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [item["team"]["name"] for item in data] == ["Close Team", "Far Team"]
+    assert data[0]["similarity"] > data[1]["similarity"]
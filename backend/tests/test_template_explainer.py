@@ -0,0 +1,13 @@
+from app.services.template_explainer import template_recommendation, template_skill_gap
+
+TEAM = {"size": 3, "experience": "Intermediate", "skills": ["Python", "React"], "deadline": 14}
+
+def test_fallback_texts_count_skills_alike():
+    """Test that duplicate and synonym required skills are counted once in both texts"""
+    problem = {"required_skills": ["Python", "python3", "React", "ReactJS", "Kubernetes", "k8s"]}
+
+    recommendation = template_recommendation(TEAM, problem, 0.5)
+    gap = template_skill_gap(TEAM, problem)
+
+    assert "covers 2 of 3 required skills" in recommendation
+    assert "67% of required skills covered" in gap